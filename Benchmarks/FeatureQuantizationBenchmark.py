@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import json
+    import logging
+    import argparse
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    import main
+
+    from Models.AST import AudioAST
+    from Models.MLP import AudioDense
+    from Models.LSTM import AudioLSTM
+    from Models.Conformer import Conformer
+    from Models.Wav2Vec2 import AudioWav2Vec2
+    from Models.ResidualModel import ResidualModel
+    from Modules.Dataset.FeatureQuantization import FEATURE_DTYPES
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+AVAILABLE_MODELS = {model_class.__name__: model_class for model_class in
+                    (AudioAST, AudioLSTM, AudioDense, Conformer, AudioWav2Vec2, ResidualModel)}
+DEFAULT_MODELS = ["AudioAST", "AudioLSTM", "AudioDense", "ResidualModel"]
+
+
+def run_benchmark(benchmark_arguments, arguments) -> None:
+
+    list_results = []
+
+    for model_name in benchmark_arguments.models:
+
+        for feature_dtype in benchmark_arguments.feature_dtypes:
+            arguments.feature_dtype = feature_dtype
+            logging.info(f"Training {model_name} with {feature_dtype} features...")
+
+            try:
+                model = AVAILABLE_MODELS[model_name]()
+                mean_metrics = model.train(arguments.dataset_directory, arguments.number_epochs, arguments.batch_size,
+                                           arguments.number_splits, arguments.loss, arguments.sample_rate,
+                                           arguments.overlap, arguments.number_classes, arguments)[0]
+
+            except Exception as error:
+                logging.error(f"Training {model_name} with {feature_dtype} features failed: {error}")
+                continue
+
+            list_results.append({'model': model_name, 'feature_dtype': feature_dtype,
+                                 'accuracy': float(mean_metrics['Acc.']['value']),
+                                 'accuracy_std': float(mean_metrics['Acc.']['std']),
+                                 'f1': float(mean_metrics['F1.']['value'])})
+
+    logging.info(f"{'Model':<16}{'Type':<10}{'Acc.':>8}{'Std.':>8}{'F1':>8}{'Delta acc.':>12}")
+
+    for result in list_results:
+        reference = [reference for reference in list_results if reference['model'] == result['model']
+                     and reference['feature_dtype'] == "float32"]
+        delta = result['accuracy'] - reference[0]['accuracy'] if reference else float('nan')
+        logging.info(f"{result['model']:<16}{result['feature_dtype']:<10}{result['accuracy']:>8.4f}"
+                     f"{result['accuracy_std']:>8.4f}{result['f1']:>8.4f}{delta:>12.4f}")
+
+    if benchmark_arguments.output_file:
+
+        with open(benchmark_arguments.output_file, 'w') as output_file:
+            json.dump(list_results, output_file, indent=1)
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    argument_parser = argparse.ArgumentParser(description="Accuracy of the models trained on float32, float16 "
+                                                          "and 8-bit features. Other arguments are passed to main.py.")
+    argument_parser.add_argument('--models', type=str, nargs='+', choices=sorted(AVAILABLE_MODELS),
+                                 default=DEFAULT_MODELS, help='Models trained with each feature type')
+    argument_parser.add_argument('--feature_dtypes', type=str, nargs='+', choices=FEATURE_DTYPES,
+                                 default=list(FEATURE_DTYPES), help='Feature storage types compared')
+    argument_parser.add_argument('--output_file', type=str, default=None,
+                                 help='JSON file where the results are written')
+    benchmark_arguments, main_arguments = argument_parser.parse_known_args()
+
+    # The remaining arguments configure the models exactly as in main.py
+    sys.argv = sys.argv[:1] + main_arguments
+    run_benchmark(benchmark_arguments, main.get_arguments())
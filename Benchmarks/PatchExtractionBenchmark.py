@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import time
+    import numpy
+    import logging
+    import argparse
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from Modules.Dataset.PatchExtraction import split_spectrograms_into_patches
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_NUMBER_SPECTROGRAMS = 2000
+DEFAULT_NUMBER_FILTERS = 512  # Same spectrogram shape as the AST defaults
+DEFAULT_NUMBER_FRAMES = 40
+DEFAULT_PATCH_SIZE = (16, 16)
+DEFAULT_NUMBER_REPETITIONS = 3
+
+
+def split_spectrogram_with_loop(spectrogram: numpy.ndarray, patch_size: tuple) -> numpy.ndarray:
+    """
+    Former AudioAST.split_spectrogram_into_patches, kept as the reference of the benchmark.
+    """
+    pad_height = (patch_size[0] - (spectrogram.shape[0] % patch_size[0])) % patch_size[0]
+    pad_width = (patch_size[1] - (spectrogram.shape[1] % patch_size[1])) % patch_size[1]
+
+    padded_spectrogram = numpy.pad(spectrogram, ((0, pad_height), (0, pad_width)), mode='constant',
+                                   constant_values=0)
+
+    num_patches_x = padded_spectrogram.shape[0] // patch_size[0]
+    num_patches_y = padded_spectrogram.shape[1] // patch_size[1]
+
+    list_patches = []
+
+    for i in range(num_patches_x):
+
+        for j in range(num_patches_y):
+
+            patch = padded_spectrogram[
+                    i * patch_size[0]:(i + 1) * patch_size[0],
+                    j * patch_size[1]:(j + 1) * patch_size[1]]
+
+            list_patches.append(patch)
+
+    return numpy.array(list_patches)
+
+
+def measure(function, number_repetitions: int) -> float:
+    """
+    Returns the best wall-clock time, in seconds, of several calls to a function.
+    """
+    list_times = []
+
+    for _ in range(number_repetitions):
+        start_time = time.perf_counter()
+        function()
+        list_times.append(time.perf_counter() - start_time)
+
+    return min(list_times)
+
+
+def run_benchmark(arguments) -> None:
+
+    random_generator = numpy.random.default_rng(0)
+    spectrograms = random_generator.random((arguments.number_spectrograms, arguments.number_filters,
+                                            arguments.number_frames), dtype=numpy.float32)
+
+    reference_patches = numpy.array([split_spectrogram_with_loop(spectrogram, arguments.patch_size)
+                                     for spectrogram in spectrograms], dtype=numpy.float32)
+    batched_patches = split_spectrograms_into_patches(spectrograms, arguments.patch_size)
+
+    if not numpy.array_equal(reference_patches, batched_patches):
+        logging.error("Batched patches differ from the reference loop.")
+        sys.exit(-1)
+
+    loop_time = measure(lambda: numpy.array([split_spectrogram_with_loop(spectrogram, arguments.patch_size)
+                                             for spectrogram in spectrograms], dtype=numpy.float32),
+                        arguments.number_repetitions)
+    batched_time = measure(lambda: split_spectrograms_into_patches(spectrograms, arguments.patch_size),
+                           arguments.number_repetitions)
+
+    logging.info(f"Spectrograms: {spectrograms.shape}, patches: {batched_patches.shape}")
+    logging.info(f"Loop: {loop_time:.4f} s, batched: {batched_time:.4f} s, speedup: {loop_time / batched_time:.1f}x")
+
+    for patch_overlap in arguments.patch_overlaps:
+        overlap_time = measure(lambda: split_spectrograms_into_patches(spectrograms, arguments.patch_size,
+                                                                        patch_overlap),
+                               arguments.number_repetitions)
+        overlap_shape = split_spectrograms_into_patches(spectrograms[:1], arguments.patch_size, patch_overlap).shape
+        logging.info(f"Batched with patch overlap {patch_overlap}: {overlap_time:.4f} s, "
+                     f"{overlap_shape[1]} patches per spectrogram")
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    argument_parser = argparse.ArgumentParser(description="Benchmark of the AST patch extraction.")
+    argument_parser.add_argument('--number_spectrograms', type=int, default=DEFAULT_NUMBER_SPECTROGRAMS,
+                                 help='Number of spectrograms in the stack')
+    argument_parser.add_argument('--number_filters', type=int, default=DEFAULT_NUMBER_FILTERS,
+                                 help='Number of mel filters of each spectrogram')
+    argument_parser.add_argument('--number_frames', type=int, default=DEFAULT_NUMBER_FRAMES,
+                                 help='Number of frames of each spectrogram')
+    argument_parser.add_argument('--patch_size', type=int, nargs=2, default=DEFAULT_PATCH_SIZE,
+                                 help='Height and width of the patches')
+    argument_parser.add_argument('--patch_overlaps', type=int, nargs='*', default=[2, 4],
+                                 help='Patch overlap ratios also timed with the batched patchifier')
+    argument_parser.add_argument('--number_repetitions', type=int, default=DEFAULT_NUMBER_REPETITIONS,
+                                 help='Number of timed repetitions (the best one is reported)')
+
+    run_benchmark(argument_parser.parse_args())
@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import json
+    import time
+    import numpy
+    import logging
+    import argparse
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    import main
+
+    from Models.AST import AudioAST
+    from Models.MLP import AudioDense
+    from Models.LSTM import AudioLSTM
+    from Models.Conformer import Conformer
+    from Models.Wav2Vec2 import AudioWav2Vec2
+    from Models.ResidualModel import ResidualModel
+    from Modules.Dataset.LoaderProfiler import get_loader_reports
+    from Modules.Evaluation.PrecisionPolicy import PRECISIONS
+    from Modules.Evaluation.PrecisionPolicy import has_bfloat16_support
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+AVAILABLE_MODELS = {model_class.__name__: model_class for model_class in
+                    (AudioAST, AudioLSTM, AudioDense, Conformer, AudioWav2Vec2, ResidualModel)}
+DEFAULT_MODELS = sorted(AVAILABLE_MODELS)
+DEFAULT_INFERENCE_SAMPLES = 1024  # Synthetic samples of the timed inference pass
+DEFAULT_NUMBER_REPETITIONS = 3
+
+
+def measure_inference(neural_network_model, number_samples: int, batch_size: int, number_repetitions: int) -> float:
+    """
+    Returns the best inference time per sample, in milliseconds, of a trained model on synthetic inputs.
+    """
+    input_shape = tuple(dimension or 1 for dimension in neural_network_model.input_shape[1:])
+    inputs = numpy.random.default_rng(0).standard_normal((number_samples,) + input_shape).astype(numpy.float32)
+
+    # The first call traces the prediction function
+    neural_network_model.predict(inputs[:batch_size], batch_size=batch_size, verbose=0)
+    list_times = []
+
+    for _ in range(number_repetitions):
+        start_time = time.perf_counter()
+        neural_network_model.predict(inputs, batch_size=batch_size, verbose=0)
+        list_times.append(time.perf_counter() - start_time)
+
+    return 1000.0 * min(list_times) / number_samples
+
+
+def run_benchmark(benchmark_arguments, arguments) -> None:
+
+    logging.info(f"Native bfloat16 instructions: {'yes' if has_bfloat16_support() else 'no (emulated)'}")
+    list_results = []
+
+    for model_name in benchmark_arguments.models:
+
+        for precision in benchmark_arguments.precisions:
+            arguments.precision = precision
+            logging.info(f"Training {model_name} with the {precision} policy...")
+
+            try:
+                model = AVAILABLE_MODELS[model_name]()
+                number_reports = len(get_loader_reports())
+                start_time = time.perf_counter()
+                mean_metrics = model.train(arguments.dataset_directory, arguments.number_epochs, arguments.batch_size,
+                                           arguments.number_splits, arguments.loss, arguments.sample_rate,
+                                           arguments.overlap, arguments.number_classes, arguments)[0]
+
+                # The loading time does not depend on the policy, only the training time is compared
+                loading_time = sum(report['wall_time'] for report in get_loader_reports()[number_reports:])
+                training_time = time.perf_counter() - start_time - loading_time
+
+                inference_time = measure_inference(model.neural_network_model, benchmark_arguments.inference_samples,
+                                                   arguments.batch_size, benchmark_arguments.number_repetitions)
+
+            except Exception as error:
+                logging.error(f"Training {model_name} with the {precision} policy failed: {error}")
+                continue
+
+            list_results.append({'model': model_name, 'precision': precision,
+                                 'accuracy': float(mean_metrics['Acc.']['value']),
+                                 'f1': float(mean_metrics['F1.']['value']),
+                                 'training_time': training_time,
+                                 'inference_time': inference_time})
+
+    logging.info(f"{'Model':<16}{'Policy':<16}{'Acc.':>8}{'F1':>8}{'Delta acc.':>12}{'Train (s)':>11}"
+                 f"{'Speedup':>9}{'Infer (ms)':>12}{'Speedup':>9}")
+
+    for result in list_results:
+        reference = [reference for reference in list_results if reference['model'] == result['model']
+                     and reference['precision'] == "float32"]
+        reference = reference[0] if reference else None
+
+        delta = result['accuracy'] - reference['accuracy'] if reference else float('nan')
+        training_speedup = reference['training_time'] / result['training_time'] if reference else float('nan')
+        inference_speedup = reference['inference_time'] / result['inference_time'] if reference else float('nan')
+
+        logging.info(f"{result['model']:<16}{result['precision']:<16}{result['accuracy']:>8.4f}{result['f1']:>8.4f}"
+                     f"{delta:>12.4f}{result['training_time']:>11.1f}{training_speedup:>9.2f}"
+                     f"{result['inference_time']:>12.3f}{inference_speedup:>9.2f}")
+
+    if benchmark_arguments.output_file:
+
+        with open(benchmark_arguments.output_file, 'w') as output_file:
+            json.dump(list_results, output_file, indent=1)
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    argument_parser = argparse.ArgumentParser(description="Training time, inference time and accuracy of the models "
+                                                          "with the float32 and mixed_bfloat16 policies. Other "
+                                                          "arguments are passed to main.py.")
+    argument_parser.add_argument('--models', type=str, nargs='+', choices=sorted(AVAILABLE_MODELS),
+                                 default=DEFAULT_MODELS, help='Models trained with each policy')
+    argument_parser.add_argument('--precisions', type=str, nargs='+', choices=PRECISIONS,
+                                 default=list(PRECISIONS), help='Dtype policies compared')
+    argument_parser.add_argument('--inference_samples', type=int, default=DEFAULT_INFERENCE_SAMPLES,
+                                 help='Number of synthetic samples of the timed inference pass')
+    argument_parser.add_argument('--number_repetitions', type=int, default=DEFAULT_NUMBER_REPETITIONS,
+                                 help='Number of timed inference passes (the best one is reported)')
+    argument_parser.add_argument('--output_file', type=str, default=None,
+                                 help='JSON file where the results are written')
+    benchmark_arguments, main_arguments = argument_parser.parse_known_args()
+
+    # The remaining arguments configure the models exactly as in main.py
+    sys.argv = sys.argv[:1] + main_arguments
+    run_benchmark(benchmark_arguments, main.get_arguments())
@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import time
+    import numpy
+    import librosa
+    import logging
+    import argparse
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from Modules.Dataset.WindowFraming import frame_signal
+    from Modules.Dataset.WindowFraming import get_window_step
+    from Modules.Dataset.WindowFraming import LAST_WINDOW_POLICIES
+    from Modules.Dataset.MelSpectrogram import SHARED_STFT_TOLERANCE
+    from Modules.Dataset.MelSpectrogram import compute_decibel_spectrograms
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_SAMPLE_RATE = 8000
+DEFAULT_FILE_DURATION = 20.3  # Seconds of signal of each synthetic file, not a multiple of the window step
+DEFAULT_NUMBER_FILES = 3
+DEFAULT_HOP_LENGTH = 256  # Same spectrogram layout as the ResidualModel and Conformer defaults
+DEFAULT_WINDOW_SIZE_FACTOR = 40
+DEFAULT_N_FFT = 1024
+DEFAULT_NUMBER_FILTERS = 512
+DEFAULT_DECIBEL_SCALE_FACTOR = 80
+DEFAULT_OVERLAPS = [1, 2]
+DEFAULT_NUMBER_REPETITIONS = 3
+
+
+def generate_signals(arguments) -> list:
+    """
+    Returns the signals compared by the benchmark: the given audio files, or synthetic wingbeat-like tones
+    with harmonics, noise and a stretch of digital silence.
+    """
+    if arguments.audio_files:
+        return [librosa.load(file_name, sr=arguments.sample_rate)[0] for file_name in arguments.audio_files]
+
+    random_generator = numpy.random.default_rng(0)
+    time_axis = numpy.arange(int(arguments.file_duration * arguments.sample_rate)) / arguments.sample_rate
+    list_signals = []
+
+    for _ in range(arguments.number_files):
+        fundamental = random_generator.uniform(300.0, 700.0)
+        signal = sum(numpy.sin(2 * numpy.pi * fundamental * harmonic * time_axis) / harmonic for harmonic in (1, 2, 3))
+        signal = signal + random_generator.normal(0.0, 0.05, len(time_axis))
+        signal[:len(signal) // 10] = 0.0
+        list_signals.append((signal / numpy.max(numpy.abs(signal))).astype(numpy.float32))
+
+    return list_signals
+
+
+def compute_scaled_spectrograms(signal: numpy.ndarray, signal_windows: numpy.ndarray, step: int, arguments,
+                                spectrogram_mode: str) -> numpy.ndarray:
+    """
+    Returns the decibel spectrograms scaled as the models use them (`dB / decibel_scale_factor + 1`).
+    """
+    spectrograms = compute_decibel_spectrograms(signal, signal_windows, step, arguments.sample_rate, arguments.n_fft,
+                                                arguments.hop_length, arguments.number_filters, spectrogram_mode)
+    return spectrograms / arguments.decibel_scale_factor + 1
+
+
+def measure(function, number_repetitions: int) -> float:
+    """
+    Returns the best wall-clock time, in seconds, of several calls to a function.
+    """
+    list_times = []
+
+    for _ in range(number_repetitions):
+        start_time = time.perf_counter()
+        function()
+        list_times.append(time.perf_counter() - start_time)
+
+    return min(list_times)
+
+
+def run_benchmark(arguments) -> None:
+
+    list_signals = generate_signals(arguments)
+    window_size = arguments.hop_length * arguments.window_size_factor
+    maximum_difference = 0.0
+
+    logging.info(f"{len(list_signals)} signals, windows of {window_size} samples, "
+                 f"tolerance {SHARED_STFT_TOLERANCE:g}")
+
+    for overlap in arguments.overlaps:
+        step = get_window_step(window_size, overlap)
+
+        for last_window_policy in LAST_WINDOW_POLICIES:
+            case_difference, per_window_time, shared_time = 0.0, 0.0, 0.0
+
+            for signal in list_signals:
+                signal_windows = frame_signal(signal, window_size, step, last_window_policy)
+
+                per_window_spectrograms = compute_scaled_spectrograms(signal, signal_windows, step, arguments,
+                                                                      "per_window")
+                shared_spectrograms = compute_scaled_spectrograms(signal, signal_windows, step, arguments,
+                                                                  "shared_stft")
+
+                if per_window_spectrograms.shape != shared_spectrograms.shape:
+                    logging.error(f"Shared STFT spectrograms of shape {shared_spectrograms.shape} differ from the "
+                                  f"per-window shape {per_window_spectrograms.shape}.")
+                    sys.exit(-1)
+
+                if len(signal_windows):
+                    case_difference = max(case_difference, float(numpy.max(numpy.abs(per_window_spectrograms
+                                                                                      - shared_spectrograms))))
+
+                per_window_time += measure(lambda: compute_scaled_spectrograms(signal, signal_windows, step,
+                                                                               arguments, "per_window"),
+                                           arguments.number_repetitions)
+                shared_time += measure(lambda: compute_scaled_spectrograms(signal, signal_windows, step,
+                                                                           arguments, "shared_stft"),
+                                       arguments.number_repetitions)
+
+            maximum_difference = max(maximum_difference, case_difference)
+            logging.info(f"Overlap {overlap}, policy {last_window_policy:<8} max difference: {case_difference:.2e}, "
+                         f"per window: {per_window_time:.3f} s, shared STFT: {shared_time:.3f} s, "
+                         f"speedup: {per_window_time / shared_time:.1f}x")
+
+    if maximum_difference > SHARED_STFT_TOLERANCE:
+        logging.error(f"Shared STFT spectrograms differ from the per-window ones by {maximum_difference:.2e}, "
+                      f"above the tolerance {SHARED_STFT_TOLERANCE:g}.")
+        sys.exit(-1)
+
+    logging.info(f"Shared STFT spectrograms match the per-window ones within {SHARED_STFT_TOLERANCE:g} "
+                 f"(max difference {maximum_difference:.2e}).")
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    argument_parser = argparse.ArgumentParser(description="Comparison of the 'per_window' and 'shared_stft' "
+                                                          "spectrogram modes.")
+    argument_parser.add_argument('--audio_files', type=str, nargs='*', default=None,
+                                 help='Audio files compared instead of the synthetic signals')
+    argument_parser.add_argument('--sample_rate', type=int, default=DEFAULT_SAMPLE_RATE,
+                                 help='Sample rate of the signals')
+    argument_parser.add_argument('--file_duration', type=float, default=DEFAULT_FILE_DURATION,
+                                 help='Duration in seconds of each synthetic signal')
+    argument_parser.add_argument('--number_files', type=int, default=DEFAULT_NUMBER_FILES,
+                                 help='Number of synthetic signals')
+    argument_parser.add_argument('--hop_length', type=int, default=DEFAULT_HOP_LENGTH,
+                                 help='Number of samples between consecutive frames')
+    argument_parser.add_argument('--window_size_factor', type=int, default=DEFAULT_WINDOW_SIZE_FACTOR,
+                                 help='Number of hops of each window')
+    argument_parser.add_argument('--n_fft', type=int, default=DEFAULT_N_FFT,
+                                 help='Size of the FFT')
+    argument_parser.add_argument('--number_filters', type=int, default=DEFAULT_NUMBER_FILTERS,
+                                 help='Number of mel filters')
+    argument_parser.add_argument('--decibel_scale_factor', type=float, default=DEFAULT_DECIBEL_SCALE_FACTOR,
+                                 help='Scale factor of the decibel spectrograms')
+    argument_parser.add_argument('--overlaps', type=int, nargs='+', default=DEFAULT_OVERLAPS,
+                                 help='Overlap factors between consecutive windows')
+    argument_parser.add_argument('--number_repetitions', type=int, default=DEFAULT_NUMBER_REPETITIONS,
+                                 help='Number of timed repetitions (the best one is reported)')
+
+    run_benchmark(argument_parser.parse_args())
@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import time
+    import numpy
+    import logging
+    import argparse
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from Modules.Dataset.WindowFraming import frame_signal
+    from Modules.Dataset.WindowFraming import get_window_step
+    from Modules.Dataset.FeatureExtractor import normalize_amplitude_windows
+    from Modules.Dataset.FeatureExtractor import normalize_segmented_windows
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_SAMPLE_RATE = 8000
+DEFAULT_FILE_DURATION = 60.0  # Seconds of signal of each synthetic file
+DEFAULT_HOP_LENGTH = 256  # Same window layout as the LSTM and MLP defaults
+DEFAULT_WINDOW_SIZE_FACTOR = 40
+DEFAULT_OVERLAP = 2
+DEFAULT_NUMBER_REPETITIONS = 5
+
+
+def normalize_amplitude_with_loop(signal_windows: numpy.ndarray) -> numpy.ndarray:
+    """
+    Former per-window loop of AudioWav2Vec2, kept as the reference of the benchmark.
+    """
+    list_windows = []
+
+    for signal_window in numpy.abs(signal_windows):
+        signal_min = numpy.min(signal_window)
+        signal_max = numpy.max(signal_window)
+
+        if signal_max != signal_min:
+            normalized_signal = (signal_window - signal_min) / (signal_max - signal_min)
+        else:
+            normalized_signal = numpy.zeros_like(signal_window)
+
+        list_windows.append(normalized_signal)
+
+    return numpy.array(list_windows, dtype=numpy.float32).reshape(signal_windows.shape)
+
+
+def normalize_segmented_with_loop(signal_windows: numpy.ndarray, window_size_factor: int) -> numpy.ndarray:
+    """
+    Former per-window loop of AudioLSTM and AudioDense, kept as the reference of the benchmark.
+    """
+    list_windows = []
+    local_window = signal_windows.shape[1] // window_size_factor
+
+    for signal_window in signal_windows:
+        signal_segments = signal_window[:local_window * window_size_factor].reshape(window_size_factor, local_window)
+        signal_segments = numpy.abs(signal_segments)
+
+        signal_min = numpy.min(signal_segments)
+        signal_max = numpy.max(signal_segments)
+
+        if signal_max != signal_min:
+            normalized_signal = (signal_segments - signal_min) / (signal_max - signal_min)
+        else:
+            normalized_signal = numpy.zeros_like(signal_segments)
+
+        list_windows.append(normalized_signal)
+
+    return numpy.array(list_windows, dtype=numpy.float32).reshape(len(signal_windows), window_size_factor,
+                                                                 local_window)
+
+
+def measure(function, number_repetitions: int) -> float:
+    """
+    Returns the best wall-clock time, in seconds, of several calls to a function.
+    """
+    list_times = []
+
+    for _ in range(number_repetitions):
+        start_time = time.perf_counter()
+        function()
+        list_times.append(time.perf_counter() - start_time)
+
+    return min(list_times)
+
+
+def run_benchmark(arguments) -> None:
+
+    random_generator = numpy.random.default_rng(0)
+    signal = random_generator.uniform(-1.0, 1.0, int(arguments.file_duration * arguments.sample_rate))
+    signal = signal.astype(numpy.float32)
+
+    # A stretch of digital silence exercises the constant windows
+    signal[:len(signal) // 10] = 0.0
+
+    window_size = arguments.hop_length * arguments.window_size_factor
+    signal_windows = frame_signal(signal, window_size, get_window_step(window_size, arguments.overlap))
+
+    # An extra sample makes the last segment of each window ragged
+    ragged_windows = frame_signal(signal, window_size + 1, get_window_step(window_size + 1, arguments.overlap))
+
+    list_cases = [("amplitude", signal_windows, normalize_amplitude_with_loop, normalize_amplitude_windows),
+                  ("segmented", signal_windows,
+                   lambda windows: normalize_segmented_with_loop(windows, arguments.window_size_factor),
+                   lambda windows: normalize_segmented_windows(windows, arguments.window_size_factor)),
+                  ("segmented (ragged)", ragged_windows,
+                   lambda windows: normalize_segmented_with_loop(windows, arguments.window_size_factor),
+                   lambda windows: normalize_segmented_windows(windows, arguments.window_size_factor))]
+
+    logging.info(f"File of {arguments.file_duration:.0f} s: {len(signal_windows)} windows of {window_size} samples")
+
+    for case_name, windows, loop_function, batched_function in list_cases:
+
+        if not numpy.array_equal(loop_function(windows), batched_function(windows)):
+            logging.error(f"Batched {case_name} normalization differs from the reference loop.")
+            sys.exit(-1)
+
+        loop_time = measure(lambda: loop_function(windows), arguments.number_repetitions)
+        batched_time = measure(lambda: batched_function(windows), arguments.number_repetitions)
+
+        logging.info(f"{case_name:<20} loop: {loop_time * 1000:.2f} ms/file, batched: {batched_time * 1000:.2f} "
+                     f"ms/file, speedup: {loop_time / batched_time:.1f}x")
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    argument_parser = argparse.ArgumentParser(description="Benchmark of the per-window normalization of the "
+                                                          "LSTM, MLP and Wav2Vec2 loaders.")
+    argument_parser.add_argument('--sample_rate', type=int, default=DEFAULT_SAMPLE_RATE,
+                                 help='Sample rate of the synthetic file')
+    argument_parser.add_argument('--file_duration', type=float, default=DEFAULT_FILE_DURATION,
+                                 help='Duration in seconds of the synthetic file')
+    argument_parser.add_argument('--hop_length', type=int, default=DEFAULT_HOP_LENGTH,
+                                 help='Number of samples of each segment')
+    argument_parser.add_argument('--window_size_factor', type=int, default=DEFAULT_WINDOW_SIZE_FACTOR,
+                                 help='Number of segments of each window')
+    argument_parser.add_argument('--overlap', type=int, default=DEFAULT_OVERLAP,
+                                 help='Overlap factor between consecutive windows')
+    argument_parser.add_argument('--number_repetitions', type=int, default=DEFAULT_NUMBER_REPETITIONS,
+                                 help='Number of timed repetitions (the best one is reported)')
+
+    run_benchmark(argument_parser.parse_args())
@@ -18,10 +18,8 @@ try:
     import librosa
     import tensorflow
 
-    from tqdm import tqdm
     import librosa.display
     from tensorflow.keras import Model
-    from sklearn.utils import resample
     from tensorflow.keras.layers import Conv2D
     from tensorflow.keras.layers import Flatten
     from tensorflow.keras.layers import Dense
@@ -29,10 +27,47 @@ try:
     from tensorflow.keras.layers import Dropout
     from tensorflow.keras.layers import Concatenate
     from tensorflow.keras.layers import MaxPooling2D
+    from tensorflow.keras.layers import Reshape
+    from tensorflow.keras.layers import ZeroPadding2D
     from sklearn.model_selection import StratifiedKFold
     from sklearn.model_selection import train_test_split
 
+    from Modules.Dataset.FeatureCache import FeatureCache
+    from Modules.Dataset.ParallelExtractor import ParallelExtractor
+    from Modules.Dataset.WaveformStore import WaveformStore
+    from Modules.Dataset.AudioDecoder import AudioDecoder
+    from Modules.Dataset.MetadataIndex import MetadataIndex
+    from Modules.Dataset.ActivityDetector import ActivityDetector
+    from Modules.Dataset.LoaderProfiler import LoaderProfiler
+    from Modules.Evaluation.FoldExecutor import FoldExecutor
+    from Modules.Evaluation.FoldJournal import FoldJournal
+    from Modules.Evaluation.TrainingSchedule import TrainingSchedule
+    from Modules.Evaluation.TrainingSchedule import add_training_schedule_args
+    from Modules.Evaluation.PrecisionPolicy import OUTPUT_DTYPE
+    from Modules.Evaluation.PrecisionPolicy import DEFAULT_PRECISION
+    from Modules.Evaluation.PrecisionPolicy import apply_precision_policy
+    from Modules.Dataset.WindowFraming import get_window_step
+    from Modules.Dataset.FeatureExtractor import extract_feature_block
+    from Modules.Dataset.WindowFraming import DEFAULT_LAST_WINDOW_POLICY
+    from Modules.Dataset.FeatureAssembler import get_memmap_path
+    from Modules.Dataset.FeatureAssembler import log_peak_memory
+    from Modules.Dataset.FeatureAssembler import get_peak_memory
+    from Modules.Dataset.FeatureAssembler import assemble_features
+    from Modules.Dataset.FeatureAssembler import count_file_windows
+    from Modules.Dataset.FeatureAssembler import DEFAULT_MEMMAP_DIRECTORY
+    from Modules.Dataset.StreamingDataset import train_streaming
+    from Modules.Dataset.StreamingDataset import DEFAULT_STREAMING_MODE
+    from Modules.Dataset.ShardedDataset import load_model_features
+    from Modules.Dataset.DatasetManifest import DatasetManifest
+    from Modules.Dataset.BalancedSampler import balance_indexes
+    from Modules.Dataset.FeatureQuantization import get_cache_dtype
+    from Modules.Dataset.FeatureQuantization import quantize_features
+    from Modules.Dataset.FeatureQuantization import get_assembly_dtype
+    from Modules.Dataset.FeatureQuantization import DEFAULT_FEATURE_DTYPE
+    from Modules.Dataset.WindowIndex import IndexedBatches
+    from Modules.Dataset.MelSpectrogram import DEFAULT_SPECTROGRAM_MODE
     from Modules.Evaluation.MetricsCalculator import MetricsCalculator
+    from Modules.Layers.MelSpectrogramLayer import MelSpectrogramLayer
 
 except ImportError as error:
 
@@ -171,6 +206,21 @@ class ResidualModel(MetricsCalculator):
         self.last_layer_activation = last_layer_activation
         self.convolutional_padding = convolutional_padding
         self.intermediary_activation = intermediary_activation
+        self.feature_cache = FeatureCache()
+        self.parallel_extractor = ParallelExtractor()
+        self.waveform_store = WaveformStore()
+        self.dataset_manifest = DatasetManifest()
+        self.metadata_index = MetadataIndex()
+        self.metadata_filters = None
+        self.activity_detector = ActivityDetector()
+        self.fold_executor = FoldExecutor()
+        self.training_schedule = TrainingSchedule()
+        self.precision = DEFAULT_PRECISION
+        self.last_window_policy = DEFAULT_LAST_WINDOW_POLICY
+        self.feature_memmap_directory = DEFAULT_MEMMAP_DIRECTORY
+        self.feature_dtype = DEFAULT_FEATURE_DTYPE
+        self.spectrogram_mode = DEFAULT_SPECTROGRAM_MODE
+        self.streaming_mode = DEFAULT_STREAMING_MODE
 
     def build_model(self):
         """
@@ -184,8 +234,20 @@ class ResidualModel(MetricsCalculator):
         keras.Model
             The compiled Convolutional model.
         """
-        inputs = Input(shape=self.input_shape)
-        neural_network_flow = inputs
+        # Layers built from here on follow the dtype policy of the chosen precision
+        apply_precision_policy(self.precision)
+
+        if self.spectrogram_mode == "in_graph":
+            # Compute the spectrograms from raw windows inside the graph, with the additional zero filter row
+            inputs = Input(shape=(self.window_size,))
+            spectrograms = MelSpectrogramLayer(self.sample_rate, self.window_size_fft, self.hop_length,
+                                               self.number_filters_spectrogram, self.decibel_scale_factor)(inputs)
+            neural_network_flow = Reshape(tuple(spectrograms.shape[1:]) + (1,))(spectrograms)
+            neural_network_flow = ZeroPadding2D(((0, 1), (0, 0)))(neural_network_flow)
+
+        else:
+            inputs = Input(shape=self.input_shape)
+            neural_network_flow = inputs
 
         for number_filters in self.filters_per_block:
             residual_flow = neural_network_flow
@@ -207,34 +269,86 @@ class ResidualModel(MetricsCalculator):
 
         # Flatten and apply dense layer
         neural_network_flow = Flatten()(neural_network_flow)
-        neural_network_flow = Dense(self.number_classes, activation=self.last_layer_activation)(neural_network_flow)
+        neural_network_flow = Dense(self.number_classes, activation=self.last_layer_activation, dtype=OUTPUT_DTYPE)(neural_network_flow)
 
         # Define the model
         self.neural_network_model = Model(inputs=inputs, outputs=neural_network_flow, name=self.model_name)
 
-    @staticmethod
-    def windows(data, window_size, overlap):
+    def get_feature_parameters(self) -> dict:
         """
-        Generates windowed segments of the input data.
+        Returns every parameter that affects the features extracted from a file, used as the feature cache key.
+
+        Returns
+        -------
+        dict
+            Dictionary with the feature type and the extraction parameters.
+        """
+        return {'feature_type': 'mel_spectrogram',
+                'sample_rate': self.sample_rate,
+                'window_size': self.window_size,
+                'hop_length': self.hop_length,
+                'n_fft': self.window_size_fft,
+                'n_mels': self.number_filters_spectrogram,
+                'overlap': self.overlap,
+                'last_window_policy': self.last_window_policy,
+                'spectrogram_mode': self.spectrogram_mode,
+                'decibel_scale_factor': self.decibel_scale_factor,
+                **self.activity_detector.get_parameters()}
+
+    def extract_features(self, signal: numpy.ndarray) -> numpy.ndarray:
+        """
+        Extracts the mel spectrogram, in scaled decibels, of every complete window of a signal.
 
         Parameters
         ----------
-        data : numpy.ndarray
-            The input data array.
-        window_size : int
-            The size of each window.
-        overlap : int
-            The overlap between consecutive windows.
-
-        Yields
-        ------
-        tuple
-            Start and end indices of each window.
+        signal : numpy.ndarray
+            The audio signal of one file.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape (number_windows, number_filters_spectrogram, number_frames).
+        """
+        return extract_feature_block(signal, self.get_feature_parameters())
+
+    def load_file_features(self, file_name: str) -> numpy.ndarray:
         """
-        start = 0
-        while start < len(data):
-            yield start, start + window_size
-            start += (window_size // overlap)
+        Reads the signal of an audio file from the waveform store and extracts the mel spectrograms of its windows.
+
+        Parameters
+        ----------
+        file_name : str
+            Path to the audio file.
+
+        Returns
+        -------
+        numpy.ndarray
+            Mel spectrograms of every complete window of the file.
+        """
+        signal = self.waveform_store.load(file_name, self.sample_rate)
+        return self.extract_features(signal)
+
+    def load_file_windows(self, file_name: str) -> numpy.ndarray:
+        """
+        Loads the features of an audio file in the layout of the model input, used by the streaming mode.
+
+        Parameters
+        ----------
+        file_name : str
+            Path to the audio file.
+
+        Returns
+        -------
+        numpy.ndarray
+            Padded mel spectrograms of every complete window of the file, with a channel axis.
+        """
+        features = self.load_file_features(file_name)
+
+        if self.spectrogram_mode == "in_graph":
+            return features
+
+        # Each spectrogram gets an additional filter row filled with zeros, as in load_data
+        return numpy.pad(features, ((0, 0), (0, 1), (0, 0)))[..., numpy.newaxis]
 
     def load_data(self, sub_directories: str = None, file_extension: str = None) -> tuple:
         """
@@ -258,102 +372,111 @@ class ResidualModel(MetricsCalculator):
             - numpy.ndarray: Label array (class labels).
         """
         logging.info("Starting data loading process.")
+        log_peak_memory("before loading the data")
+        loader_profiler = LoaderProfiler(self.model_name)
+        loader_profiler.start()
 
-        list_spectrogram, list_labels, list_class_path = [], [], []
+        list_class_path = []
         file_extension = file_extension or self.file_extension
 
-        # Collect class paths
-        logging.info(f"Listing subdirectories in {sub_directories}")
-        for class_dir in os.listdir(sub_directories):
-            class_path = os.path.join(sub_directories, class_dir)
-            list_class_path.append(class_path)
-
-        # Process each subdirectory
-        for _, sub_directory in enumerate(list_class_path):
-            logging.info(f"Processing directory: {sub_directory}")
-
-            for file_name in tqdm(glob.glob(os.path.join(sub_directory, file_extension))):
-
-                # Load the audio signal
-                signal, _ = librosa.load(file_name, sr=self.sample_rate)
-                label = file_name.split('/')[-2].split('_')[0]  # Extract label from the file path
-
-                # Segment the audio into windows
-                for (start, end) in self.windows(signal, self.window_size, self.overlap):
-
-                    if len(signal[start:end]) == self.window_size:
-                        signal_segment = signal[start:end]
-
-                        # Generate a mel spectrogram
-                        spectrogram = librosa.feature.melspectrogram(y=signal_segment,
-                                                                     n_mels=self.number_filters_spectrogram,
-                                                                     sr=self.sample_rate,
-                                                                     n_fft=self.window_size_fft,
-                                                                     hop_length=self.hop_length)
-
-                        # Convert the spectrogram to decibel scale
-                        spectrogram_decibel_scale = librosa.power_to_db(spectrogram, ref=numpy.max)
-                        spectrogram_decibel_scale = (spectrogram_decibel_scale / self.decibel_scale_factor) + 1
-                        list_spectrogram.append(spectrogram_decibel_scale)
-                        list_labels.append(label)
-
-        # Convert lists to arrays
-        array_features = numpy.array(list_spectrogram).reshape(len(list_spectrogram),
-                                                            self.number_filters_spectrogram,
-                                                            self.window_size_factor, 1)
-        array_labels = numpy.array(list_labels, dtype=numpy.int32)
-
-        # Adjust array shape for additional dimensions
-        logging.info("Reshaping feature array.")
-        new_shape = list(array_features.shape)
-        new_shape[1] += 1  # Adding an additional filter dimension
-        new_array = numpy.zeros(new_shape)
-        new_array[:, :self.number_filters_spectrogram, :, :] = array_features
+        feature_parameters = self.get_feature_parameters()
+
+        # Resolve the files and labels from the metadata index instead of listing the class directories
+        if self.metadata_index.enabled:
+            list_files, list_file_labels = self.metadata_index.select_files(self.metadata_filters)
+
+        else:
+            list_files, list_file_labels = [], []
+
+            # Collect class paths
+            logging.info(f"Listing subdirectories in {sub_directories}")
+            for class_dir in os.listdir(sub_directories):
+                class_path = os.path.join(sub_directories, class_dir)
+                list_class_path.append(class_path)
+
+            # Collect the audio files and labels of each class directory
+            for _, sub_directory in enumerate(list_class_path):
+                logging.info(f"Processing directory: {sub_directory}")
+
+                for file_name in glob.glob(os.path.join(sub_directory, file_extension)):
+                    list_files.append(file_name)
+                    list_file_labels.append(int(file_name.split('/')[-2].split('_')[0]))
+
+        def write_padded_spectrograms(output, block):
+            # Each spectrogram gets an additional filter row, which is left filled with zeros
+            output[:, :block.shape[1], :, 0] = block
+
+        def get_padded_shape(shape):
+            return shape[0] + 1, shape[1], 1
+
+        # Raw windows are written as they are, the model pads their spectrograms
+        if self.spectrogram_mode == "in_graph":
+            write_padded_spectrograms, get_padded_shape = None, None
+
+        # Count the windows of each file from its length to preallocate the feature array
+        step = get_window_step(self.window_size, self.overlap)
+        list_window_counts = [count_file_windows(file_name, self.sample_rate, self.window_size, step,
+                                                 self.last_window_policy, self.waveform_store)
+                              for file_name in list_files]
+        self.dataset_manifest.record_window_counts(self.model_name, list_files, list_window_counts)
+
+        # Write the spectrograms of each file in place as they are read from the feature cache or extracted
+        file_features = self.parallel_extractor.iterate_features(list_files, self.load_file_features,
+                                                                 feature_parameters, self.feature_cache)
+        memmap_path = get_memmap_path(self.feature_memmap_directory, self.model_name)
+        array_features, array_labels = assemble_features(file_features, list_file_labels, list_window_counts,
+                                                         window_shape_function=get_padded_shape,
+                                                         write_function=write_padded_spectrograms,
+                                                         memmap_path=memmap_path,
+                                                         dtype=get_assembly_dtype(self.feature_dtype))
+        array_features = quantize_features(array_features, self.feature_dtype, memmap_path)
+
+        self.feature_cache.finalize()
+        self.activity_detector.log_skipped_windows(sum(list_window_counts), len(array_labels))
 
         logging.info("Data loading complete.")
-        return numpy.array(new_array, dtype=numpy.float32), array_labels
+        loader_profiler.finish(len(list_files), len(array_labels), get_peak_memory())
+        log_peak_memory("after loading the data")
+
+        return array_features, array_labels
 
     def compile_and_train(self, train_data: tensorflow.Tensor, train_labels: tensorflow.Tensor, epochs: int,
-                          batch_size: int, validation_data: tuple = None) -> tensorflow.keras.callbacks.History:
+                          batch_size: int, validation_data: tuple = None,
+                          callbacks: list = None) -> tensorflow.keras.callbacks.History:
         """
         Compiles and trains the LSTM model on the provided training data.
 
-        :param train_data: Tensor containing the training data.
-        :param train_labels: Tensor containing the training labels.
+        :param train_data: Tensor containing the training data, or a batched dataset of (data, labels) pairs.
+        :param train_labels: Tensor containing the training labels (None for a dataset).
         :param epochs: Number of training epochs.
         :param batch_size: Batch size for training.
         :param validation_data: Tuple containing validation data and labels (optional).
+        :param callbacks: Keras callbacks of the training, e.g. the epoch backups of the fold journal (optional).
         :return: Training history containing metrics and loss values for each epoch.
         """
         self.neural_network_model.compile(optimizer=self.optimizer_function, loss=self.loss_function,
                                           metrics=['accuracy'])
 
-        training_history = self.neural_network_model.fit(train_data, train_labels, epochs=epochs,
-                                                         batch_size=batch_size,
-                                                         validation_data=validation_data)
+        # Streamed datasets are already batched and hold their labels
+        if isinstance(train_data, (tensorflow.data.Dataset, IndexedBatches)):
+            batch_size = None
+
+        training_history = self.training_schedule.fit(self.neural_network_model, train_data, train_labels,
+                                                      epochs=epochs, batch_size=batch_size,
+                                                      validation_data=validation_data, callbacks=callbacks)
         return training_history
 
-    def train(self, dataset_directory, number_epochs, batch_size, number_splits,
-              loss, sample_rate, overlap, number_classes, arguments) -> tuple:
+    def set_parameters(self, dataset_directory, number_epochs, batch_size, number_splits,
+                       loss, sample_rate, overlap, number_classes, arguments) -> None:
         """
-        Trains the model using cross-validation.
+        Sets the training, model and feature extraction parameters from the command line arguments.
 
         Parameters
         ----------
         dataset_directory : str
             Directory containing the training data.
-        number_epochs : int, optional
-            Number of training epochs.
-        batch_size : int, optional
-            Batch size for training.
-        number_splits : int, optional
-            Number of splits for cross-validation.
-
-        Returns
-        -------
-        tuple
-            A tuple containing the mean metrics, the training history, the mean confusion matrix,
-            and the predicted probabilities along with the ground truth labels.
+        arguments : argparse.Namespace
+            Parsed command line arguments.
         """
         # Use default values if not provided
         self.number_epochs = number_epochs or self.number_epochs
@@ -378,113 +501,91 @@ class ResidualModel(MetricsCalculator):
         self.last_layer_activation = arguments.residual_last_layer_activation
         self.convolutional_padding = arguments.residual_convolutional_padding
         self.intermediary_activation = arguments.residual_intermediary_activation
+        self.feature_cache = FeatureCache(arguments.feature_cache_directory, arguments.feature_cache_size_budget,
+                                          get_cache_dtype(arguments.feature_dtype))
+        self.parallel_extractor = ParallelExtractor(arguments.loader_workers)
+        self.waveform_store = WaveformStore(arguments.waveform_store_directory,
+                                            AudioDecoder(arguments.resampling_backend, arguments.decode_cache_directory))
+        self.dataset_manifest = DatasetManifest(arguments.dataset_manifest_path, dataset_directory)
+        self.metadata_index = MetadataIndex(arguments.metadata_index_path)
+        self.metadata_filters = arguments.metadata_filter
+        self.activity_detector = ActivityDetector(arguments.activity_energy_threshold,
+                                                  arguments.activity_flux_threshold)
+        self.last_window_policy = arguments.last_window_policy
+        self.feature_memmap_directory = arguments.feature_memmap_directory
+        self.feature_dtype = arguments.feature_dtype
+        self.spectrogram_mode = arguments.spectrogram_mode
+        self.streaming_mode = arguments.streaming_mode
+        self.fold_executor = FoldExecutor(arguments.fold_workers, arguments.fold_share_directory,
+                                          fold_journal=FoldJournal.from_arguments(arguments))
+        self.training_schedule = TrainingSchedule.from_arguments(arguments, 'residual')
+        self.precision = arguments.precision
 
+    def train(self, dataset_directory, number_epochs, batch_size, number_splits,
+              loss, sample_rate, overlap, number_classes, arguments) -> tuple:
+        """
+        Trains the model using cross-validation.
 
+        Parameters
+        ----------
+        dataset_directory : str
+            Directory containing the training data.
+        number_epochs : int, optional
+            Number of training epochs.
+        batch_size : int, optional
+            Batch size for training.
+        number_splits : int, optional
+            Number of splits for cross-validation.
 
+        Returns
+        -------
+        tuple
+            A tuple containing the mean metrics, the training history, the mean confusion matrix,
+            and the predicted probabilities along with the ground truth labels.
+        """
+        self.set_parameters(dataset_directory, number_epochs, batch_size, number_splits, loss, sample_rate, overlap,
+                            number_classes, arguments)
 
+        # Stream the features through tf.data pipelines instead of loading them in memory
+        if self.streaming_mode:
+            return train_streaming(self, dataset_directory, self.file_extension,
+                                   (dataset_directory, number_epochs, batch_size, number_splits, loss,
+                                    sample_rate, overlap, number_classes, arguments), arguments)
 
-        history_model = None
-        features, labels = self.load_data(dataset_directory)
-        metrics_list, confusion_matriz_list = [], []
-        labels = numpy.array(labels).astype(float)
-
-        # Split data into train/val and test sets
-        features_train_val, features_test, labels_train_val, labels_test = train_test_split(
-            features, labels, test_size=0.2, stratify=labels, random_state=42
-        )
 
-        # Function to balance the classes by resampling
-        def balance_classes(features, labels):
-            unique_classes = numpy.unique(labels)
-            max_samples = max([sum(labels == c) for c in unique_classes])
 
-            balanced_features = []
-            balanced_labels = []
 
-            for c in unique_classes:
-                features_class = features[labels == c]
-                labels_class = labels[labels == c]
 
-                features_class_resampled, labels_class_resampled = resample(
-                    features_class, labels_class,
-                    replace=True,
-                    n_samples=max_samples,
-                    random_state=0
-                )
+        features, labels = load_model_features(self, self.load_data, dataset_directory, arguments)
 
-                balanced_features.append(features_class_resampled)
-                balanced_labels.append(labels_class_resampled)
+        # The features were only exported to shards
+        if arguments.shard_export_only:
+            return None
 
-            balanced_features = numpy.vstack(balanced_features)
-            balanced_labels = numpy.hstack(balanced_labels)
+        labels = numpy.array(labels).astype(float)
 
-            return balanced_features, balanced_labels
+        # Split the sample indexes into train/val and test sets, the features are only gathered per batch
+        indexes_train_val, indexes_test, labels_train_val, labels_test = train_test_split(
+            numpy.arange(len(labels)), labels, test_size=0.2, stratify=labels, random_state=42
+        )
 
         # Balance training/validation set
-        features_train_val, labels_train_val = balance_classes(features_train_val, labels_train_val)
+        indexes_train_val, labels_train_val = balance_indexes(indexes_train_val, labels_train_val, features)
 
         # Stratified k-fold cross-validation on the training/validation set
         instance_k_fold = StratifiedKFold(n_splits=self.number_splits, shuffle=True, random_state=42)
-        probabilities_list = []
-        real_labels_list = []
-
-        for train_indexes, val_indexes in instance_k_fold.split(features_train_val, labels_train_val):
 
-            features_train, features_val = features_train_val[train_indexes], features_train_val[val_indexes]
-            labels_train, labels_val = labels_train_val[train_indexes], labels_train_val[val_indexes]
+        list_folds = [(indexes_train_val[train_indexes], labels_train_val[train_indexes],
+                       indexes_train_val[val_indexes], labels_train_val[val_indexes])
+                      for train_indexes, val_indexes in instance_k_fold.split(indexes_train_val, labels_train_val)]
 
-            # Balance the training set for this fold
-            features_train, labels_train = balance_classes(features_train, labels_train)
+        # Train the folds, serially or in worker processes, and gather their results in fold order
+        list_fold_results = self.fold_executor.run(self, features, list_folds,
+                                                   (dataset_directory, number_epochs, batch_size, number_splits,
+                                                    loss, sample_rate, overlap, number_classes, arguments),
+                                                   ())
 
-            self.build_model()
-            self.neural_network_model.summary()
-
-            history_model = self.compile_and_train(features_train, labels_train, epochs=self.number_epochs,
-                                                   batch_size=self.size_batch,
-                                                   validation_data=(features_val, labels_val))
-
-            model_predictions = self.neural_network_model.predict(features_val)
-            predicted_labels = numpy.argmax(model_predictions, axis=1)
-
-            probabilities_list.append(model_predictions)
-            real_labels_list.append(labels_val)
-
-            # Calculate and store the metrics for this fold
-            metrics, confusion_matrix = self.calculate_metrics(predicted_labels, labels_val, predicted_labels)
-            metrics_list.append(metrics)
-            confusion_matriz_list.append(confusion_matrix)
-
-        # Calculate mean metrics across all folds
-        mean_metrics = {
-            'model_name': self.model_name,
-            'Acc.': {'value': numpy.mean([metric['Accuracy'] for metric in metrics_list]),
-                     'std': numpy.std([metric['Accuracy'] for metric in metrics_list])},
-            'Prec.': {'value': numpy.mean([metric['Precision'] for metric in metrics_list]),
-                      'std': numpy.std([metric['Precision'] for metric in metrics_list])},
-            'Rec.': {'value': numpy.mean([metric['Recall'] for metric in metrics_list]),
-                     'std': numpy.std([metric['Recall'] for metric in metrics_list])},
-            'F1.': {'value': numpy.mean([metric['F1-Score'] for metric in metrics_list]),
-                    'std': numpy.std([metric['F1-Score'] for metric in metrics_list])},
-        }
-
-        probabilities_predicted = {
-            'model_name': self.model_name,
-            'predicted': numpy.concatenate(probabilities_list),
-            'ground_truth': numpy.concatenate(real_labels_list)
-        }
-
-        confusion_matrix_array = numpy.array(confusion_matriz_list)
-        mean_confusion_matrix = numpy.mean(confusion_matrix_array, axis=0)
-        mean_confusion_matrix = numpy.round(mean_confusion_matrix).astype(numpy.int32).tolist()
-
-        mean_confusion_matrices = {
-            "confusion_matrix": mean_confusion_matrix,
-            "class_names": ['Class {}'.format(i) for i in range(self.number_classes)],
-            "title": self.model_name
-        }
-
-        return (mean_metrics, {"Name": self.model_name, "History": history_model.history}, mean_confusion_matrices,
-                probabilities_predicted)
+        return self.aggregate_fold_results(list_fold_results)
 
 
 def get_residual_model_args(parser):
@@ -531,4 +632,6 @@ def get_residual_model_args(parser):
     parser.add_argument('--residual_size_convolutional_filters', type=tuple,
                         default=DEFAULT_SIZE_CONVOLUTIONAL_FILTERS, help='Size of the convolutional filters')
 
+    parser = add_training_schedule_args(parser, 'residual')
+
     return parser
\ No newline at end of file
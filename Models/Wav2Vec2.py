@@ -15,11 +15,9 @@ try:
     import sys
     import glob
     import numpy
-    import librosa
     import argparse
     import tensorflow
 
-    from tqdm import tqdm
 
     from tensorflow.keras import Model
 
@@ -45,8 +43,43 @@ try:
     from sklearn.model_selection import StratifiedKFold
     from sklearn.model_selection import train_test_split
 
-    from sklearn.utils import resample
 
+    from Modules.Dataset.FeatureCache import FeatureCache
+    from Modules.Dataset.ParallelExtractor import ParallelExtractor
+    from Modules.Dataset.WaveformStore import WaveformStore
+    from Modules.Dataset.AudioDecoder import AudioDecoder
+    from Modules.Dataset.MetadataIndex import MetadataIndex
+    from Modules.Dataset.ActivityDetector import ActivityDetector
+    from Modules.Dataset.LoaderProfiler import LoaderProfiler
+    from Modules.Evaluation.FoldExecutor import FoldExecutor
+    from Modules.Evaluation.FoldJournal import FoldJournal
+    from Modules.Evaluation.TrainingSchedule import TrainingSchedule
+    from Modules.Evaluation.TrainingSchedule import add_training_schedule_args
+    from Modules.Evaluation.PrecisionPolicy import OUTPUT_DTYPE
+    from Modules.Evaluation.PrecisionPolicy import DEFAULT_PRECISION
+    from Modules.Evaluation.PrecisionPolicy import apply_precision_policy
+    from Modules.Dataset.WindowFraming import get_window_step
+    from Modules.Dataset.FeatureExtractor import extract_feature_block
+    from Modules.Dataset.FeatureExtractor import normalize_amplitude_windows
+    from Modules.Dataset.WindowFraming import DEFAULT_LAST_WINDOW_POLICY
+    from Modules.Dataset.FeatureAssembler import get_memmap_path
+    from Modules.Dataset.FeatureAssembler import log_peak_memory
+    from Modules.Dataset.FeatureAssembler import get_peak_memory
+    from Modules.Dataset.FeatureAssembler import assemble_features
+    from Modules.Dataset.FeatureAssembler import count_file_windows
+    from Modules.Dataset.FeatureAssembler import DEFAULT_MEMMAP_DIRECTORY
+    from Modules.Dataset.StreamingDataset import train_streaming
+    from Modules.Dataset.StreamingDataset import DEFAULT_STREAMING_MODE
+    from Modules.Dataset.ShardedDataset import load_model_features
+    from Modules.Dataset.DatasetManifest import DatasetManifest
+    from Modules.Dataset.BalancedSampler import balance_indexes
+    from Modules.Dataset.FeatureQuantization import get_cache_dtype
+    from Modules.Dataset.FeatureQuantization import quantize_features
+    from Modules.Dataset.FeatureQuantization import get_assembly_dtype
+    from Modules.Dataset.FeatureQuantization import DEFAULT_FEATURE_DTYPE
+    from Modules.Dataset.WindowIndex import IndexedBatches
+    from Modules.Dataset.WindowIndex import load_window_index
+    from Modules.Dataset.WindowIndex import DEFAULT_WINDOW_INDEX_MODE
     from Modules.Evaluation.MetricsCalculator import MetricsCalculator
 
 except ImportError as error:
@@ -141,8 +174,26 @@ class AudioWav2Vec2(MetricsCalculator):
         self.number_classes = number_classes
         self.dropout_rate = dropout_rate
         self.last_layer_activation = last_layer_activation
+        self.feature_cache = FeatureCache()
+        self.parallel_extractor = ParallelExtractor()
+        self.waveform_store = WaveformStore()
+        self.dataset_manifest = DatasetManifest()
+        self.metadata_index = MetadataIndex()
+        self.metadata_filters = None
+        self.activity_detector = ActivityDetector()
+        self.fold_executor = FoldExecutor()
+        self.training_schedule = TrainingSchedule()
+        self.precision = DEFAULT_PRECISION
+        self.last_window_policy = DEFAULT_LAST_WINDOW_POLICY
+        self.feature_memmap_directory = DEFAULT_MEMMAP_DIRECTORY
+        self.feature_dtype = DEFAULT_FEATURE_DTYPE
+        self.streaming_mode = DEFAULT_STREAMING_MODE
+        self.window_index_mode = DEFAULT_WINDOW_INDEX_MODE
 
     def build_model(self) -> None:
+        # Layers built from here on follow the dtype policy of the chosen precision
+        apply_precision_policy(self.precision)
+
         # Define the input layer
         inputs = Input(shape=self.input_dimension)
         neural_network_flow = Reshape((128, 80, 1))(inputs)
@@ -191,22 +242,36 @@ class AudioWav2Vec2(MetricsCalculator):
                                           metrics=['accuracy'])
 
     def compile_and_train(self, train_data: tensorflow.Tensor, train_labels: tensorflow.Tensor, epochs: int,
-                          batch_size: int, validation_data: tuple = None) -> tensorflow.keras.callbacks.History:
+                          batch_size: int, validation_data: tuple = None,
+                          callbacks: list = None) -> tensorflow.keras.callbacks.History:
         """
         Compiles and trains the neural network model using the specified training data and configuration.
 
         Args:
-            train_data (tensorflow.Tensor): The input training data.
-            train_labels (tensorflow.Tensor): The corresponding labels for the training data.
+            train_data (tensorflow.Tensor): The input training data, or a batched dataset of (data, labels) pairs.
+            train_labels (tensorflow.Tensor): The corresponding labels for the training data (None for a dataset).
             epochs (int): Number of training epochs.
             batch_size (int): Size of the batches for each training step.
             validation_data (tuple, optional): A tuple containing validation data and labels.
+            callbacks (list, optional): Keras callbacks of the final training phase (e.g. the epoch backups of
+                the fold journal).
 
         Returns:
             tensorflow.keras.callbacks.History: The history object containing training metrics and performance.
         """
         logging.info("Starting the initial compilation and training phase.")
 
+        # Streamed datasets and indexed batches are already batched and hold their labels, replaced by the
+        # inputs in the first phase
+        if isinstance(train_data, tensorflow.data.Dataset):
+            batch_size = None
+            pretraining_data, pretraining_targets = train_data.map(lambda data, labels: (data, data)), None
+        elif isinstance(train_data, IndexedBatches):
+            batch_size = None
+            pretraining_data, pretraining_targets = train_data.with_input_targets(), None
+        else:
+            pretraining_data, pretraining_targets = train_data, train_data
+
         # Step 1: Compile the model for initial training using ContrastiveLoss
         self.neural_network_model.compile(optimizer=self.optimizer_function,
                                           loss=ContrastiveLoss(margin=0.75))
@@ -214,7 +279,7 @@ class AudioWav2Vec2(MetricsCalculator):
 
         # Step 2: Train the model on the training data
         logging.info(f"Training model for {epochs} epochs with batch size {batch_size}.")
-        self.neural_network_model.fit(train_data, train_data, epochs=epochs, batch_size=batch_size)
+        self.neural_network_model.fit(pretraining_data, pretraining_targets, epochs=epochs, batch_size=batch_size)
         logging.info("Initial training completed. Setting the model as non-trainable.")
 
         # Step 3: Set the model as non-trainable and flatten the output
@@ -222,7 +287,7 @@ class AudioWav2Vec2(MetricsCalculator):
         neural_network_flow = Flatten()(self.neural_network_model.output[0])
 
         # Step 4: Add a Dense layer with the number of classes and specified activation function
-        neural_network_flow = Dense(self.number_classes, activation=self.last_layer_activation)(neural_network_flow)
+        neural_network_flow = Dense(self.number_classes, activation=self.last_layer_activation, dtype=OUTPUT_DTYPE)(neural_network_flow)
         logging.info(f"Added Dense layer with {self.number_classes} classes and '{self.last_layer_activation}' activation.")
 
         # Step 5: Recreate the model with new output
@@ -236,128 +301,162 @@ class AudioWav2Vec2(MetricsCalculator):
 
         # Step 7: Train the model with the actual training data and labels
         logging.info(f"Final training for {epochs} epochs with batch size {batch_size}.")
-        training_history = self.neural_network_model.fit(train_data, train_labels,
-                                                         epochs=epochs,
-                                                         batch_size=batch_size,
-                                                         validation_data=validation_data)
+        training_history = self.training_schedule.fit(self.neural_network_model, train_data, train_labels,
+                                                      epochs=epochs,
+                                                      batch_size=batch_size,
+                                                      validation_data=validation_data,
+                                                      callbacks=callbacks)
         logging.info("Training completed successfully.")
 
         return training_history
 
-    @staticmethod
-    def windows(data, window_size, overlap):
+    def get_feature_parameters(self) -> dict:
         """
-        Generates windowed segments of the input data.
+        Returns every parameter that affects the features extracted from a file, used as the feature cache key.
 
-        Parameters
-        ----------
-        data : numpy.ndarray
-            The input data array.
-        window_size : int
-            The size of each window.
-        overlap : int
-            The overlap between consecutive windows.
-
-        Yields
-        ------
-        tuple
-            Start and end indices of each window.
+        Returns
+        -------
+        dict
+            Dictionary with the feature type and the extraction parameters.
         """
-        start = 0
-        while start < len(data):
-            yield start, start + window_size
-            start += (window_size // overlap)
-
-    def load_data(self, sub_directories: str = None, file_extension: str = None) -> tuple:
+        return {'feature_type': 'normalized_waveform',
+                'sample_rate': self.sample_rate,
+                'window_size': self.window_size,
+                'overlap': self.overlap,
+                'last_window_policy': self.last_window_policy,
+                **self.activity_detector.get_parameters()}
+
+    def extract_features(self, signal: numpy.ndarray) -> numpy.ndarray:
         """
-        Loads audio data, extracts spectrogram's using sliding windows, normalizes them, and
-        associates labels based on the directory structure.
+        Applies min-max normalization to the absolute amplitude of every complete window of a signal.
 
         Args:
-            sub_directories (str): Path to the main directory containing class subdirectories.
-            file_extension (str): Optional file extension to filter the files.
+            signal (numpy.ndarray): The audio signal of one file.
 
         Returns:
-            tuple: A tuple containing two numpy arrays:
-                - array_features (numpy.ndarray): Array of normalized signal features.
-                - array_labels (numpy.ndarray): Array of integer labels for each sample.
+            numpy.ndarray: Array of shape (number_windows, window_size).
         """
-        logging.info("Starting data loading process.")
-        list_spectrogram, list_labels, list_class_path = [], [], []
-        file_extension = file_extension or self.file_extension
+        return extract_feature_block(signal, self.get_feature_parameters())
 
-        # Traverse through class directories
-        for class_dir in os.listdir(sub_directories):
-            class_path = os.path.join(sub_directories, class_dir)
-            list_class_path.append(class_path)
-            logging.info(f"Added class path: {class_path}")
+    def normalize_windows(self, signal_windows: numpy.ndarray) -> numpy.ndarray:
+        """
+        Applies min-max normalization to the absolute amplitude of each window.
 
-        # Process each class path
-        for _, sub_directory in enumerate(list_class_path):
-            logging.info(f"Processing directory: {sub_directory}")
+        Args:
+            signal_windows (numpy.ndarray): Array of shape (number_windows, window_size).
 
-            # Iterate through all audio files in the directory with the specified extension
-            for file_name in tqdm(glob.glob(os.path.join(sub_directory, file_extension))):
+        Returns:
+            numpy.ndarray: Array of shape (number_windows, window_size).
+        """
+        return normalize_amplitude_windows(signal_windows)
 
-                # Load the audio signal
-                signal, _ = librosa.load(file_name, sr=self.sample_rate)
+    def load_file_features(self, file_name: str) -> numpy.ndarray:
+        """
+        Reads the signal of an audio file from the waveform store and extracts the normalized windows of its signal.
 
-                # Extract label from file name (assumes directory structure encodes label)
-                label = int(file_name.split('/')[-2].split('_')[0])
+        Args:
+            file_name (str): Path to the audio file.
 
-                # Segment the signal using sliding windows
-                for (start, end) in self.windows(signal, self.window_size, self.overlap):
+        Returns:
+            numpy.ndarray: Normalized windows of the file.
+        """
+        signal = self.waveform_store.load(file_name, self.sample_rate)
+        return self.extract_features(signal)
 
-                    # Check if the windowed signal has the required length
-                    if len(signal[start:end]) == self.window_size:
+    def load_file_windows(self, file_name: str) -> numpy.ndarray:
+        """
+        Loads the features of an audio file in the layout of the model input, used by the streaming mode.
 
-                        # Extract the signal window
-                        signal_window = numpy.abs(numpy.array(signal[start:end]))
+        Args:
+            file_name (str): Path to the audio file.
 
-                        # Normalize the signal window
-                        signal_min = numpy.min(signal_window)
-                        signal_max = numpy.max(signal_window)
+        Returns:
+            numpy.ndarray: Normalized windows of the file, with a channel axis.
+        """
+        return self.load_file_features(file_name)[..., numpy.newaxis]
 
-                        if signal_max != signal_min:
-                            normalized_signal = (signal_window - signal_min) / (signal_max - signal_min)
-                        else:
-                            normalized_signal = numpy.zeros_like(signal_window)
+    def load_data(self, sub_directories: str = None, file_extension: str = None) -> tuple:
+        """
+        Loads audio data, extracts spectrogram's using sliding windows, normalizes them, and
+        associates labels based on the directory structure.
 
-                        list_spectrogram.append(normalized_signal)
-                        list_labels.append(label)
+        Args:
+            sub_directories (str): Path to the main directory containing class subdirectories.
+            file_extension (str): Optional file extension to filter the files.
 
-        # Convert lists to numpy arrays for efficient processing
-        array_features = numpy.array(list_spectrogram, dtype=numpy.float32)
-        array_features = numpy.expand_dims(array_features, axis=-1)  # Add channel dimension
+        Returns:
+            tuple: A tuple containing two numpy arrays:
+                - array_features (numpy.ndarray): Array of normalized signal features.
+                - array_labels (numpy.ndarray): Array of integer labels for each sample.
+        """
+        logging.info("Starting data loading process.")
+        log_peak_memory("before loading the data")
+        loader_profiler = LoaderProfiler(self.model_name)
+        loader_profiler.start()
+        list_class_path = []
+        file_extension = file_extension or self.file_extension
 
-        array_labels = numpy.array(list_labels, dtype=numpy.int32)
+        feature_parameters = self.get_feature_parameters()
+
+        # Resolve the files and labels from the metadata index instead of listing the class directories
+        if self.metadata_index.enabled:
+            list_files, list_file_labels = self.metadata_index.select_files(self.metadata_filters)
+
+        else:
+            list_files, list_file_labels = [], []
+
+            # Traverse through class directories
+            for class_dir in os.listdir(sub_directories):
+                class_path = os.path.join(sub_directories, class_dir)
+                list_class_path.append(class_path)
+                logging.info(f"Added class path: {class_path}")
+
+            # Collect the audio files and labels of each class directory
+            for _, sub_directory in enumerate(list_class_path):
+                logging.info(f"Processing directory: {sub_directory}")
+
+                for file_name in glob.glob(os.path.join(sub_directory, file_extension)):
+                    list_files.append(file_name)
+                    list_file_labels.append(int(file_name.split('/')[-2].split('_')[0]))
+
+        # Count the windows of each file from its length to preallocate the feature array
+        step = get_window_step(self.window_size, self.overlap)
+        list_window_counts = [count_file_windows(file_name, self.sample_rate, self.window_size, step,
+                                                 self.last_window_policy, self.waveform_store)
+                              for file_name in list_files]
+        self.dataset_manifest.record_window_counts(self.model_name, list_files, list_window_counts)
+
+        # Write the normalized windows of each file in place as they are read from the feature cache or extracted
+        file_features = self.parallel_extractor.iterate_features(list_files, self.load_file_features,
+                                                                 feature_parameters, self.feature_cache)
+        memmap_path = get_memmap_path(self.feature_memmap_directory, self.model_name)
+        array_features, array_labels = assemble_features(file_features, list_file_labels, list_window_counts,
+                                                         window_shape_function=lambda shape: shape + (1,),
+                                                         memmap_path=memmap_path,
+                                                         dtype=get_assembly_dtype(self.feature_dtype))
+        array_features = quantize_features(array_features, self.feature_dtype, memmap_path)
+
+        self.feature_cache.finalize()
+        self.activity_detector.log_skipped_windows(sum(list_window_counts), len(array_labels))
 
         logging.info("Data loading completed successfully.")
         logging.info(f"Total samples loaded: {len(array_labels)}")
+        loader_profiler.finish(len(list_files), len(array_labels), get_peak_memory())
+        log_peak_memory("after loading the data")
 
         return array_features, array_labels
 
-    def train(self, dataset_directory, number_epochs, batch_size, number_splits,
-              loss, sample_rate, overlap, number_classes, arguments) -> tuple:
+    def set_parameters(self, dataset_directory, number_epochs, batch_size, number_splits,
+                       loss, sample_rate, overlap, number_classes, arguments) -> None:
         """
-        Trains the model using cross-validation.
+        Sets the training, model and feature extraction parameters from the command line arguments.
 
         Parameters
         ----------
         dataset_directory : str
             Directory containing the training data.
-        number_epochs : int, optional
-            Number of training epochs.
-        batch_size : int, optional
-            Batch size for training.
-        number_splits : int, optional
-            Number of splits for cross-validation.
-
-        Returns
-        -------
-        tuple
-            A tuple containing the mean metrics, the training history, the mean confusion matrix,
-            and the predicted probabilities along with the ground truth labels.
+        arguments : argparse.Namespace
+            Parsed command line arguments.
         """
         # Use default values if not provided
         self.number_epochs = number_epochs or self.number_epochs
@@ -383,111 +482,93 @@ class AudioWav2Vec2(MetricsCalculator):
         self.window_size = self.hop_length * self.window_size_factor
         self.dropout_rate = arguments.wav_to_vec_dropout_rate
         self.last_layer_activation = arguments.wav_to_vec_last_layer_activation
+        self.feature_cache = FeatureCache(arguments.feature_cache_directory, arguments.feature_cache_size_budget,
+                                          get_cache_dtype(arguments.feature_dtype))
+        self.parallel_extractor = ParallelExtractor(arguments.loader_workers)
+        self.waveform_store = WaveformStore(arguments.waveform_store_directory,
+                                            AudioDecoder(arguments.resampling_backend, arguments.decode_cache_directory))
+        self.dataset_manifest = DatasetManifest(arguments.dataset_manifest_path, dataset_directory)
+        self.metadata_index = MetadataIndex(arguments.metadata_index_path)
+        self.metadata_filters = arguments.metadata_filter
+        self.activity_detector = ActivityDetector(arguments.activity_energy_threshold,
+                                                  arguments.activity_flux_threshold)
+        self.last_window_policy = arguments.last_window_policy
+        self.feature_memmap_directory = arguments.feature_memmap_directory
+        self.feature_dtype = arguments.feature_dtype
+        self.streaming_mode = arguments.streaming_mode
+        self.fold_executor = FoldExecutor(arguments.fold_workers, arguments.fold_share_directory,
+                                          fold_journal=FoldJournal.from_arguments(arguments))
+        self.training_schedule = TrainingSchedule.from_arguments(arguments, 'wav_to_vec')
+        self.precision = arguments.precision
+        self.window_index_mode = arguments.window_index_mode
 
-        features, labels = self.load_data(dataset_directory)
-        metrics_list, confusion_matriz_list = [], []
-        labels = numpy.array(labels).astype(float)
-
-        # Split data into train/val and test sets
-        features_train_val, features_test, labels_train_val, labels_test = train_test_split(
-            features, labels, test_size=0.2, stratify=labels, random_state=42
-        )
-
-        # Function to balance the classes by resampling
-        def balance_classes(features, labels):
-            unique_classes = numpy.unique(labels)
-            max_samples = max([sum(labels == c) for c in unique_classes])
-
-            balanced_features = []
-            balanced_labels = []
-
-            for c in unique_classes:
-                features_class = features[labels == c]
-                labels_class = labels[labels == c]
+    def train(self, dataset_directory, number_epochs, batch_size, number_splits,
+              loss, sample_rate, overlap, number_classes, arguments) -> tuple:
+        """
+        Trains the model using cross-validation.
 
-                features_class_resampled, labels_class_resampled = resample(
-                    features_class, labels_class,
-                    replace=True,
-                    n_samples=max_samples,
-                    random_state=0
-                )
+        Parameters
+        ----------
+        dataset_directory : str
+            Directory containing the training data.
+        number_epochs : int, optional
+            Number of training epochs.
+        batch_size : int, optional
+            Batch size for training.
+        number_splits : int, optional
+            Number of splits for cross-validation.
 
-                balanced_features.append(features_class_resampled)
-                balanced_labels.append(labels_class_resampled)
+        Returns
+        -------
+        tuple
+            A tuple containing the mean metrics, the training history, the mean confusion matrix,
+            and the predicted probabilities along with the ground truth labels.
+        """
+        self.set_parameters(dataset_directory, number_epochs, batch_size, number_splits, loss, sample_rate, overlap,
+                            number_classes, arguments)
+
+        # Stream the features through tf.data pipelines instead of loading them in memory
+        if self.streaming_mode:
+            return train_streaming(self, dataset_directory, self.file_extension,
+                                   (dataset_directory, number_epochs, batch_size, number_splits, loss,
+                                    sample_rate, overlap, number_classes, arguments), arguments)
+
+        # Index the windows of the waveform store instead of copying them into a feature array
+        if self.window_index_mode:
+            features, labels = load_window_index(self, dataset_directory,
+                                                 lambda windows: self.normalize_windows(windows)[..., numpy.newaxis])
+        else:
+            features, labels = load_model_features(self, self.load_data, dataset_directory, arguments)
+
+        # The features were only exported to shards
+        if arguments.shard_export_only:
+            return None
 
-            balanced_features = numpy.vstack(balanced_features)
-            balanced_labels = numpy.hstack(balanced_labels)
+        labels = numpy.array(labels).astype(float)
 
-            return balanced_features, balanced_labels
+        # Split the sample indexes into train/val and test sets, the features are only gathered per batch
+        indexes_train_val, indexes_test, labels_train_val, labels_test = train_test_split(
+            numpy.arange(len(labels)), labels, test_size=0.2, stratify=labels, random_state=42
+        )
 
         # Balance training/validation set
-        features_train_val, labels_train_val = balance_classes(features_train_val, labels_train_val)
+        indexes_train_val, labels_train_val = balance_indexes(indexes_train_val, labels_train_val, features)
 
         # Stratified k-fold cross-validation on the training/validation set
         instance_k_fold = StratifiedKFold(n_splits=self.number_splits, shuffle=True, random_state=42)
-        print("STARTING TRAINING MODEL: {}".format(self.model_name))
-        list_history_model = []
-        history_model = None
-        probabilities_list = []
-        real_labels_list = []
-
-        for train_indexes, val_indexes in instance_k_fold.split(features_train_val, labels_train_val):
-            features_train, features_val = features_train_val[train_indexes], features_train_val[val_indexes]
-            labels_train, labels_val = labels_train_val[train_indexes], labels_train_val[val_indexes]
-
-            # Balance the training set for this fold
-            features_train, labels_train = balance_classes(features_train, labels_train)
-
-            self.build_model()
-            self.neural_network_model.summary()
-
-            history_model = self.compile_and_train(features_train, labels_train, epochs=self.number_epochs,
-                                                   batch_size=self.size_batch,
-                                                   validation_data=(features_val, labels_val))
-
-            model_predictions = self.neural_network_model.predict(features_val, batch_size=self.size_batch)
-            predicted_labels = numpy.argmax(model_predictions, axis=1)
-
-            probabilities_list.append(model_predictions)
-            real_labels_list.append(labels_val)
-
-            # Calculate and store the metrics for this fold
-            metrics, confusion_matrix = self.calculate_metrics(predicted_labels, labels_val,
-                                                               predicted_labels)
-            metrics_list.append(metrics)
-            confusion_matriz_list.append(confusion_matrix)
-
-        # Calculate mean metrics across all folds
-        mean_metrics = {
-            'model_name': self.model_name,
-            'Acc.': {'value': numpy.mean([metric['Accuracy'] for metric in metrics_list]),
-                     'std': numpy.std([metric['Accuracy'] for metric in metrics_list])},
-            'Prec.': {'value': numpy.mean([metric['Precision'] for metric in metrics_list]),
-                      'std': numpy.std([metric['Precision'] for metric in metrics_list])},
-            'Rec.': {'value': numpy.mean([metric['Recall'] for metric in metrics_list]),
-                     'std': numpy.std([metric['Recall'] for metric in metrics_list])},
-            'F1.': {'value': numpy.mean([metric['F1-Score'] for metric in metrics_list]),
-                    'std': numpy.std([metric['F1-Score'] for metric in metrics_list])},
-        }
-
-        probabilities_predicted = {
-            'model_name': self.model_name,
-            'predicted': numpy.concatenate(probabilities_list),
-            'ground_truth': numpy.concatenate(real_labels_list)
-        }
-
-        confusion_matrix_array = numpy.array(confusion_matriz_list)
-        mean_confusion_matrix = numpy.mean(confusion_matrix_array, axis=0)
-        mean_confusion_matrix = numpy.round(mean_confusion_matrix).astype(numpy.int32).tolist()
-
-        mean_confusion_matrices = {
-            "confusion_matrix": mean_confusion_matrix,
-            "class_names": ['Class {}'.format(i) for i in range(self.number_classes)],
-            "title": self.model_name
-        }
-
-        return (mean_metrics, {"Name": self.model_name, "History": history_model.history}, mean_confusion_matrices,
-                probabilities_predicted)
+        logging.info(f"Starting the training of model {self.model_name}.")
+
+        list_folds = [(indexes_train_val[train_indexes], labels_train_val[train_indexes],
+                       indexes_train_val[val_indexes], labels_train_val[val_indexes])
+                      for train_indexes, val_indexes in instance_k_fold.split(indexes_train_val, labels_train_val)]
+
+        # Train the folds, serially or in worker processes, and gather their results in fold order
+        list_fold_results = self.fold_executor.run(self, features, list_folds,
+                                                   (dataset_directory, number_epochs, batch_size, number_splits,
+                                                    loss, sample_rate, overlap, number_classes, arguments),
+                                                   ())
+
+        return self.aggregate_fold_results(list_fold_results)
 
 
 def get_wav_to_vec_args(parser):
@@ -540,5 +621,6 @@ def get_wav_to_vec_args(parser):
     parser.add_argument('--wav_to_vec_loss_function', type=str,
                         default=DEFAULT_LOSS_FUNCTION, help='Loss function to use during training')
 
+    parser = add_training_schedule_args(parser, 'wav_to_vec')
 
     return parser
\ No newline at end of file
@@ -0,0 +1,192 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import sys
+    import numpy
+    import logging
+
+    from scipy.signal import get_window
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_ACTIVITY_ENERGY_THRESHOLD = None  # Energy in dBFS; no window is skipped unless a threshold is given
+DEFAULT_ACTIVITY_FLUX_THRESHOLD = None  # Spectral flux; no window is skipped unless a threshold is given
+DEFAULT_FLUX_FRAMES = 8  # Number of sub-frames of each window between which the spectral flux is measured
+DEFAULT_AMIN = 1e-10  # Minimum power, used to avoid the logarithm of zero
+
+
+def compute_window_energy(signal_windows: numpy.ndarray, amin: float = DEFAULT_AMIN) -> numpy.ndarray:
+    """
+    Computes the mean power of every window in decibels relative to full scale.
+
+    Parameters
+    ----------
+    signal_windows : numpy.ndarray
+        Array of shape (number_windows, window_size) with samples in [-1, 1].
+    amin : float, optional
+        Minimum power, used to avoid the logarithm of zero.
+
+    Returns
+    -------
+    numpy.ndarray
+        Float32 array of shape (number_windows,) with the energy of each window in dBFS.
+    """
+    signal_windows = numpy.asarray(signal_windows, dtype=numpy.float32)
+    mean_power = numpy.einsum("ij,ij->i", signal_windows, signal_windows) / max(1, signal_windows.shape[1])
+
+    return (10.0 * numpy.log10(numpy.maximum(amin, mean_power))).astype(numpy.float32)
+
+
+def compute_spectral_flux(signal_windows: numpy.ndarray, number_frames: int = DEFAULT_FLUX_FRAMES) -> numpy.ndarray:
+    """
+    Computes the spectral flux of every window: the mean positive increase of the magnitude spectrum between
+    consecutive sub-frames of the window.
+
+    The magnitudes are divided by the sub-frame size, so the flux is independent of the window size and grows
+    with both the loudness and the onsets of the signal. Every window is measured on its own, so the result
+    does not depend on the neighbouring windows.
+
+    Parameters
+    ----------
+    signal_windows : numpy.ndarray
+        Array of shape (number_windows, window_size) with samples in [-1, 1].
+    number_frames : int, optional
+        Number of sub-frames of each window.
+
+    Returns
+    -------
+    numpy.ndarray
+        Float32 array of shape (number_windows,) with the spectral flux of each window.
+    """
+    signal_windows = numpy.asarray(signal_windows, dtype=numpy.float32)
+    number_windows, window_size = signal_windows.shape
+    number_frames = max(2, min(number_frames, window_size))
+    frame_size = window_size // number_frames
+
+    if number_windows == 0 or frame_size == 0:
+        return numpy.zeros(number_windows, dtype=numpy.float32)
+
+    frames = signal_windows[:, :frame_size * number_frames].reshape(number_windows, number_frames, frame_size)
+    magnitudes = numpy.abs(numpy.fft.rfft(frames * get_window('hann', frame_size), axis=-1)) / frame_size
+
+    spectral_flux = numpy.maximum(0.0, numpy.diff(magnitudes, axis=1)).sum(axis=-1)
+
+    return spectral_flux.mean(axis=1).astype(numpy.float32)
+
+
+class ActivityDetector:
+    """
+    Detects the windows holding acoustic activity (e.g. a wingbeat), so that the silent windows of long field
+    recordings are skipped before their features are extracted and the models are trained on them.
+
+    A window is active when its energy (see `compute_window_energy`) or its spectral flux (see
+    `compute_spectral_flux`) reaches the corresponding threshold; a threshold that is not given is not
+    checked. Without any threshold the detector is disabled and every window is kept.
+
+    Attributes
+    ----------
+    energy_threshold : float
+        Minimum energy of an active window in dBFS (not checked if None).
+    flux_threshold : float
+        Minimum spectral flux of an active window (not checked if None).
+    """
+
+    def __init__(self, energy_threshold: float = DEFAULT_ACTIVITY_ENERGY_THRESHOLD,
+                 flux_threshold: float = DEFAULT_ACTIVITY_FLUX_THRESHOLD):
+        """
+        Initializes the ActivityDetector.
+
+        Parameters
+        ----------
+        energy_threshold : float, optional
+            Minimum energy of an active window in dBFS.
+        flux_threshold : float, optional
+            Minimum spectral flux of an active window.
+        """
+        self.energy_threshold = energy_threshold
+        self.flux_threshold = flux_threshold
+
+    @classmethod
+    def from_parameters(cls, feature_parameters: dict):
+        """
+        Returns the detector described by the feature parameters of a model (see `get_parameters`).
+        """
+        return cls(feature_parameters.get('activity_energy_threshold'),
+                   feature_parameters.get('activity_flux_threshold'))
+
+    @property
+    def enabled(self) -> bool:
+        return self.energy_threshold is not None or self.flux_threshold is not None
+
+    def get_parameters(self) -> dict:
+        """
+        Returns the thresholds of the detector, added to the feature parameters (and feature cache keys) of the models.
+        """
+        return {'activity_energy_threshold': self.energy_threshold,
+                'activity_flux_threshold': self.flux_threshold}
+
+    def detect(self, signal_windows: numpy.ndarray) -> numpy.ndarray:
+        """
+        Returns the boolean mask of the active windows.
+
+        Parameters
+        ----------
+        signal_windows : numpy.ndarray
+            Array of shape (number_windows, window_size).
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array of shape (number_windows,), True for the windows to keep.
+        """
+        number_windows = len(signal_windows)
+
+        if not self.enabled:
+            return numpy.ones(number_windows, dtype=bool)
+
+        active_windows = numpy.zeros(number_windows, dtype=bool)
+
+        if self.energy_threshold is not None:
+            active_windows |= compute_window_energy(signal_windows) >= self.energy_threshold
+
+        if self.flux_threshold is not None:
+            active_windows |= compute_spectral_flux(signal_windows) >= self.flux_threshold
+
+        return active_windows
+
+    def log_skipped_windows(self, number_windows: int, number_kept: int, stage: str = "loading") -> None:
+        """
+        Logs how many of the windows were skipped as silent.
+        """
+        if not self.enabled:
+            return
+
+        number_skipped = max(0, number_windows - number_kept)
+        logging.info(f"Activity filter skipped {number_skipped} of {number_windows} windows "
+                     f"({100.0 * number_skipped / max(1, number_windows):.1f}%) while {stage}.")
+
+
+def get_activity_detector_args(parser):
+
+    parser.add_argument('--activity_energy_threshold', type=float,
+                        default=DEFAULT_ACTIVITY_ENERGY_THRESHOLD, help='Skip the windows whose energy is below this level in dBFS, unless their spectral flux is above its threshold (disabled if not set)')
+
+    parser.add_argument('--activity_flux_threshold', type=float,
+                        default=DEFAULT_ACTIVITY_FLUX_THRESHOLD, help='Skip the windows whose spectral flux is below this value, unless their energy is above its threshold (disabled if not set)')
+
+    return parser
@@ -0,0 +1,171 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import numpy
+    import hashlib
+    import librosa
+
+    from Modules.Dataset.LoaderProfiler import add_counter
+    from Modules.Dataset.LoaderProfiler import profile_stage
+    from Modules.Dataset.LoaderProfiler import STAGE_DECODE
+    from Modules.Dataset.LoaderProfiler import STAGE_RESAMPLE
+    from Modules.Dataset.LoaderProfiler import COUNTER_BYTES_DECODED
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_RESAMPLING_BACKEND = "soxr_hq"  # Default resampler of librosa.load, identical to the original loaders
+RESAMPLING_BACKENDS = ("soxr_hq", "soxr_qq", "polyphase", "none")
+DEFAULT_DECODE_CACHE_DIRECTORY = None  # Resampled signals are not cached unless a directory is given
+DEFAULT_PCM_SCALE = 32767.0  # Full scale of the int16 PCM signals of the decode cache
+
+# Outcome of decoding one file, counted by the waveform store
+DECODE_NATIVE = "native"  # Decoded at the requested sample rate, no resampling needed
+DECODE_RESAMPLED = "resampled"
+DECODE_CACHED = "cached"  # Read from the decode cache
+
+
+class AudioDecoder:
+    """
+    Decodes audio files at their native sample rate and resamples only the files recorded at another rate.
+
+    `librosa.load(file, sr=sample_rate)` runs the high quality soxr resampler on every call. The decoder
+    reads the file at its native rate, skips resampling when the rate already matches and otherwise uses
+    the configured backend: 'soxr_hq' (the librosa default), 'soxr_qq' (faster, lower quality), 'polyphase'
+    (scipy.signal.resample_poly, fast for integer rate ratios) or 'none', which never resamples and rejects
+    files recorded at another rate.
+
+    When a cache directory is given, the resampled signals are stored there as int16 PCM, one directory per
+    sample rate, keyed by the path, size and modification time of the file and by the backend.
+
+    Attributes
+    ----------
+    resampling_backend : str
+        One of `RESAMPLING_BACKENDS`.
+    cache_directory : str
+        Directory of the int16 PCM decode cache (disabled if None).
+    """
+
+    def __init__(self, resampling_backend: str = DEFAULT_RESAMPLING_BACKEND,
+                 cache_directory: str = DEFAULT_DECODE_CACHE_DIRECTORY):
+        """
+        Initializes the AudioDecoder.
+
+        Parameters
+        ----------
+        resampling_backend : str, optional
+            One of `RESAMPLING_BACKENDS`.
+        cache_directory : str, optional
+            Directory of the int16 PCM decode cache. If None, the decoded signals are not cached.
+
+        Raises
+        ------
+        ValueError
+            If the resampling backend is unknown.
+        """
+        if resampling_backend not in RESAMPLING_BACKENDS:
+            raise ValueError(f"Unknown resampling backend '{resampling_backend}', "
+                             f"expected one of {', '.join(RESAMPLING_BACKENDS)}.")
+
+        self.resampling_backend = resampling_backend
+        self.cache_directory = cache_directory
+
+    def _get_cache_path(self, file_name: str, sample_rate: int) -> str:
+        file_status = os.stat(file_name)
+        key_source = "{}:{}:{}:{}".format(os.path.abspath(file_name), file_status.st_size,
+                                          file_status.st_mtime_ns, self.resampling_backend)
+        key = hashlib.sha1(key_source.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_directory, str(sample_rate), key[:2], key + ".npy")
+
+    def resample(self, signal: numpy.ndarray, native_sample_rate: int, sample_rate: int) -> numpy.ndarray:
+        """
+        Resamples a signal with the configured backend.
+
+        Raises
+        ------
+        ValueError
+            If the backend is 'none'.
+        """
+        if self.resampling_backend == "none":
+            raise ValueError(f"Signal recorded at {native_sample_rate} Hz instead of {sample_rate} Hz "
+                             f"and the resampling backend is 'none'.")
+
+        with profile_stage(STAGE_RESAMPLE):
+            return librosa.resample(signal, orig_sr=native_sample_rate, target_sr=sample_rate,
+                                    res_type=self.resampling_backend)
+
+    def decode(self, file_name: str, sample_rate: int) -> tuple:
+        """
+        Decodes an audio file at the given sample rate.
+
+        Parameters
+        ----------
+        file_name : str
+            Path to the audio file.
+        sample_rate : int
+            Requested sample rate.
+
+        Returns
+        -------
+        tuple
+            The float32 signal and how it was obtained (`DECODE_NATIVE`, `DECODE_RESAMPLED` or `DECODE_CACHED`).
+        """
+        cache_path = self._get_cache_path(file_name, sample_rate) if self.cache_directory else None
+
+        if cache_path is not None and os.path.exists(cache_path):
+
+            with profile_stage(STAGE_DECODE):
+                pcm_signal = numpy.load(cache_path)
+                add_counter(COUNTER_BYTES_DECODED, pcm_signal.nbytes)
+                return pcm_signal.astype(numpy.float32) / DEFAULT_PCM_SCALE, DECODE_CACHED
+
+        with profile_stage(STAGE_DECODE):
+            signal, native_sample_rate = librosa.load(file_name, sr=None)
+            add_counter(COUNTER_BYTES_DECODED, os.path.getsize(file_name))
+
+        if native_sample_rate == sample_rate:
+            return signal, DECODE_NATIVE
+
+        signal = self.resample(signal, native_sample_rate, sample_rate)
+
+        if cache_path is not None:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            pcm_signal = numpy.round(numpy.clip(signal, -1.0, 1.0) * DEFAULT_PCM_SCALE).astype(numpy.int16)
+            temporary_path = "{}.{}.tmp.npy".format(cache_path, os.getpid())
+            numpy.save(temporary_path, pcm_signal)
+            os.replace(temporary_path, cache_path)
+
+        return signal, DECODE_RESAMPLED
+
+    def load(self, file_name: str, sample_rate: int) -> numpy.ndarray:
+        """
+        Returns the signal of an audio file at the given sample rate.
+        """
+        return self.decode(file_name, sample_rate)[0]
+
+
+def get_audio_decoder_args(parser):
+
+    parser.add_argument('--resampling_backend', type=str, choices=RESAMPLING_BACKENDS,
+                        default=DEFAULT_RESAMPLING_BACKEND, help='Resampler used for files recorded at another sample rate (none rejects them)')
+
+    parser.add_argument('--decode_cache_directory', type=str,
+                        default=DEFAULT_DECODE_CACHE_DIRECTORY, help='Directory of the int16 PCM cache of resampled signals (disabled if not set)')
+
+    return parser
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import sys
+    import numpy
+    import logging
+
+    from sklearn.utils import resample
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_BALANCE_RANDOM_STATE = 0
+
+
+def get_sample_size(features) -> int:
+    """
+    Returns the size in bytes of one sample of a feature array (or of a WindowIndex, as float32).
+    """
+    if features is None:
+        return 0
+
+    item_size = numpy.dtype(getattr(features, 'dtype', numpy.float32)).itemsize
+    return int(numpy.prod(features.shape[1:])) * item_size
+
+
+def balance_indexes(indexes: numpy.ndarray, labels: numpy.ndarray, features=None,
+                    random_state: int = DEFAULT_BALANCE_RANDOM_STATE) -> tuple:
+    """
+    Oversamples the indexes of every class to the count of the largest class.
+
+    The samples are drawn with replacement exactly as resampling the features of each class did, so the
+    class proportions and the selected samples are unchanged, but only the indexes are duplicated: the
+    features are gathered per batch (see `IndexedBatches`).
+
+    Parameters
+    ----------
+    indexes : numpy.ndarray
+        Indexes of the samples in the feature array.
+    labels : numpy.ndarray
+        Label of each of those samples.
+    features : numpy.ndarray or WindowIndex, optional
+        Feature array, only used to log the memory saved by not copying the balanced features.
+    random_state : int, optional
+        Seed of the resampling of each class.
+
+    Returns
+    -------
+    tuple
+        The balanced indexes and their labels, grouped by class.
+    """
+    indexes, labels = numpy.asarray(indexes), numpy.asarray(labels)
+    unique_classes = numpy.unique(labels)
+    max_samples = max([numpy.sum(labels == c) for c in unique_classes])
+
+    balanced_indexes = []
+    balanced_labels = []
+
+    for c in unique_classes:
+        indexes_class_resampled, labels_class_resampled = resample(indexes[labels == c], labels[labels == c],
+                                                                   replace=True, n_samples=max_samples,
+                                                                   random_state=random_state)
+
+        balanced_indexes.append(indexes_class_resampled)
+        balanced_labels.append(labels_class_resampled)
+
+    balanced_indexes = numpy.hstack(balanced_indexes)
+    balanced_labels = numpy.hstack(balanced_labels)
+
+    if features is not None:
+        features_size = len(balanced_indexes) * get_sample_size(features)
+        logging.info(f"Balanced {len(indexes)} samples to {len(balanced_indexes)} with {balanced_indexes.nbytes} "
+                     f"bytes of indexes instead of {features_size} bytes of copied features "
+                     f"({features_size - balanced_indexes.nbytes} bytes saved).")
+
+    return balanced_indexes, balanced_labels
@@ -0,0 +1,259 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import json
+    import fcntl
+    import logging
+    import contextlib
+
+    from Modules.Dataset.FeatureCache import FeatureCache
+    from Modules.Dataset.StreamingDataset import list_labeled_files
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_INCREMENTAL_INGESTION = False  # The waveform store is rebuilt whenever a recording changes unless enabled
+DEFAULT_MANIFEST_PATH = None  # The manifest is stored in the dataset directory if not set
+DEFAULT_MANIFEST_FILE = "dataset_manifest.json"
+DEFAULT_LOCK_EXTENSION = ".lock"
+
+# Meaning of the window counts, written in the manifest for its readers
+WINDOW_COUNTS_NOTE = ("Number of windows framed from the decoded length of each recording, before the activity "
+                      "detection drops the silent ones, so it is the upper bound of the windows a model keeps.")
+DEFAULT_INGESTION_SUFFIX = "_ingestion"  # Sibling of the dataset directory holding the persistent store and cache
+DEFAULT_INGESTION_STORE_DIRECTORY = "waveform_store"
+DEFAULT_INGESTION_CACHE_DIRECTORY = "feature_cache"
+
+
+class DatasetManifest:
+    """
+    A manifest of the recordings of a dataset, used to ingest only the recordings that changed.
+
+    Each entry, keyed by the path of the recording relative to the dataset directory, records its size,
+    modification time, content hash, label, number of samples after decoding and the number of windows
+    of each model (framed from the decoded length, before the activity detection). Updating the manifest hashes only the recordings whose size or modification time
+    changed, and reports the recordings that were added, modified or deleted since the last run.
+
+    When no manifest path is given the manifest is disabled, so the loaders can use it unconditionally.
+
+    Attributes
+    ----------
+    manifest_path : str
+        Path of the JSON manifest.
+    dataset_directory : str
+        Directory containing one subdirectory per class.
+    entries : dict
+        Maps the relative path of each recording to its entry.
+    """
+
+    def __init__(self, manifest_path: str = DEFAULT_MANIFEST_PATH, dataset_directory: str = None):
+        """
+        Initializes the DatasetManifest, reading the manifest file if it exists.
+
+        Parameters
+        ----------
+        manifest_path : str, optional
+            Path of the JSON manifest. If None, the manifest is disabled.
+        dataset_directory : str, optional
+            Directory of the dataset (by default the directory of the manifest).
+        """
+        self.manifest_path = manifest_path
+        self.dataset_directory = dataset_directory or (os.path.dirname(manifest_path) if manifest_path else None)
+        self.entries = {}
+
+        if self.enabled:
+            self.read()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.manifest_path)
+
+    def get_relative_path(self, file_name: str) -> str:
+        return os.path.relpath(os.path.abspath(file_name), os.path.abspath(self.dataset_directory))
+
+    def update(self, file_extension: str) -> dict:
+        """
+        Scans the dataset and updates the entries of the recordings that were added, modified or deleted.
+
+        Parameters
+        ----------
+        file_extension : str
+            Glob pattern of the audio files.
+
+        Returns
+        -------
+        dict
+            Lists of the 'added', 'modified' and 'deleted' recordings (relative paths), the 'stale_hashes'
+            of the modified and deleted contents and the number of 'unchanged' recordings.
+        """
+        list_files, list_labels = list_labeled_files(self.dataset_directory, file_extension)
+        changes = {'added': [], 'modified': [], 'deleted': [], 'stale_hashes': [], 'unchanged': 0}
+        current_paths = set()
+
+        for file_name, label in zip(list_files, list_labels):
+            relative_path = self.get_relative_path(file_name)
+            file_status = os.stat(file_name)
+            entry = self.entries.get(relative_path)
+            current_paths.add(relative_path)
+
+            if entry and entry['size'] == file_status.st_size and entry['mtime_ns'] == file_status.st_mtime_ns:
+                changes['unchanged'] += 1
+                continue
+
+            file_hash = FeatureCache.hash_file(file_name)
+
+            # A touched but identical recording only refreshes its modification time
+            if entry and entry['hash'] == file_hash:
+                entry['mtime_ns'] = file_status.st_mtime_ns
+                changes['unchanged'] += 1
+                continue
+
+            if entry:
+                changes['modified'].append(relative_path)
+                changes['stale_hashes'].append(entry['hash'])
+            else:
+                changes['added'].append(relative_path)
+
+            self.entries[relative_path] = {'size': file_status.st_size, 'mtime_ns': file_status.st_mtime_ns,
+                                           'hash': file_hash, 'label': label, 'number_samples': None,
+                                           'window_counts': {}}
+
+        for relative_path in sorted(set(self.entries) - current_paths):
+            changes['deleted'].append(relative_path)
+            changes['stale_hashes'].append(self.entries.pop(relative_path)['hash'])
+
+        logging.info(f"Dataset manifest: {len(changes['added'])} added, {len(changes['modified'])} modified, "
+                     f"{len(changes['deleted'])} deleted and {changes['unchanged']} unchanged recordings.")
+
+        return changes
+
+    def get_file_hash_index(self) -> dict:
+        """
+        Returns the content hashes in the format of the FeatureCache hash index, so they are not computed again.
+        """
+        return {os.path.abspath(os.path.join(self.dataset_directory, relative_path)):
+                [entry['size'], entry['mtime_ns'], entry['hash']] for relative_path, entry in self.entries.items()}
+
+    def record_lengths(self, waveform_store, sample_rate: int) -> None:
+        """
+        Records the number of samples of each recording after decoding, as held by the waveform store.
+        """
+        for relative_path, entry in self.entries.items():
+            entry['number_samples'] = waveform_store.get_length(os.path.join(self.dataset_directory, relative_path),
+                                                                sample_rate)
+
+    def record_window_counts(self, model_name: str, list_files: list, list_window_counts: list) -> None:
+        """
+        Records the number of windows of each recording for a model and saves the manifest.
+
+        The models may run in separate processes, each holding its own copy of the manifest, so the entries
+        are read again under the lock of the manifest and only the counts of this model are replaced.
+        """
+        if not self.enabled:
+            return
+
+        with self.lock():
+            self.read()
+
+            for file_name, window_count in zip(list_files, list_window_counts):
+                entry = self.entries.get(self.get_relative_path(file_name))
+
+                if entry is not None:
+                    entry['window_counts'][model_name] = int(window_count)
+
+            self.write()
+
+    @contextlib.contextmanager
+    def lock(self):
+        """
+        Holds an exclusive lock on the manifest, shared by every process of the run.
+        """
+        with open(self.manifest_path + DEFAULT_LOCK_EXTENSION, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            try:
+                yield
+
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def read(self) -> None:
+        """
+        Reads the entries of the manifest file, if it exists.
+        """
+        if os.path.exists(self.manifest_path):
+
+            with open(self.manifest_path, 'r') as manifest_file:
+                self.entries = json.load(manifest_file).get('files', {})
+
+    def write(self) -> None:
+        """
+        Writes the manifest through a temporary file.
+        """
+        temporary_path = "{}.{}.tmp".format(self.manifest_path, os.getpid())
+
+        with open(temporary_path, 'w') as manifest_file:
+            json.dump({'dataset_directory': os.path.abspath(self.dataset_directory),
+                       'window_counts_note': WINDOW_COUNTS_NOTE, 'files': self.entries},
+                      manifest_file, indent=1, sort_keys=True)
+
+        os.replace(temporary_path, self.manifest_path)
+
+    def save(self) -> None:
+        """
+        Writes the manifest under its lock.
+        """
+        if not self.enabled:
+            return
+
+        with self.lock():
+            self.write()
+
+
+def get_manifest_path(dataset_directory: str, manifest_path: str = DEFAULT_MANIFEST_PATH) -> str:
+    """
+    Returns the path of the manifest of a dataset, stored in the dataset directory unless a path is given.
+    """
+    return manifest_path or os.path.join(dataset_directory, DEFAULT_MANIFEST_FILE)
+
+
+def get_ingestion_directories(dataset_directory: str, waveform_store_directory: str = None,
+                              feature_cache_directory: str = None) -> tuple:
+    """
+    Returns the waveform store and feature cache directories of the incremental ingestion.
+
+    Both must outlive the run, otherwise every recording is decoded and extracted again. The directories
+    that are not given default to `<dataset directory>_ingestion/`, a sibling of the dataset directory, since
+    a subdirectory of the dataset would be read as a class directory by the loaders.
+    """
+    ingestion_directory = os.path.normpath(os.path.abspath(dataset_directory)) + DEFAULT_INGESTION_SUFFIX
+
+    return (waveform_store_directory or os.path.join(ingestion_directory, DEFAULT_INGESTION_STORE_DIRECTORY),
+            feature_cache_directory or os.path.join(ingestion_directory, DEFAULT_INGESTION_CACHE_DIRECTORY))
+
+
+def get_dataset_manifest_args(parser):
+
+    parser.add_argument('--incremental_ingestion', action='store_true',
+                        default=DEFAULT_INCREMENTAL_INGESTION, help='Decode and extract only the recordings added or modified since the last run (the waveform store and feature cache persist next to the dataset directory unless set)')
+
+    parser.add_argument('--dataset_manifest_path', type=str,
+                        default=DEFAULT_MANIFEST_PATH, help='Path of the dataset manifest (stored in the dataset directory if not set)')
+
+    return parser
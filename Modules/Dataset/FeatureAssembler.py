@@ -0,0 +1,211 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import math
+    import numpy
+    import logging
+    import resource
+    import soundfile
+
+    from Modules.Dataset.WindowFraming import get_number_windows
+    from Modules.Dataset.LoaderProfiler import profile_stage
+    from Modules.Dataset.LoaderProfiler import STAGE_ASSEMBLY
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_MEMMAP_DIRECTORY = None  # Feature arrays are kept in RAM unless a directory is given
+DEFAULT_MEMMAP_EXTENSION = ".npy"
+
+
+def get_peak_memory() -> int:
+    """
+    Returns the peak resident set size of the current process in bytes.
+    """
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes and macOS reports bytes
+    return peak_memory if sys.platform == 'darwin' else peak_memory * 1024
+
+
+def log_peak_memory(stage: str) -> None:
+    """
+    Logs the peak resident set size of the current process.
+    """
+    logging.info(f"Peak RSS {stage}: {get_peak_memory() / (1 << 20):.1f} MiB")
+
+
+def get_signal_length(file_name: str, sample_rate: int, waveform_store=None) -> int:
+    """
+    Returns the number of samples of a file after decoding and resampling, without decoding it.
+
+    The length is read from the waveform store when the file is there, otherwise it is computed from the
+    audio file header with the same rounding as librosa.resample.
+
+    Parameters
+    ----------
+    file_name : str
+        Path to the audio file.
+    sample_rate : int
+        Sample rate used to load the file.
+    waveform_store : WaveformStore, optional
+        Store of decoded signals.
+
+    Returns
+    -------
+    int
+        Number of samples, or 0 if the header cannot be read.
+    """
+    if waveform_store is not None:
+        signal_length = waveform_store.get_length(file_name, sample_rate)
+
+        if signal_length is not None:
+            return signal_length
+
+    try:
+        file_information = soundfile.info(file_name)
+
+    except Exception:
+        return 0
+
+    if file_information.samplerate == sample_rate:
+        return file_information.frames
+
+    return int(math.ceil(file_information.frames * sample_rate / file_information.samplerate))
+
+
+def count_file_windows(file_name: str, sample_rate: int, window_size: int, step: int, last_window_policy: str,
+                       waveform_store=None) -> int:
+    """
+    Returns the number of windows of a file, computed from its length without decoding it.
+    """
+    signal_length = get_signal_length(file_name, sample_rate, waveform_store)
+    return get_number_windows(signal_length, window_size, step, last_window_policy)
+
+
+def get_memmap_path(memmap_directory: str, name: str):
+    """
+    Returns the path of the memory-mapped feature array of a model, or None when features are kept in RAM.
+    """
+    if memmap_directory is None:
+        return None
+
+    return os.path.join(memmap_directory, name + DEFAULT_MEMMAP_EXTENSION)
+
+
+def write_block(output: numpy.ndarray, block: numpy.ndarray) -> None:
+    """
+    Writes a feature block into a slice of the output array, reshaping each window to the output layout.
+    """
+    output[...] = block.reshape(output.shape)
+
+
+def allocate_features(number_windows: int, window_shape: tuple, memmap_path: str = None,
+                      dtype: numpy.dtype = numpy.float32) -> numpy.ndarray:
+    """
+    Allocates a zero-filled feature array (float32 by default), in RAM or as a memory-mapped file.
+    """
+    shape = (number_windows,) + tuple(window_shape)
+
+    if memmap_path is None:
+        return numpy.zeros(shape, dtype=dtype)
+
+    os.makedirs(os.path.dirname(os.path.abspath(memmap_path)), exist_ok=True)
+    return numpy.lib.format.open_memmap(memmap_path, mode='w+', dtype=dtype, shape=shape)
+
+
+def assemble_features(feature_blocks, list_labels: list, list_window_counts: list, window_shape_function=None,
+                      write_function=None, memmap_path: str = None, dtype: numpy.dtype = numpy.float32) -> tuple:
+    """
+    Writes the feature blocks of every file, in place, into one preallocated array.
+
+    The array is sized from the window counts estimated from the file headers (first pass), and each block
+    is written at a running offset as it arrives (second pass), so the peak memory is the final array plus
+    the blocks in flight instead of a list of windows and its copies. If a file yields more windows than
+    estimated the array grows in RAM, and unused rows are trimmed at the end.
+
+    Parameters
+    ----------
+    feature_blocks : iterable
+        Feature block of each file, in the order of the labels (None for files that failed to load).
+    list_labels : list
+        Integer label of each file.
+    list_window_counts : list
+        Estimated number of windows of each file.
+    window_shape_function : callable, optional
+        Receives the shape of one window of a block and returns the shape of one window of the output
+        (by default the same shape).
+    write_function : callable, optional
+        Receives an output slice and a block and writes the block into it (by default a reshape).
+    memmap_path : str, optional
+        Path of a .npy file used as memory-mapped output. The array is kept in RAM if not given.
+    dtype : numpy.dtype, optional
+        Type of the feature array (float32 by default, see `get_assembly_dtype`).
+
+    Returns
+    -------
+    tuple
+        The feature array and the int32 label array.
+    """
+    window_shape_function = window_shape_function or tuple
+    write_function = write_function or write_block
+
+    estimated_windows = int(sum(list_window_counts))
+    array_features, array_labels = None, numpy.zeros(estimated_windows, dtype=numpy.int32)
+    offset = 0
+
+    for label, block in zip(list_labels, feature_blocks):
+
+        if block is None or len(block) == 0:
+            continue
+
+        # The blocks are produced while the loop waits for them, only their writes are timed as the assembly
+        with profile_stage(STAGE_ASSEMBLY):
+
+            if array_features is None:
+                array_features = allocate_features(estimated_windows, window_shape_function(block.shape[1:]), memmap_path,
+                                                   dtype)
+
+            if offset + len(block) > len(array_features):
+                logging.warning("Window counts estimated from the file headers were too small, growing the feature array.")
+                new_length = max(2 * len(array_features), offset + len(block))
+                array_features = numpy.concatenate([array_features, numpy.zeros(
+                    (new_length - len(array_features),) + array_features.shape[1:], dtype=dtype)])
+                array_labels = numpy.concatenate([array_labels, numpy.zeros(new_length - len(array_labels),
+                                                                            dtype=numpy.int32)])
+
+            write_function(array_features[offset:offset + len(block)], block)
+            array_labels[offset:offset + len(block)] = label
+            offset += len(block)
+
+    if array_features is None:
+        return numpy.zeros((0,), dtype=dtype), numpy.zeros((0,), dtype=numpy.int32)
+
+    if offset < estimated_windows:
+        logging.info(f"Loaded {offset} of the {estimated_windows} windows estimated from the file headers.")
+
+    return array_features[:offset], array_labels[:offset]
+
+
+def get_feature_assembler_args(parser):
+
+    parser.add_argument('--feature_memmap_directory', type=str,
+                        default=DEFAULT_MEMMAP_DIRECTORY, help='Directory where feature arrays are memory-mapped (kept in RAM if not set)')
+
+    return parser
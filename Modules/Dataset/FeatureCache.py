@@ -0,0 +1,551 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import ast
+    import sys
+    import json
+    import numpy
+    import hashlib
+    import logging
+    import argparse
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_CACHE_DIRECTORY = None  # Feature cache is disabled unless a directory is given
+DEFAULT_SIZE_BUDGET = 0  # Maximum size of the cache in bytes (0 means unlimited)
+DEFAULT_HASH_CHUNK_SIZE = 1 << 20  # Number of bytes read at a time when hashing audio files
+DEFAULT_FEATURE_EXTENSION = ".npy"
+DEFAULT_METADATA_EXTENSION = ".json"
+DEFAULT_HASH_INDEX_FILE = "file_hashes.json"
+
+
+class FeatureCache:
+    """
+    A content-addressed on-disk cache for per-file feature blocks.
+
+    Each entry is keyed by the hash of the audio file content together with every parameter that affects
+    feature extraction (sample rate, window size, hop length, FFT size, number of mel filters, overlap,
+    decibel scale factor and feature type). The feature block is stored as a .npy file next to a small
+    .json file holding the parameters, which allows entries to be invalidated by parameter value.
+
+    When no cache directory is given the cache is disabled and `get_or_compute` simply calls the
+    extraction function, so the loaders can use it unconditionally.
+
+    Attributes
+    ----------
+    cache_directory : str
+        Directory where feature blocks are stored.
+    size_budget : int
+        Maximum size of the cache in bytes. Least recently used entries are evicted above this size.
+    number_hits : int
+        Number of feature blocks read from the cache.
+    number_misses : int
+        Number of feature blocks that had to be extracted.
+    bytes_read : int
+        Number of bytes read from the cache.
+    bytes_written : int
+        Number of bytes written to the cache.
+    """
+
+    def __init__(self, cache_directory: str = DEFAULT_CACHE_DIRECTORY, size_budget: int = DEFAULT_SIZE_BUDGET,
+                 storage_dtype: numpy.dtype = numpy.float32):
+        """
+        Initializes the FeatureCache.
+
+        Parameters
+        ----------
+        cache_directory : str, optional
+            Directory where feature blocks are stored. If None, the cache is disabled.
+        size_budget : int, optional
+            Maximum size of the cache in bytes (0 means unlimited).
+        storage_dtype : numpy.dtype, optional
+            Type of the stored feature blocks, which are returned as float32.
+        """
+        self.cache_directory = cache_directory
+        self.size_budget = size_budget or 0
+        self.storage_dtype = numpy.dtype(storage_dtype)
+        self.number_hits = 0
+        self.number_misses = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.file_hash_index = {}
+
+        if self.enabled:
+            os.makedirs(self.cache_directory, exist_ok=True)
+            self.file_hash_index = self._read_json(os.path.join(self.cache_directory, DEFAULT_HASH_INDEX_FILE)) or {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.cache_directory)
+
+    @staticmethod
+    def _read_json(file_path: str):
+        try:
+            with open(file_path, 'r') as json_file:
+                return json.load(json_file)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_atomic(file_path: str, write_function) -> None:
+        """
+        Writes a file through a temporary name so that concurrent readers never see a partial entry.
+        """
+        temporary_path = "{}.{}.tmp".format(file_path, os.getpid())
+        write_function(temporary_path)
+        os.replace(temporary_path, file_path)
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """
+        Computes the SHA-1 digest of the content of a file.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the file.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest of the file content.
+        """
+        file_hash = hashlib.sha1()
+
+        with open(file_path, 'rb') as binary_file:
+            for chunk in iter(lambda: binary_file.read(DEFAULT_HASH_CHUNK_SIZE), b''):
+                file_hash.update(chunk)
+
+        return file_hash.hexdigest()
+
+    def get_file_hash(self, file_path: str) -> str:
+        """
+        Returns the content hash of a file, reusing the stored hash while the size and modification time
+        of the file are unchanged.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the file.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest of the file content.
+        """
+        absolute_path = os.path.abspath(file_path)
+        file_status = os.stat(absolute_path)
+        stored_entry = self.file_hash_index.get(absolute_path)
+
+        if stored_entry and stored_entry[0] == file_status.st_size and stored_entry[1] == file_status.st_mtime_ns:
+            return stored_entry[2]
+
+        file_hash = self.hash_file(absolute_path)
+        self.file_hash_index[absolute_path] = [file_status.st_size, file_status.st_mtime_ns, file_hash]
+        return file_hash
+
+    def build_key(self, file_path: str, feature_parameters: dict) -> str:
+        """
+        Builds the cache key of a file for the given feature parameters.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the audio file.
+        feature_parameters : dict
+            Every parameter that affects the extracted features, including the feature type.
+
+        Returns
+        -------
+        str
+            Hexadecimal cache key.
+        """
+        # Blocks stored in a smaller type get their own keys, float32 keys are unchanged
+        if self.storage_dtype != numpy.float32:
+            feature_parameters = dict(feature_parameters, storage_dtype=str(self.storage_dtype))
+
+        serialized_parameters = json.dumps(feature_parameters, sort_keys=True, default=str)
+        key_source = "{}:{}".format(self.get_file_hash(file_path), serialized_parameters)
+        return hashlib.sha1(key_source.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str, extension: str) -> str:
+        return os.path.join(self.cache_directory, key[:2], key + extension)
+
+    def load(self, key: str):
+        """
+        Loads a feature block from the cache.
+
+        Parameters
+        ----------
+        key : str
+            Cache key built with `build_key`.
+
+        Returns
+        -------
+        numpy.ndarray or None
+            The cached feature block, or None if the entry does not exist.
+        """
+        feature_path = self._entry_path(key, DEFAULT_FEATURE_EXTENSION)
+
+        try:
+            features = numpy.load(feature_path)
+        except (OSError, ValueError):
+            return None
+
+        self.bytes_read += os.path.getsize(feature_path)
+
+        # Refresh the modification time so that eviction removes the least recently used entries first
+        os.utime(feature_path)
+        return features.astype(numpy.float32, copy=False)
+
+    def contains(self, key: str) -> bool:
+        """
+        Returns whether the cache holds a feature block for the key, without loading it.
+        """
+        return os.path.exists(self._entry_path(key, DEFAULT_FEATURE_EXTENSION))
+
+    def store(self, key: str, features: numpy.ndarray, feature_parameters: dict, file_path: str = None) -> None:
+        """
+        Stores a feature block and its parameters in the cache.
+
+        Parameters
+        ----------
+        key : str
+            Cache key built with `build_key`.
+        features : numpy.ndarray
+            Feature block extracted from one audio file.
+        feature_parameters : dict
+            Parameters used to extract the feature block.
+        file_path : str, optional
+            Path of the audio file, kept in the metadata for inspection.
+        """
+        feature_path = self._entry_path(key, DEFAULT_FEATURE_EXTENSION)
+        metadata_path = self._entry_path(key, DEFAULT_METADATA_EXTENSION)
+        os.makedirs(os.path.dirname(feature_path), exist_ok=True)
+
+        metadata = {'file_path': file_path, 'parameters': feature_parameters,
+                    'file_hash': self.get_file_hash(file_path) if file_path else None,
+                    'shape': list(features.shape), 'dtype': str(features.dtype)}
+
+        def write_features(temporary_path):
+            with open(temporary_path, 'wb') as binary_file:
+                numpy.save(binary_file, features.astype(self.storage_dtype, copy=False))
+
+        def write_metadata(temporary_path):
+            with open(temporary_path, 'w') as json_file:
+                json.dump(metadata, json_file, default=str)
+
+        self._write_atomic(metadata_path, write_metadata)
+        self._write_atomic(feature_path, write_features)
+        self.bytes_written += os.path.getsize(feature_path)
+
+    def lookup(self, file_path: str, feature_parameters: dict) -> tuple:
+        """
+        Looks up the feature block of a file and updates the hit/miss counters.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the audio file.
+        feature_parameters : dict
+            Every parameter that affects the extracted features, including the feature type.
+
+        Returns
+        -------
+        tuple
+            The cache key and the cached feature block (None on a miss).
+        """
+        key = self.build_key(file_path, feature_parameters)
+        features = self.load(key)
+
+        if features is None:
+            self.number_misses += 1
+        else:
+            self.number_hits += 1
+
+        return key, features
+
+    def locate(self, file_path: str, feature_parameters: dict) -> tuple:
+        """
+        Looks up whether the cache holds the feature block of a file, without loading it, and updates the
+        hit/miss counters.
+
+        Returns
+        -------
+        tuple
+            The cache key and whether the cache holds its feature block.
+        """
+        key = self.build_key(file_path, feature_parameters)
+        is_cached = self.contains(key)
+
+        if is_cached:
+            self.number_hits += 1
+        else:
+            self.number_misses += 1
+
+        return key, is_cached
+
+    def get_or_compute(self, file_path: str, feature_parameters: dict, compute_function) -> numpy.ndarray:
+        """
+        Returns the feature block of a file from the cache, extracting and storing it on a miss.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the audio file.
+        feature_parameters : dict
+            Every parameter that affects the extracted features, including the feature type.
+        compute_function : callable
+            Function that receives the file path and returns its feature block.
+
+        Returns
+        -------
+        numpy.ndarray
+            Feature block of the file.
+        """
+        if not self.enabled:
+            return compute_function(file_path)
+
+        key, features = self.lookup(file_path, feature_parameters)
+
+        if features is None:
+            features = compute_function(file_path)
+            self.store(key, features, feature_parameters, file_path)
+
+        return features
+
+    def _list_entries(self) -> list:
+        """
+        Lists every feature block in the cache as (modification time, size, key) tuples.
+        """
+        list_entries = []
+
+        for sub_directory in os.listdir(self.cache_directory):
+            sub_directory_path = os.path.join(self.cache_directory, sub_directory)
+
+            if not os.path.isdir(sub_directory_path):
+                continue
+
+            for file_name in os.listdir(sub_directory_path):
+
+                if file_name.endswith(DEFAULT_FEATURE_EXTENSION):
+                    file_status = os.stat(os.path.join(sub_directory_path, file_name))
+                    list_entries.append((file_status.st_mtime, file_status.st_size,
+                                         file_name[:-len(DEFAULT_FEATURE_EXTENSION)]))
+
+        return list_entries
+
+    def _remove_entry(self, key: str) -> None:
+        for extension in (DEFAULT_FEATURE_EXTENSION, DEFAULT_METADATA_EXTENSION):
+            try:
+                os.remove(self._entry_path(key, extension))
+            except FileNotFoundError:
+                pass
+
+    def get_size(self) -> int:
+        """
+        Returns the total size in bytes of the feature blocks stored in the cache.
+        """
+        if not self.enabled:
+            return 0
+
+        return sum(size for _, size, _ in self._list_entries())
+
+    def evict(self) -> int:
+        """
+        Removes the least recently used entries until the cache fits in the size budget.
+
+        Returns
+        -------
+        int
+            Number of removed entries.
+        """
+        if not self.enabled or not self.size_budget:
+            return 0
+
+        list_entries = sorted(self._list_entries())
+        cache_size = sum(size for _, size, _ in list_entries)
+        number_removed = 0
+
+        for _, size, key in list_entries:
+
+            if cache_size <= self.size_budget:
+                break
+
+            self._remove_entry(key)
+            cache_size -= size
+            number_removed += 1
+
+        if number_removed:
+            logging.info(f"Feature cache evicted {number_removed} entries to fit the budget of {self.size_budget} bytes.")
+
+        return number_removed
+
+    def invalidate(self, **parameters) -> int:
+        """
+        Removes every entry whose feature parameters match all the given values.
+
+        Parameters
+        ----------
+        **parameters
+            Feature parameters to match (e.g. feature_type='mel_spectrogram', hop_length=256).
+
+        Returns
+        -------
+        int
+            Number of removed entries.
+        """
+        if not self.enabled:
+            return 0
+
+        number_removed = 0
+
+        for _, _, key in self._list_entries():
+            metadata = self._read_json(self._entry_path(key, DEFAULT_METADATA_EXTENSION)) or {}
+            entry_parameters = metadata.get('parameters', {})
+
+            if all(entry_parameters.get(name) == value for name, value in parameters.items()):
+                self._remove_entry(key)
+                number_removed += 1
+
+        logging.info(f"Feature cache invalidated {number_removed} entries matching {parameters}.")
+        return number_removed
+
+    def remove_file_hashes(self, file_hashes: list) -> int:
+        """
+        Removes every entry extracted from a file content that was deleted or replaced in the dataset.
+
+        Parameters
+        ----------
+        file_hashes : list
+            Content hashes of the deleted files and the previous hashes of the modified ones.
+
+        Returns
+        -------
+        int
+            Number of removed entries.
+        """
+        if not self.enabled or not file_hashes:
+            return 0
+
+        file_hashes = set(file_hashes)
+        number_removed = 0
+
+        for _, _, key in self._list_entries():
+            metadata = self._read_json(self._entry_path(key, DEFAULT_METADATA_EXTENSION)) or {}
+
+            if metadata.get('file_hash') in file_hashes:
+                self._remove_entry(key)
+                number_removed += 1
+
+        logging.info(f"Feature cache removed {number_removed} entries of deleted or modified files.")
+        return number_removed
+
+    def flush(self) -> None:
+        """
+        Writes the index of file hashes to disk so that unchanged files are not hashed again.
+        """
+        if not self.enabled:
+            return
+
+        def write_index(temporary_path):
+            with open(temporary_path, 'w') as json_file:
+                json.dump(self.file_hash_index, json_file)
+
+        self._write_atomic(os.path.join(self.cache_directory, DEFAULT_HASH_INDEX_FILE), write_index)
+
+    def get_statistics(self) -> dict:
+        """
+        Returns the hit/miss counters and the number of bytes read and written.
+        """
+        return {'hits': self.number_hits, 'misses': self.number_misses,
+                'bytes_read': self.bytes_read, 'bytes_written': self.bytes_written}
+
+    def log_statistics(self) -> None:
+        """
+        Logs the hit/miss counters and the number of bytes read and written.
+        """
+        if not self.enabled:
+            return
+
+        logging.info("Feature cache: {hits} hits, {misses} misses, {bytes_read} bytes read, "
+                     "{bytes_written} bytes written.".format(**self.get_statistics()))
+
+    def finalize(self) -> None:
+        """
+        Applies the size budget, persists the file hash index and logs the statistics. Called by the
+        loaders once every file has been processed.
+        """
+        self.evict()
+        self.flush()
+        self.log_statistics()
+
+
+def parse_parameter_assignments(list_assignments: list) -> dict:
+    """
+    Parses a list of 'name=value' strings into a dictionary of feature parameters.
+
+    Values are interpreted as Python literals when possible (e.g. '256' -> 256, '(16, 16)' -> (16, 16))
+    and kept as strings otherwise. Tuples are converted to lists to match the stored parameters.
+    """
+    parameters = {}
+
+    for assignment in list_assignments or []:
+        name, _, value = assignment.partition('=')
+
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            pass
+
+        parameters[name.strip()] = list(value) if isinstance(value, tuple) else value
+
+    return parameters
+
+
+def get_feature_cache_args(parser):
+
+    parser.add_argument('--feature_cache_directory', type=str,
+                        default=DEFAULT_CACHE_DIRECTORY, help='Directory of the on-disk feature cache (disabled if not set)')
+
+    parser.add_argument('--feature_cache_size_budget', type=int,
+                        default=DEFAULT_SIZE_BUDGET, help='Maximum size of the feature cache in bytes (0 for unlimited)')
+
+    return parser
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    argument_parser = argparse.ArgumentParser(description="Inspect and maintain the on-disk feature cache.")
+    argument_parser.add_argument('--cache_directory', type=str, required=True, help='Directory of the feature cache')
+    argument_parser.add_argument('--invalidate', nargs='+', metavar='NAME=VALUE',
+                                 help='Remove entries whose parameters match every NAME=VALUE pair')
+    argument_parser.add_argument('--size_budget', type=int, default=DEFAULT_SIZE_BUDGET,
+                                 help='Evict least recently used entries above this size in bytes')
+    input_arguments = argument_parser.parse_args()
+
+    feature_cache = FeatureCache(input_arguments.cache_directory, input_arguments.size_budget)
+
+    if input_arguments.invalidate:
+        feature_cache.invalidate(**parse_parameter_assignments(input_arguments.invalidate))
+
+    feature_cache.evict()
+    logging.info(f"Feature cache size: {feature_cache.get_size()} bytes.")
@@ -0,0 +1,475 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import sys
+    import json
+    import numpy
+    import logging
+
+    from Modules.Dataset.WindowFraming import frame_signal
+    from Modules.Dataset.WindowFraming import get_window_step
+    from Modules.Dataset.ActivityDetector import ActivityDetector
+    from Modules.Dataset.LoaderProfiler import profile_stage
+    from Modules.Dataset.LoaderProfiler import STAGE_DECIBEL
+    from Modules.Dataset.LoaderProfiler import STAGE_PATCHING
+    from Modules.Dataset.LoaderProfiler import STAGE_WINDOWING
+    from Modules.Dataset.LoaderProfiler import STAGE_SPECTROGRAM
+    from Modules.Dataset.LoaderProfiler import STAGE_NORMALIZATION
+    from Modules.Dataset.LoaderProfiler import STAGE_ACTIVITY_DETECTION
+    from Modules.Dataset.MelSpectrogram import power_to_decibel
+    from Modules.Dataset.MelSpectrogram import project_mel_spectrograms
+    from Modules.Dataset.MelSpectrogram import compute_shared_power_frames
+    from Modules.Dataset.MelSpectrogram import compute_decibel_spectrograms
+    from Modules.Dataset.PatchExtraction import split_spectrograms_into_patches
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_SHARED_FEATURE_PASS = False  # Each model extracts its own features unless the shared pass is requested
+
+# Maps each feature type (the 'feature_type' of the model feature parameters) to its extraction function
+FEATURE_EXTRACTORS = {}
+
+
+def register_feature_extractor(feature_type: str):
+    """
+    Registers the decorated function as the extractor of a feature type.
+
+    The function receives the `SignalIntermediates` of one file and the feature parameters of a model, and
+    returns the feature block of the file.
+    """
+    def register(extraction_function):
+        FEATURE_EXTRACTORS[feature_type] = extraction_function
+        return extraction_function
+
+    return register
+
+
+def normalize_min_max(amplitudes: numpy.ndarray, axis) -> numpy.ndarray:
+    """
+    Applies min-max normalization to a stack of arrays in one batched expression, over the given axes.
+
+    Arrays whose values are all equal (e.g. windows of digital silence) have no range to normalize by and
+    are set to zeros, as the former per-window loops did.
+
+    Parameters
+    ----------
+    amplitudes : numpy.ndarray
+        Array of shape (number_windows, ...).
+    axis : int or tuple
+        Axes reduced by the minimum and maximum of each array.
+
+    Returns
+    -------
+    numpy.ndarray
+        Normalized array of the same shape and type.
+    """
+    minimum = numpy.min(amplitudes, axis=axis, keepdims=True)
+    amplitude_range = numpy.max(amplitudes, axis=axis, keepdims=True) - minimum
+
+    normalized_amplitudes = numpy.zeros_like(amplitudes)
+    numpy.divide(amplitudes - minimum, amplitude_range, out=normalized_amplitudes, where=amplitude_range != 0)
+
+    return normalized_amplitudes
+
+
+def normalize_amplitude_windows(signal_windows: numpy.ndarray) -> numpy.ndarray:
+    """
+    Applies min-max normalization to the absolute amplitude of each window.
+
+    Parameters
+    ----------
+    signal_windows : numpy.ndarray
+        Array of shape (number_windows, window_size).
+
+    Returns
+    -------
+    numpy.ndarray
+        Float32 array of shape (number_windows, window_size).
+    """
+    if len(signal_windows) == 0:
+        return numpy.zeros(signal_windows.shape, dtype=numpy.float32)
+
+    return normalize_min_max(numpy.abs(signal_windows), axis=1).astype(numpy.float32, copy=False)
+
+
+def normalize_segmented_windows(signal_windows: numpy.ndarray, window_size_factor: int) -> numpy.ndarray:
+    """
+    Splits each window into `window_size_factor` segments and applies min-max normalization to the
+    absolute amplitude of the window.
+
+    The segments are a reshape of the window matrix, so the whole file is normalized at once. When the
+    window size is not a multiple of `window_size_factor`, the trailing `window_size % window_size_factor`
+    samples of each window, which would form a ragged last segment, are dropped before the normalization.
+
+    Parameters
+    ----------
+    signal_windows : numpy.ndarray
+        Array of shape (number_windows, window_size).
+    window_size_factor : int
+        Number of segments of each window.
+
+    Returns
+    -------
+    numpy.ndarray
+        Float32 array of shape (number_windows, window_size_factor, window_size // window_size_factor).
+    """
+    local_window = signal_windows.shape[1] // window_size_factor
+    signal_segments = numpy.abs(signal_windows[:, :local_window * window_size_factor]).reshape(
+        len(signal_windows), window_size_factor, local_window)
+
+    if len(signal_windows) == 0 or local_window == 0:
+        return numpy.zeros(signal_segments.shape, dtype=numpy.float32)
+
+    return normalize_min_max(signal_segments, axis=(1, 2)).astype(numpy.float32, copy=False)
+
+
+class SignalIntermediates:
+    """
+    Intermediate results of the feature extraction of one signal, computed once and shared by every feature
+    type that needs them.
+
+    The framed windows are shared by the feature types with the same window size, overlap and last window
+    policy, the STFT power frames ('shared_stft' mode) by the spectrograms with the same FFT size and hop
+    length whatever their number of mel filters, and the decibel spectrograms by the feature types that
+    only differ in their post-processing (e.g. scaling or patching).
+
+    Attributes
+    ----------
+    signal : numpy.ndarray
+        One-dimensional audio signal of the file.
+    intermediates : dict
+        Maps the key of each intermediate result to its value.
+    """
+
+    def __init__(self, signal: numpy.ndarray):
+        """
+        Initializes the SignalIntermediates.
+
+        Parameters
+        ----------
+        signal : numpy.ndarray
+            One-dimensional audio signal of the file.
+        """
+        self.signal = signal
+        self.intermediates = {}
+
+    def _get_or_compute(self, key: tuple, compute_function, stage: str = None):
+        if key not in self.intermediates:
+
+            if stage is None:
+                self.intermediates[key] = compute_function()
+            else:
+                with profile_stage(stage):
+                    self.intermediates[key] = compute_function()
+
+        return self.intermediates[key]
+
+    def get_active_windows(self, parameters: dict) -> tuple:
+        """
+        Returns the windows of the signal kept by the activity detector of the feature parameters, along with
+        their positions among the windows of the file and the step between them.
+        """
+        step = get_window_step(parameters['window_size'], parameters['overlap'])
+        activity_detector = ActivityDetector.from_parameters(parameters)
+        window_key = ('windows', parameters['window_size'], step, parameters['last_window_policy'])
+
+        signal_windows = self._get_or_compute(window_key, lambda: frame_signal(self.signal, parameters['window_size'],
+                                                                               step, parameters['last_window_policy']),
+                                              STAGE_WINDOWING)
+
+        if not activity_detector.enabled:
+            return signal_windows, None, step
+
+        def select_active_windows():
+            window_positions = numpy.flatnonzero(activity_detector.detect(signal_windows))
+            return signal_windows[window_positions], window_positions
+
+        active_key = window_key + (activity_detector.energy_threshold, activity_detector.flux_threshold)
+        active_windows, window_positions = self._get_or_compute(active_key, select_active_windows,
+                                                                STAGE_ACTIVITY_DETECTION)
+
+        return active_windows, window_positions, step
+
+    def get_windows(self, parameters: dict) -> tuple:
+        """
+        Returns the windows of the signal (see `frame_signal`), without the silent windows skipped by the
+        activity detector, and the step between them.
+        """
+        signal_windows, _, step = self.get_active_windows(parameters)
+        return signal_windows, step
+
+    def get_decibel_spectrograms(self, parameters: dict) -> numpy.ndarray:
+        """
+        Returns the mel spectrograms of the windows in decibels (see `compute_decibel_spectrograms`).
+        """
+        signal_windows, window_positions, step = self.get_active_windows(parameters)
+        window_key = (parameters['window_size'], step, parameters['last_window_policy'],
+                      parameters.get('activity_energy_threshold'), parameters.get('activity_flux_threshold'))
+        spectrogram_key = window_key + (parameters['sample_rate'], parameters['n_fft'], parameters['hop_length'],
+                                        parameters['n_mels'], parameters['spectrogram_mode'])
+
+        if parameters['spectrogram_mode'] != "shared_stft":
+            return self._get_or_compute(('decibel_spectrograms',) + spectrogram_key,
+                                        lambda: compute_decibel_spectrograms(self.signal, signal_windows, step,
+                                                                             parameters['sample_rate'],
+                                                                             parameters['n_fft'],
+                                                                             parameters['hop_length'],
+                                                                             parameters['n_mels'],
+                                                                             parameters['spectrogram_mode']))
+
+        # The power frames only depend on the windows, the FFT size and the hop length
+        power_frames = self._get_or_compute(('power_frames',) + window_key + (parameters['n_fft'],
+                                                                               parameters['hop_length']),
+                                            lambda: compute_shared_power_frames(self.signal, signal_windows, step,
+                                                                                parameters['n_fft'],
+                                                                                parameters['hop_length'],
+                                                                                window_positions),
+                                            STAGE_SPECTROGRAM)
+
+        def compute_spectrograms():
+            with profile_stage(STAGE_SPECTROGRAM):
+                spectrograms = project_mel_spectrograms(power_frames, parameters['sample_rate'], parameters['n_fft'],
+                                                        parameters['n_mels'])
+
+            with profile_stage(STAGE_DECIBEL):
+                return power_to_decibel(spectrograms).astype(numpy.float32)
+
+        return self._get_or_compute(('decibel_spectrograms',) + spectrogram_key, compute_spectrograms)
+
+    def get_scaled_spectrograms(self, parameters: dict) -> numpy.ndarray:
+        """
+        Returns the decibel spectrograms scaled by `dB / decibel_scale_factor + 1`, as the models use them.
+        """
+        spectrograms = self.get_decibel_spectrograms(parameters)
+
+        with profile_stage(STAGE_DECIBEL):
+            return (spectrograms / parameters['decibel_scale_factor']) + 1
+
+
+@register_feature_extractor('normalized_waveform')
+def extract_normalized_waveform(intermediates: SignalIntermediates, parameters: dict) -> numpy.ndarray:
+    signal_windows, _ = intermediates.get_windows(parameters)
+
+    with profile_stage(STAGE_NORMALIZATION):
+        return normalize_amplitude_windows(signal_windows)
+
+
+@register_feature_extractor('segmented_waveform')
+def extract_segmented_waveform(intermediates: SignalIntermediates, parameters: dict) -> numpy.ndarray:
+    signal_windows, _ = intermediates.get_windows(parameters)
+
+    with profile_stage(STAGE_NORMALIZATION):
+        return normalize_segmented_windows(signal_windows, parameters['window_size_factor'])
+
+
+@register_feature_extractor('mel_spectrogram')
+def extract_mel_spectrogram(intermediates: SignalIntermediates, parameters: dict) -> numpy.ndarray:
+
+    # The spectrograms are computed by the first layers of the model from the raw windows
+    if parameters['spectrogram_mode'] == "in_graph":
+        return intermediates.get_windows(parameters)[0]
+
+    return intermediates.get_scaled_spectrograms(parameters)
+
+
+@register_feature_extractor('spectrogram_patches')
+def extract_spectrogram_patches(intermediates: SignalIntermediates, parameters: dict) -> numpy.ndarray:
+
+    # The spectrograms and their patches are computed by the first layers of the model from the raw windows
+    if parameters['spectrogram_mode'] == "in_graph":
+        return intermediates.get_windows(parameters)[0]
+
+    spectrograms = intermediates.get_scaled_spectrograms(parameters)
+
+    with profile_stage(STAGE_PATCHING):
+        return split_spectrograms_into_patches(spectrograms, tuple(parameters['patch_size']),
+                                               parameters['patch_overlap'])
+
+
+def get_feature_extractor(feature_type: str):
+    """
+    Returns the extraction function registered for a feature type.
+
+    Raises
+    ------
+    ValueError
+        If no extractor is registered for the feature type.
+    """
+    if feature_type not in FEATURE_EXTRACTORS:
+        raise ValueError(f"Unknown feature type '{feature_type}', "
+                         f"expected one of {', '.join(sorted(FEATURE_EXTRACTORS))}.")
+
+    return FEATURE_EXTRACTORS[feature_type]
+
+
+def extract_feature_block(signal: numpy.ndarray, feature_parameters: dict,
+                          intermediates: SignalIntermediates = None) -> numpy.ndarray:
+    """
+    Extracts the feature block of a signal described by the feature parameters of a model.
+
+    Parameters
+    ----------
+    signal : numpy.ndarray
+        One-dimensional audio signal of the file.
+    feature_parameters : dict
+        Feature parameters of a model (see the `get_feature_parameters` method of the models).
+    intermediates : SignalIntermediates, optional
+        Intermediate results of the signal shared with other feature types.
+
+    Returns
+    -------
+    numpy.ndarray
+        Feature block of the file.
+    """
+    extraction_function = get_feature_extractor(feature_parameters['feature_type'])
+    return extraction_function(intermediates or SignalIntermediates(signal), feature_parameters)
+
+
+class FeatureExtractor:
+    """
+    Computes the features of several models in a single pass over the corpus.
+
+    Each model declares its features with its feature parameters (the feature cache key). Every file is read
+    once per sample rate from the waveform store, each distinct feature block is extracted from the shared
+    `SignalIntermediates` of the file, and the blocks are stored in the feature cache under the key of each
+    model, so the loaders then read them instead of extracting them again.
+
+    Attributes
+    ----------
+    list_feature_parameters : list
+        Distinct feature parameters to extract.
+    waveform_store : WaveformStore
+        Store the signals are read from.
+    pending_features : dict
+        Maps each file being extracted to the indexes of the feature parameters missing from the cache.
+    """
+
+    def __init__(self, list_feature_parameters: list, waveform_store):
+        """
+        Initializes the FeatureExtractor.
+
+        Parameters
+        ----------
+        list_feature_parameters : list
+            Feature parameters of each model. Models with the same parameters share their feature blocks.
+        waveform_store : WaveformStore
+            Store the signals are read from.
+        """
+        unique_parameters = {json.dumps(parameters, sort_keys=True, default=str): parameters
+                             for parameters in list_feature_parameters}
+
+        self.list_feature_parameters = list(unique_parameters.values())
+        self.waveform_store = waveform_store
+        self.pending_features = {}
+
+        for feature_parameters in self.list_feature_parameters:
+            get_feature_extractor(feature_parameters['feature_type'])
+
+    def extract_file(self, file_name: str) -> list:
+        """
+        Extracts the feature blocks of one file that are pending (by default all of them).
+
+        Parameters
+        ----------
+        file_name : str
+            Path to the audio file.
+
+        Returns
+        -------
+        list
+            Feature block of each pending feature parameters, in the order of `list_feature_parameters`.
+        """
+        list_indexes = self.pending_features.get(file_name, range(len(self.list_feature_parameters)))
+        signal_intermediates = {}
+        list_features = []
+
+        for index in list_indexes:
+            feature_parameters = self.list_feature_parameters[index]
+            sample_rate = feature_parameters['sample_rate']
+
+            if sample_rate not in signal_intermediates:
+                signal = self.waveform_store.load(file_name, sample_rate)
+                signal_intermediates[sample_rate] = SignalIntermediates(signal)
+
+            list_features.append(extract_feature_block(signal_intermediates[sample_rate].signal, feature_parameters,
+                                                       signal_intermediates[sample_rate]))
+
+        return list_features
+
+    def precompute(self, list_files: list, parallel_extractor, feature_cache) -> int:
+        """
+        Extracts the feature blocks missing from the feature cache in one pass and stores them.
+
+        Parameters
+        ----------
+        list_files : list
+            Paths to the audio files.
+        parallel_extractor : ParallelExtractor
+            Pool that runs `extract_file` on the files.
+        feature_cache : FeatureCache
+            Cache the feature blocks are stored in.
+
+        Returns
+        -------
+        int
+            Number of feature blocks stored.
+        """
+        if not feature_cache.enabled:
+            logging.warning("The shared feature pass requires a feature cache directory, skipping it.")
+            return 0
+
+        dictionary_keys = {}
+        self.pending_features = {}
+
+        for file_name in list_files:
+
+            for index, feature_parameters in enumerate(self.list_feature_parameters):
+                key = feature_cache.build_key(file_name, feature_parameters)
+
+                if not feature_cache.contains(key):
+                    dictionary_keys[(file_name, index)] = key
+                    self.pending_features.setdefault(file_name, []).append(index)
+
+        logging.info(f"Shared feature pass: {len(dictionary_keys)} feature blocks of {len(self.pending_features)} "
+                     f"files for {len(self.list_feature_parameters)} feature types.")
+
+        number_stored = 0
+        list_pending = list(self.pending_features)
+
+        for file_name, list_features, error in parallel_extractor.imap(list_pending, self.extract_file):
+
+            if error is not None:
+                continue
+
+            for index, features in zip(self.pending_features[file_name], list_features):
+                feature_cache.store(dictionary_keys[(file_name, index)], features,
+                                    self.list_feature_parameters[index], file_name)
+                number_stored += 1
+
+        self.pending_features = {}
+        feature_cache.finalize()
+
+        return number_stored
+
+
+def get_feature_extractor_args(parser):
+
+    parser.add_argument('--shared_feature_pass', action='store_true',
+                        default=DEFAULT_SHARED_FEATURE_PASS, help='Extract the features of every model in one pass over the corpus into the feature cache')
+
+    return parser
@@ -0,0 +1,191 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import numpy
+    import logging
+
+    from Modules.Dataset.LoaderProfiler import profile_stage
+    from Modules.Dataset.LoaderProfiler import STAGE_QUANTIZATION
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+FEATURE_DTYPES = ("float32", "float16", "uint8")
+DEFAULT_FEATURE_DTYPE = "float32"  # Features are stored as float32 unless a smaller storage type is chosen
+DEFAULT_QUANTIZATION_CHUNK_SIZE = 4096  # Number of windows converted at a time
+UINT8_LEVELS = 255
+
+
+def get_assembly_dtype(feature_dtype: str) -> numpy.dtype:
+    """
+    Returns the type of the array the features are assembled into before they are quantized.
+
+    Float16 features are assembled directly in float16. The 8-bit scale and offset depend on the range of
+    the whole dataset, so 8-bit features are staged in float16 and quantized once every block is known.
+    """
+    return numpy.dtype(numpy.float32 if feature_dtype == "float32" else numpy.float16)
+
+
+def get_cache_dtype(feature_dtype: str) -> numpy.dtype:
+    """
+    Returns the type of the feature blocks stored in the feature cache, which holds one block per file
+    and therefore cannot share a per-dataset 8-bit scale.
+    """
+    return get_assembly_dtype(feature_dtype)
+
+
+class QuantizedFeatures:
+    """
+    A feature array stored as float16 or as 8-bit codes, converted to float32 when it is indexed.
+
+    For 8-bit storage each value is `code * scale + offset`, with the scale and offset computed from the
+    range of the whole dataset. Indexing returns float32 features, so the batches built by `IndexedBatches`
+    (and the shard exporter) only convert the windows of one batch.
+
+    Attributes
+    ----------
+    data : numpy.ndarray
+        Stored float16 values or uint8 codes (in RAM or memory-mapped).
+    scale : float
+        Step between consecutive 8-bit codes (1 for float16 storage).
+    offset : float
+        Value of the code 0 (0 for float16 storage).
+    """
+
+    def __init__(self, data: numpy.ndarray, scale: float = 1.0, offset: float = 0.0):
+        """
+        Initializes the QuantizedFeatures.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            Stored float16 values or uint8 codes.
+        scale : float, optional
+            Step between consecutive 8-bit codes.
+        offset : float, optional
+            Value of the code 0.
+        """
+        self.data = data
+        self.scale = numpy.float32(scale)
+        self.offset = numpy.float32(offset)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def shape(self) -> tuple:
+        return self.data.shape
+
+    @property
+    def dtype(self) -> numpy.dtype:
+        return self.data.dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def __getitem__(self, indexes) -> numpy.ndarray:
+        features = numpy.asarray(self.data[indexes], dtype=numpy.float32)
+
+        if self.data.dtype == numpy.uint8:
+            features *= self.scale
+            features += self.offset
+
+        return features
+
+    def __array__(self, dtype=None, copy=None) -> numpy.ndarray:
+        return self[:].astype(dtype or numpy.float32, copy=False)
+
+
+def quantize_features(features: numpy.ndarray, feature_dtype: str = DEFAULT_FEATURE_DTYPE, memmap_path: str = None,
+                      chunk_size: int = DEFAULT_QUANTIZATION_CHUNK_SIZE):
+    """
+    Converts an assembled feature array to its storage type.
+
+    Parameters
+    ----------
+    features : numpy.ndarray
+        Features assembled in the type returned by `get_assembly_dtype`.
+    feature_dtype : str, optional
+        One of 'float32', 'float16' or 'uint8'.
+    memmap_path : str, optional
+        Path of the memory-mapped feature array; the 8-bit codes are written next to it.
+    chunk_size : int, optional
+        Number of windows converted at a time.
+
+    Returns
+    -------
+    numpy.ndarray or QuantizedFeatures
+        The float32 features unchanged, or the features wrapped in a QuantizedFeatures.
+
+    Raises
+    ------
+    ValueError
+        If the feature type is unknown.
+    """
+    if feature_dtype not in FEATURE_DTYPES:
+        raise ValueError(f"Unknown feature type '{feature_dtype}', expected one of {', '.join(FEATURE_DTYPES)}.")
+
+    if feature_dtype == "float32":
+        return features
+
+    float32_size = features.size * 4
+
+    if feature_dtype == "float16":
+        logging.info(f"Storing {len(features)} windows as float16: {features.nbytes} bytes instead of "
+                     f"{float32_size} bytes.")
+        return QuantizedFeatures(features)
+
+    with profile_stage(STAGE_QUANTIZATION):
+
+        # Per-dataset range of the features, computed chunk by chunk to avoid a float32 copy
+        minimum, maximum = numpy.inf, -numpy.inf
+
+        for start in range(0, len(features), chunk_size):
+            chunk = numpy.asarray(features[start:start + chunk_size], dtype=numpy.float32)
+            minimum = min(minimum, float(chunk.min(initial=numpy.inf)))
+            maximum = max(maximum, float(chunk.max(initial=-numpy.inf)))
+
+        if not numpy.isfinite(minimum):
+            minimum, maximum = 0.0, 0.0
+
+        scale = (maximum - minimum) / UINT8_LEVELS or 1.0
+
+        if memmap_path is None:
+            codes = numpy.zeros(features.shape, dtype=numpy.uint8)
+        else:
+            codes = numpy.lib.format.open_memmap(os.path.splitext(memmap_path)[0] + ".uint8.npy", mode='w+',
+                                                 dtype=numpy.uint8, shape=features.shape)
+
+        for start in range(0, len(features), chunk_size):
+            chunk = (numpy.asarray(features[start:start + chunk_size], dtype=numpy.float32) - minimum) / scale
+            codes[start:start + chunk_size] = numpy.clip(numpy.rint(chunk), 0, UINT8_LEVELS)
+
+    logging.info(f"Quantized {len(features)} windows to 8 bits (scale {scale:.6g}, offset {minimum:.6g}): "
+                 f"{codes.nbytes} bytes instead of {float32_size} bytes.")
+
+    return QuantizedFeatures(codes, scale, minimum)
+
+
+def get_feature_quantization_args(parser):
+
+    parser.add_argument('--feature_dtype', type=str, choices=FEATURE_DTYPES,
+                        default=DEFAULT_FEATURE_DTYPE, help='Storage type of the loaded and cached features (converted to float32 per batch)')
+
+    return parser
@@ -0,0 +1,259 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import json
+    import time
+    import logging
+    import contextlib
+
+    from datetime import datetime
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_LOADER_REPORT_DIRECTORY = "Logs"  # The JSON loader report of each run is written next to its log file
+DEFAULT_SUMMARY_STAGES = 3  # Number of stages, the slowest first, shown in the one-line summaries
+
+# Stages timed by the data loading pipeline
+STAGE_DECODE = "decode"
+STAGE_RESAMPLE = "resample"
+STAGE_WINDOWING = "windowing"
+STAGE_ACTIVITY_DETECTION = "activity_detection"
+STAGE_SPECTROGRAM = "spectrogram"
+STAGE_DECIBEL = "decibel"
+STAGE_NORMALIZATION = "normalization"
+STAGE_PATCHING = "patching"
+STAGE_FEATURE_CACHE = "feature_cache"
+STAGE_ASSEMBLY = "assembly"
+STAGE_QUANTIZATION = "quantization"
+
+COUNTER_BYTES_DECODED = "bytes_decoded"  # Bytes of the audio files read by the decoder
+
+# Time and number of calls of each stage, and the counters, accumulated by the current process since the
+# last `collect_stage_timings`
+_stage_timings = {}
+_counters = {}
+
+# Reports of the loaders finished during the run, written by `save_loader_reports`
+_loader_reports = []
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """
+    Adds the time of one call of a stage to the timings of the current process.
+    """
+    stage_timing = _stage_timings.setdefault(stage, [0.0, 0])
+    stage_timing[0] += seconds
+    stage_timing[1] += 1
+
+
+@contextlib.contextmanager
+def profile_stage(stage: str):
+    """
+    Context manager that records the wall time of the enclosed code as one call of a stage.
+    """
+    start_time = time.perf_counter()
+
+    try:
+        yield
+
+    finally:
+        record_stage(stage, time.perf_counter() - start_time)
+
+
+def add_counter(name: str, value: int) -> None:
+    """
+    Adds a value to a counter of the current process.
+    """
+    _counters[name] = _counters.get(name, 0) + value
+
+
+def collect_stage_timings() -> dict:
+    """
+    Returns the stage timings and counters accumulated by the current process, and resets them.
+
+    The worker processes of the `ParallelExtractor` return them along with each result, so that the parent
+    process merges them with `merge_stage_timings`.
+    """
+    timings = {'stages': {stage: list(stage_timing) for stage, stage_timing in _stage_timings.items()},
+               'counters': dict(_counters)}
+    _stage_timings.clear()
+    _counters.clear()
+
+    return timings
+
+
+def merge_stage_timings(timings: dict) -> None:
+    """
+    Adds the stage timings and counters collected in another process to those of the current process.
+    """
+    for stage, (seconds, calls) in timings['stages'].items():
+        stage_timing = _stage_timings.setdefault(stage, [0.0, 0])
+        stage_timing[0] += seconds
+        stage_timing[1] += calls
+
+    for name, value in timings['counters'].items():
+        add_counter(name, value)
+
+
+def format_stage_summary(stages: dict, number_stages: int = DEFAULT_SUMMARY_STAGES) -> str:
+    """
+    Returns the slowest stages of a report as 'stage seconds s' items.
+    """
+    slowest_stages = sorted(stages.items(), key=lambda item: item[1]['seconds'], reverse=True)[:number_stages]
+    return ", ".join(f"{stage} {timing['seconds']:.2f} s" for stage, timing in slowest_stages) or "none"
+
+
+class LoaderProfiler:
+    """
+    Measures one run of a data loader: its wall time, throughput, decoded bytes, peak memory and the time
+    spent in each stage of the pipeline (decode, resample, windowing, spectrogram, decibel conversion,
+    normalization, feature cache, assembly, ...).
+
+    The stages are timed with `profile_stage` where they run, in the loader process or in the extraction
+    workers. The time of a stage is summed over the worker processes, so with several workers the stage
+    times may add up to more than the wall time.
+
+    Attributes
+    ----------
+    name : str
+        Name of the loader (usually the model name).
+    start_time : float
+        Time at which the loader started.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initializes the LoaderProfiler.
+
+        Parameters
+        ----------
+        name : str
+            Name of the loader.
+        """
+        self.name = name
+        self.start_time = None
+
+    def start(self) -> None:
+        """
+        Starts the measurement, discarding the stage timings recorded before it.
+        """
+        collect_stage_timings()
+        self.start_time = time.perf_counter()
+
+    def finish(self, number_files: int, number_windows: int, peak_memory: int) -> dict:
+        """
+        Ends the measurement, logs its one-line summary and keeps its report for `save_loader_reports`.
+
+        Parameters
+        ----------
+        number_files : int
+            Number of files loaded.
+        number_windows : int
+            Number of windows loaded.
+        peak_memory : int
+            Peak resident set size of the process in bytes.
+
+        Returns
+        -------
+        dict
+            Report of the loader.
+        """
+        wall_time = time.perf_counter() - (self.start_time or time.perf_counter())
+        timings = collect_stage_timings()
+
+        report = {'name': self.name,
+                  'wall_time': wall_time,
+                  'files': number_files,
+                  'windows': number_windows,
+                  'files_per_second': number_files / wall_time if wall_time > 0 else 0.0,
+                  'windows_per_second': number_windows / wall_time if wall_time > 0 else 0.0,
+                  'bytes_decoded': timings['counters'].get(COUNTER_BYTES_DECODED, 0),
+                  'peak_rss': peak_memory,
+                  'stages': {stage: {'seconds': seconds, 'calls': calls}
+                             for stage, (seconds, calls) in timings['stages'].items()}}
+        _loader_reports.append(report)
+
+        logging.info(f"Loader {self.name}: {number_files} files and {number_windows} windows in {wall_time:.2f} s "
+                     f"({report['files_per_second']:.1f} files/s, {report['windows_per_second']:.1f} windows/s), "
+                     f"{report['bytes_decoded'] / (1 << 20):.1f} MiB decoded, peak RSS "
+                     f"{peak_memory / (1 << 20):.1f} MiB, slowest stages: {format_stage_summary(report['stages'])}.")
+
+        return report
+
+
+def get_loader_reports() -> list:
+    """
+    Returns the reports of the loaders finished during the run, in the order they finished.
+    """
+    return list(_loader_reports)
+
+
+def save_loader_reports(report_directory: str = DEFAULT_LOADER_REPORT_DIRECTORY):
+    """
+    Writes the reports of the loaders finished during the run to a JSON file and logs a one-line summary.
+
+    Parameters
+    ----------
+    report_directory : str, optional
+        Directory of the JSON report. The report is not written if None.
+
+    Returns
+    -------
+    str
+        Path of the JSON report, or None if it was not written.
+    """
+    if not _loader_reports:
+        return None
+
+    total_stages = {}
+
+    for report in _loader_reports:
+
+        for stage, timing in report['stages'].items():
+            total_stages.setdefault(stage, {'seconds': 0.0, 'calls': 0})
+            total_stages[stage]['seconds'] += timing['seconds']
+            total_stages[stage]['calls'] += timing['calls']
+
+    logging.info(f"Loader report: {len(_loader_reports)} loaders, "
+                 f"{sum(report['wall_time'] for report in _loader_reports):.2f} s, "
+                 f"{sum(report['windows'] for report in _loader_reports)} windows, peak RSS "
+                 f"{max(report['peak_rss'] for report in _loader_reports) / (1 << 20):.1f} MiB, "
+                 f"slowest stages: {format_stage_summary(total_stages)}.")
+
+    if report_directory is None:
+        return None
+
+    os.makedirs(report_directory, exist_ok=True)
+    report_path = os.path.join(report_directory,
+                               "loader_report_" + datetime.now().strftime('%Y-%m-%d_%H-%M-%S') + ".json")
+
+    with open(report_path, 'w') as report_file:
+        json.dump({'loaders': _loader_reports, 'stages': total_stages}, report_file, indent=1)
+
+    logging.info(f"Loader report written to '{report_path}'.")
+    return report_path
+
+
+def get_loader_profiler_args(parser):
+
+    parser.add_argument('--loader_report_directory', type=str,
+                        default=DEFAULT_LOADER_REPORT_DIRECTORY, help='Directory where the JSON report of the loader stage timings of each run is written')
+
+    return parser
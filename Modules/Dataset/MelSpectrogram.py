@@ -0,0 +1,283 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import sys
+    import numpy
+    import librosa
+    import functools
+
+    from scipy.signal import get_window
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    from Modules.Dataset.LoaderProfiler import profile_stage
+    from Modules.Dataset.LoaderProfiler import STAGE_DECIBEL
+    from Modules.Dataset.LoaderProfiler import STAGE_SPECTROGRAM
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_SPECTROGRAM_MODE = "per_window"  # One librosa call per window, identical to the original loaders
+SPECTROGRAM_MODES = ("per_window", "shared_stft", "in_graph")  # 'in_graph' is computed by MelSpectrogramLayer
+DEFAULT_AMIN = 1e-10  # Same floor and dynamic range as librosa.power_to_db
+DEFAULT_TOP_DB = 80.0
+
+# In 'shared_stft' mode the batched STFT and mel projection are computed in the same precision as librosa
+# (float64 windowed frames, complex64 spectrum, float32 power and mel projection), so the scaled decibel
+# spectrograms differ from the 'per_window' ones only by floating point summation order. The maximum absolute
+# difference after `/ decibel_scale_factor + 1` is checked against this tolerance, for every overlap and last
+# window policy, by Benchmarks/SpectrogramModeBenchmark.py.
+SHARED_STFT_TOLERANCE = 1e-6
+
+
+@functools.lru_cache(maxsize=None)
+def get_mel_basis(sample_rate: int, n_fft: int, number_filters: int) -> numpy.ndarray:
+    """
+    Returns the mel filterbank used by librosa.feature.melspectrogram, computed once per configuration.
+    """
+    mel_basis = librosa.filters.mel(sr=sample_rate, n_fft=n_fft, n_mels=number_filters)
+    mel_basis.flags.writeable = False
+    return mel_basis
+
+
+@functools.lru_cache(maxsize=None)
+def get_fft_window(n_fft: int) -> numpy.ndarray:
+    """
+    Returns the periodic Hann window used by librosa.stft, computed once per FFT size.
+    """
+    fft_window = get_window('hann', n_fft, fftbins=True)
+    fft_window.flags.writeable = False
+    return fft_window
+
+
+def compute_power_spectrum(frames: numpy.ndarray, n_fft: int) -> numpy.ndarray:
+    """
+    Computes the power spectrum of a stack of frames as librosa does.
+
+    Parameters
+    ----------
+    frames : numpy.ndarray
+        Array of shape (..., n_fft) with the samples of each frame.
+    n_fft : int
+        Size of the FFT.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (..., n_fft // 2 + 1) with the float32 power of each frequency bin.
+    """
+    spectrum = numpy.fft.rfft(frames * get_fft_window(n_fft), axis=-1).astype(numpy.complex64)
+    return numpy.abs(spectrum) ** 2
+
+
+def power_to_decibel(spectrograms: numpy.ndarray, amin: float = DEFAULT_AMIN,
+                     top_db: float = DEFAULT_TOP_DB) -> numpy.ndarray:
+    """
+    Vectorized librosa.power_to_db(ref=numpy.max) applied independently to every spectrogram of a stack.
+
+    Parameters
+    ----------
+    spectrograms : numpy.ndarray
+        Array of shape (number_windows, number_filters, number_frames) with power spectrograms.
+    amin : float, optional
+        Minimum power, used to avoid the logarithm of zero.
+    top_db : float, optional
+        Dynamic range kept below the maximum of each spectrogram.
+
+    Returns
+    -------
+    numpy.ndarray
+        Spectrograms in decibels relative to their own maximum.
+    """
+    reference = numpy.max(spectrograms, axis=(1, 2), keepdims=True)
+
+    decibel_spectrograms = 10.0 * numpy.log10(numpy.maximum(amin, spectrograms))
+    decibel_spectrograms -= 10.0 * numpy.log10(numpy.maximum(amin, reference))
+
+    if top_db is not None:
+        decibel_maximum = numpy.max(decibel_spectrograms, axis=(1, 2), keepdims=True)
+        decibel_spectrograms = numpy.maximum(decibel_spectrograms, decibel_maximum - top_db)
+
+    return decibel_spectrograms
+
+
+def compute_shared_power_frames(signal: numpy.ndarray, signal_windows: numpy.ndarray, step: int, n_fft: int,
+                                hop_length: int, window_positions: numpy.ndarray = None) -> numpy.ndarray:
+    """
+    Computes the STFT power frames of every window of a file with one batched STFT.
+
+    A frame that lies entirely inside a complete window is a frame of the file itself, so it is computed once
+    and shared by every window that contains it (which happens whenever the window step is a multiple of the
+    hop length). Frames that reach past the edges of a window are zero padded exactly as librosa does with
+    center=True, and windows completed by the last window policy never share frames.
+
+    Parameters
+    ----------
+    signal : numpy.ndarray
+        One-dimensional audio signal of the file.
+    signal_windows : numpy.ndarray
+        Array of shape (number_windows, window_size) returned by `frame_signal`.
+    step : int
+        Distance in samples between the starts of consecutive windows.
+    n_fft : int
+        Size of the FFT.
+    hop_length : int
+        Number of samples between consecutive frames.
+    window_positions : numpy.ndarray, optional
+        Position of each window among the windows of the file, when only some of them are given (e.g. the
+        active windows). By default the windows are the consecutive windows of the file.
+
+    Returns
+    -------
+    numpy.ndarray
+        Float32 array of shape (number_windows, 1 + window_size // hop_length, n_fft // 2 + 1).
+    """
+    number_windows, window_size = signal_windows.shape
+    number_frames = 1 + window_size // hop_length
+
+    if number_windows == 0:
+        return numpy.zeros((0, number_frames, n_fft // 2 + 1), dtype=numpy.float32)
+
+    # Start of every frame relative to the start of its window (negative inside the left padding)
+    frame_offsets = numpy.arange(number_frames) * hop_length - n_fft // 2
+    interior_frames = (frame_offsets >= 0) & (frame_offsets + n_fft <= window_size)
+
+    window_positions = numpy.arange(number_windows) if window_positions is None else numpy.asarray(window_positions)
+    window_starts = window_positions * step
+    complete_windows = window_starts + window_size <= len(signal)
+    shared_frames = complete_windows[:, numpy.newaxis] & interior_frames[numpy.newaxis, :]
+
+    frame_starts = window_starts[:, numpy.newaxis] + frame_offsets[numpy.newaxis, :]
+    unique_starts, frame_positions = numpy.unique(frame_starts[shared_frames], return_inverse=True)
+
+    power_frames = numpy.empty((number_windows, number_frames, n_fft // 2 + 1), dtype=numpy.float32)
+
+    if len(unique_starts):
+        signal_frames = sliding_window_view(signal, n_fft)[unique_starts]
+        power_frames[shared_frames] = compute_power_spectrum(signal_frames, n_fft)[frame_positions]
+
+    if not numpy.all(shared_frames):
+        padded_windows = numpy.pad(signal_windows, ((0, 0), (n_fft // 2, n_fft // 2)))
+        window_frames = sliding_window_view(padded_windows, n_fft, axis=1)[:, ::hop_length]
+        power_frames[~shared_frames] = compute_power_spectrum(window_frames[~shared_frames], n_fft)
+
+    return power_frames
+
+
+def project_mel_spectrograms(power_frames: numpy.ndarray, sample_rate: int, n_fft: int,
+                             number_filters: int) -> numpy.ndarray:
+    """
+    Projects a stack of STFT power frames on the mel filterbank, in the librosa (filters, frames) layout.
+    """
+    mel_basis = get_mel_basis(sample_rate, n_fft, number_filters)
+    return numpy.einsum("...tf,mf->...mt", power_frames, mel_basis, optimize=True)
+
+
+def compute_shared_mel_spectrograms(signal: numpy.ndarray, signal_windows: numpy.ndarray, step: int,
+                                    sample_rate: int, n_fft: int, hop_length: int,
+                                    number_filters: int) -> numpy.ndarray:
+    """
+    Computes the mel power spectrograms of every window of a file with one batched STFT and one mel projection
+    (see `compute_shared_power_frames`).
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (number_windows, number_filters, 1 + window_size // hop_length).
+    """
+    power_frames = compute_shared_power_frames(signal, signal_windows, step, n_fft, hop_length)
+    return project_mel_spectrograms(power_frames, sample_rate, n_fft, number_filters)
+
+
+def compute_decibel_spectrograms(signal: numpy.ndarray, signal_windows: numpy.ndarray, step: int,
+                                 sample_rate: int, n_fft: int, hop_length: int, number_filters: int,
+                                 spectrogram_mode: str = DEFAULT_SPECTROGRAM_MODE) -> numpy.ndarray:
+    """
+    Computes the mel spectrogram in decibels, relative to its own maximum, of every window of a file.
+
+    Parameters
+    ----------
+    signal : numpy.ndarray
+        One-dimensional audio signal of the file.
+    signal_windows : numpy.ndarray
+        Array of shape (number_windows, window_size) returned by `frame_signal`.
+    step : int
+        Distance in samples between the starts of consecutive windows.
+    sample_rate : int
+        Sample rate of the signal.
+    n_fft : int
+        Size of the FFT.
+    hop_length : int
+        Number of samples between consecutive frames.
+    number_filters : int
+        Number of mel filters.
+    spectrogram_mode : str, optional
+        'per_window' calls librosa once per window; 'shared_stft' computes one batched STFT and mel projection
+        per file and matches 'per_window' within `SHARED_STFT_TOLERANCE`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Float32 array of shape (number_windows, number_filters, 1 + window_size // hop_length).
+
+    Raises
+    ------
+    ValueError
+        If the spectrogram mode is unknown.
+    """
+    if spectrogram_mode == "shared_stft":
+
+        with profile_stage(STAGE_SPECTROGRAM):
+            spectrograms = compute_shared_mel_spectrograms(signal, signal_windows, step, sample_rate, n_fft,
+                                                           hop_length, number_filters)
+
+        with profile_stage(STAGE_DECIBEL):
+            return power_to_decibel(spectrograms).astype(numpy.float32)
+
+    if spectrogram_mode == "in_graph":
+        raise ValueError("In the 'in_graph' spectrogram mode the spectrograms are computed by the model "
+                         "(see MelSpectrogramLayer), the loaders return raw windows.")
+
+    if spectrogram_mode != "per_window":
+        raise ValueError(f"Unknown spectrogram mode '{spectrogram_mode}', "
+                         f"expected one of {', '.join(SPECTROGRAM_MODES)}.")
+
+    list_spectrogram = []
+
+    for signal_window in signal_windows:
+
+        with profile_stage(STAGE_SPECTROGRAM):
+            spectrogram = librosa.feature.melspectrogram(y=signal_window,
+                                                         n_mels=number_filters,
+                                                         sr=sample_rate,
+                                                         n_fft=n_fft,
+                                                         hop_length=hop_length)
+
+        with profile_stage(STAGE_DECIBEL):
+            list_spectrogram.append(librosa.power_to_db(spectrogram, ref=numpy.max))
+
+    if not list_spectrogram:
+        return numpy.zeros((0, number_filters, 1 + signal_windows.shape[1] // hop_length), dtype=numpy.float32)
+
+    return numpy.array(list_spectrogram, dtype=numpy.float32)
+
+
+def get_mel_spectrogram_args(parser):
+
+    parser.add_argument('--spectrogram_mode', type=str, choices=SPECTROGRAM_MODES,
+                        default=DEFAULT_SPECTROGRAM_MODE, help='Compute spectrograms per window, with one shared STFT per file, or inside the model from raw windows')
+
+    return parser
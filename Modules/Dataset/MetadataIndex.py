@@ -0,0 +1,500 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import re
+    import sys
+    import glob
+    import hashlib
+    import sqlite3
+    import logging
+    import zipfile
+    import argparse
+    import datetime
+
+    from xml.etree import ElementTree
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_METADATA_INDEX_PATH = None  # Files are listed from the class directories unless an index is given
+DEFAULT_DATASHEET_PATH = "DatasetMosquitoes/Mosquitoes_Datasheet_Acoustic_Identification_of_ Ae_aegypti_Mosquitoes.xlsx"
+DEFAULT_FILE_EXTENSION = "*.wav"
+SECONDS_PER_DAY = 86400  # Most recording lengths are time cells, stored as fractions of a day
+SPREADSHEET_NAMESPACES = {'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+                          'relationships': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'}
+PACKAGE_RELATIONSHIPS_NAMESPACE = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+# Columns of the recording sheets (by header) stored in the index
+DATASHEET_COLUMNS = {'Sound ID': 'sound_id',
+                     'Recording Date': 'recording_date',
+                     'Recording Length (s)': 'length_seconds',
+                     'Obtaining Technique': 'obtaining_technique',
+                     'ID Container': 'container_id',
+                     'Number of Mosquitoes': 'number_mosquitoes',
+                     'Mosquito Species': 'species',
+                     'Mosquitos Gender': 'gender',
+                     'Age Mosquitoes Days': 'age_days',
+                     'Method Collection': 'collection_method'}
+
+# Columns that accept a list of values in the filter expressions (e.g. subset=RD5,RD6)
+FILTER_COLUMNS = {'subset': 'subset', 'species': 'species', 'gender': 'gender', 'label': 'class_label',
+                  'sound_id': 'sound_id', 'collection_method': 'collection_method'}
+DURATION_FILTER = 'duration'  # Range of recording lengths in seconds (e.g. duration=2:10, duration=:30)
+
+
+def get_column_index(cell_reference: str) -> int:
+    """
+    Returns the zero-based column index of a cell reference (e.g. 'C12' -> 2).
+    """
+    column_index = 0
+
+    for letter in re.match(r'[A-Z]+', cell_reference).group():
+        column_index = column_index * 26 + ord(letter) - ord('A') + 1
+
+    return column_index - 1
+
+
+def read_xlsx_sheets(datasheet_path: str) -> dict:
+    """
+    Reads the cell values of every sheet of an .xlsx workbook with the standard library.
+
+    Parameters
+    ----------
+    datasheet_path : str
+        Path to the workbook.
+
+    Returns
+    -------
+    dict
+        Maps each sheet name to its rows, each row being a list of cell values (strings, or None for empty cells).
+    """
+    sheets = {}
+
+    with zipfile.ZipFile(datasheet_path) as workbook_file:
+        shared_strings = []
+
+        if 'xl/sharedStrings.xml' in workbook_file.namelist():
+            root = ElementTree.fromstring(workbook_file.read('xl/sharedStrings.xml'))
+            shared_strings = [''.join(text.text or '' for text in item.iter('{%s}t' % SPREADSHEET_NAMESPACES['main']))
+                              for item in root]
+
+        relationships = ElementTree.fromstring(workbook_file.read('xl/_rels/workbook.xml.rels'))
+        sheet_targets = {relationship.get('Id'): relationship.get('Target') for relationship in
+                         relationships.iter('{%s}Relationship' % PACKAGE_RELATIONSHIPS_NAMESPACE)}
+
+        workbook = ElementTree.fromstring(workbook_file.read('xl/workbook.xml'))
+
+        for sheet in workbook.iter('{%s}sheet' % SPREADSHEET_NAMESPACES['main']):
+            relationship_id = sheet.get('{%s}id' % SPREADSHEET_NAMESPACES['relationships'])
+            sheet_path = 'xl/' + sheet_targets[relationship_id].lstrip('/').replace('xl/', '', 1)
+            sheet_root = ElementTree.fromstring(workbook_file.read(sheet_path))
+            list_rows = []
+
+            for row in sheet_root.iter('{%s}row' % SPREADSHEET_NAMESPACES['main']):
+                values = {}
+
+                for cell in row.findall('main:c', SPREADSHEET_NAMESPACES):
+                    value = cell.find('main:v', SPREADSHEET_NAMESPACES)
+                    inline_string = cell.find('main:is', SPREADSHEET_NAMESPACES)
+
+                    if inline_string is not None:
+                        text = ''.join(text.text or '' for text in
+                                       inline_string.iter('{%s}t' % SPREADSHEET_NAMESPACES['main']))
+                    elif value is None:
+                        continue
+                    elif cell.get('t') == 's':
+                        text = shared_strings[int(value.text)]
+                    else:
+                        text = value.text
+
+                    values[get_column_index(cell.get('r'))] = text
+
+                list_rows.append([values.get(index) for index in range(max(values, default=-1) + 1)])
+
+            sheets[sheet.get('name')] = list_rows
+
+    return sheets
+
+
+def parse_datasheet(datasheet_path: str) -> list:
+    """
+    Parses the recording sheets of the Mosquitoes datasheet (one sheet per subset, named 'RD<n> - ...').
+
+    Parameters
+    ----------
+    datasheet_path : str
+        Path to the workbook.
+
+    Returns
+    -------
+    list
+        One dictionary per recording with the subset and the columns of `DATASHEET_COLUMNS`. Lengths are
+        converted to seconds and recording dates to ISO dates.
+    """
+    list_recordings = []
+
+    for sheet_name, list_rows in read_xlsx_sheets(datasheet_path).items():
+        subset_match = re.match(r'\s*(RD\d+)', sheet_name)
+
+        if subset_match is None or not list_rows:
+            continue
+
+        header = [(value or '').strip() for value in list_rows[0]]
+
+        for row in list_rows[1:]:
+            recording = {'subset': subset_match.group(1)}
+
+            for column_index, column_name in enumerate(header):
+
+                if column_name in DATASHEET_COLUMNS and column_index < len(row) and row[column_index] is not None:
+                    recording[DATASHEET_COLUMNS[column_name]] = row[column_index].strip() or None
+
+            if not recording.get('sound_id'):
+                continue
+
+            recording['length_seconds'] = convert_length(recording.get('length_seconds'))
+            recording['recording_date'] = convert_serial_date(recording.get('recording_date'))
+            list_recordings.append(recording)
+
+    return list_recordings
+
+
+def convert_length(value: str):
+    """
+    Converts a recording length to seconds. Time cells hold fractions of a day (always below one for these
+    recordings), while some sheets (e.g. RD3) hold plain numbers of seconds.
+    """
+    try:
+        length = float(value)
+    except (TypeError, ValueError):
+        return None
+
+    return round(length * SECONDS_PER_DAY if length < 1 else length, 3)
+
+
+def convert_serial_date(value: str):
+    try:
+        return (datetime.date(1899, 12, 30) + datetime.timedelta(days=int(float(value)))).isoformat()
+    except (TypeError, ValueError):
+        return value
+
+
+def parse_metadata_filters(list_filters: list) -> tuple:
+    """
+    Parses filter expressions into an SQL condition and its parameters.
+
+    Each expression is 'name=value[,value...]', with name in `FILTER_COLUMNS` (values compared without
+    case), or 'duration=min:max' with the recording length range in seconds (either bound may be omitted).
+    Expressions are combined with AND.
+
+    Raises
+    ------
+    ValueError
+        If an expression is malformed or names an unknown column.
+    """
+    list_conditions, list_parameters = [], []
+
+    for expression in list_filters or []:
+        name, separator, value = expression.partition('=')
+        name = name.strip()
+
+        if not separator:
+            raise ValueError(f"Malformed metadata filter '{expression}', expected NAME=VALUE.")
+
+        if name == DURATION_FILTER:
+            minimum, _, maximum = value.partition(':')
+
+            if minimum.strip():
+                list_conditions.append("length_seconds >= ?")
+                list_parameters.append(float(minimum))
+
+            if maximum.strip():
+                list_conditions.append("length_seconds <= ?")
+                list_parameters.append(float(maximum))
+
+            continue
+
+        if name not in FILTER_COLUMNS:
+            raise ValueError(f"Unknown metadata filter '{name}', expected one of "
+                             f"{', '.join(list(FILTER_COLUMNS) + [DURATION_FILTER])}.")
+
+        list_values = [value.strip() for value in value.split(',')]
+        list_conditions.append("{} COLLATE NOCASE IN ({})".format(FILTER_COLUMNS[name],
+                                                                  ', '.join('?' * len(list_values))))
+        list_parameters.extend(list_values)
+
+    return ' AND '.join(list_conditions) or '1', list_parameters
+
+
+def get_audio_tree_digest(dataset_directory: str, file_extension: str = DEFAULT_FILE_EXTENSION) -> str:
+    """
+    Returns a digest of the path, size and modification time of every audio file of the class directories.
+
+    Only the file attributes are read, so adding, removing, renaming or rewriting a recording changes the
+    digest without decoding the audio.
+    """
+    digest = hashlib.sha1()
+
+    for class_dir in sorted(os.listdir(dataset_directory)):
+        class_path = os.path.join(dataset_directory, class_dir)
+
+        if not os.path.isdir(class_path):
+            continue
+
+        for file_name in sorted(glob.glob(os.path.join(class_path, file_extension))):
+            file_stat = os.stat(file_name)
+            digest.update(f"{os.path.abspath(file_name)}\0{file_stat.st_size}\0{file_stat.st_mtime_ns}\n".encode())
+
+    return digest.hexdigest()
+
+
+class MetadataIndex:
+    """
+    An SQLite index of the recordings described by the Mosquitoes datasheet, joined with the audio files.
+
+    The datasheet is parsed once into a `recordings` table holding, for each recording, its subset (RD1,
+    RD2, ...), species, gender, length and collection details, the matching audio file (joined on the file
+    name without extension) and the label of its class directory. Audio files without a datasheet entry are
+    indexed too, without metadata. The loaders then resolve their file lists with an indexed query instead
+    of listing the class directories, so the files excluded by the filters are never decoded.
+
+    When no index path is given the index is disabled, so the loaders can use it unconditionally.
+
+    Attributes
+    ----------
+    index_path : str
+        Path of the SQLite database.
+    """
+
+    def __init__(self, index_path: str = DEFAULT_METADATA_INDEX_PATH):
+        """
+        Initializes the MetadataIndex.
+
+        Parameters
+        ----------
+        index_path : str, optional
+            Path of the SQLite database. If None, the index is disabled.
+        """
+        self.index_path = index_path
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.index_path)
+
+    def _connect(self):
+        return sqlite3.connect(self.index_path)
+
+    def get_source(self) -> dict:
+        """
+        Returns the datasheet, dataset directory and file extension the index was built from (empty if not built).
+        """
+        if not self.enabled or not os.path.exists(self.index_path):
+            return {}
+
+        with self._connect() as connection:
+            source = dict(connection.execute("SELECT name, value FROM source"))
+        connection.close()
+
+        return source
+
+    def is_current(self, datasheet_path: str, dataset_directory: str,
+                   file_extension: str = DEFAULT_FILE_EXTENSION) -> bool:
+        """
+        Checks whether the index was built from this datasheet, unchanged, and this dataset directory with
+        the same audio files (see `get_audio_tree_digest`).
+        """
+        source = self.get_source()
+        return (source.get('datasheet_path') == os.path.abspath(datasheet_path)
+                and source.get('datasheet_mtime') == str(os.stat(datasheet_path).st_mtime_ns)
+                and source.get('dataset_directory') == os.path.abspath(dataset_directory)
+                and source.get('file_extension') == file_extension
+                and source.get('audio_tree_digest') == get_audio_tree_digest(dataset_directory, file_extension))
+
+    def build(self, datasheet_path: str, dataset_directory: str, file_extension: str = DEFAULT_FILE_EXTENSION) -> None:
+        """
+        Parses the datasheet, joins it with the audio files of the class directories and writes the index.
+
+        Parameters
+        ----------
+        datasheet_path : str
+            Path to the .xlsx datasheet.
+        dataset_directory : str
+            Directory containing one subdirectory per class.
+        file_extension : str, optional
+            Glob pattern of the audio files.
+        """
+        list_recordings = parse_datasheet(datasheet_path)
+        audio_tree_digest = get_audio_tree_digest(dataset_directory, file_extension)
+        dictionary_files = {}
+
+        for class_dir in sorted(os.listdir(dataset_directory)):
+            class_path = os.path.join(dataset_directory, class_dir)
+
+            if not os.path.isdir(class_path):
+                continue
+
+            try:
+                class_label = int(class_dir.split('_')[0])
+            except ValueError:
+                class_label = None
+
+            for file_name in sorted(glob.glob(os.path.join(class_path, file_extension))):
+                sound_id = os.path.splitext(os.path.basename(file_name))[0].strip().lower()
+                dictionary_files.setdefault(sound_id, []).append((file_name, class_label))
+
+        list_rows, matched_ids = [], set()
+        list_columns = ['file_path', 'class_label', 'subset'] + list(DATASHEET_COLUMNS.values())
+
+        for recording in list_recordings:
+            sound_id = recording['sound_id'].lower()
+            matched_ids.add(sound_id)
+
+            for file_name, class_label in dictionary_files.get(sound_id, [(None, None)]):
+                row = dict(recording, file_path=file_name, class_label=class_label)
+                list_rows.append([row.get(column) for column in list_columns])
+
+        for sound_id, list_files in dictionary_files.items():
+
+            if sound_id not in matched_ids:
+                for file_name, class_label in list_files:
+                    list_rows.append([file_name, class_label] + [None] * (len(list_columns) - 2))
+
+        temporary_path = "{}.{}.tmp".format(self.index_path, os.getpid())
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+        with sqlite3.connect(temporary_path) as connection:
+            connection.execute("CREATE TABLE recordings ({}, length_seconds REAL, class_label INTEGER)".format(
+                ', '.join(f"{column} TEXT" for column in list_columns if column not in ('length_seconds',
+                                                                                        'class_label'))))
+            connection.executemany("INSERT INTO recordings ({}) VALUES ({})".format(
+                ', '.join(list_columns), ', '.join('?' * len(list_columns))), list_rows)
+
+            for column in ('subset', 'species', 'gender', 'length_seconds', 'class_label', 'file_path'):
+                connection.execute(f"CREATE INDEX recordings_{column} ON recordings ({column})")
+
+            connection.execute("CREATE TABLE source (name TEXT PRIMARY KEY, value TEXT)")
+            connection.executemany("INSERT INTO source VALUES (?, ?)",
+                                   [('datasheet_path', os.path.abspath(datasheet_path)),
+                                    ('datasheet_mtime', str(os.stat(datasheet_path).st_mtime_ns)),
+                                    ('dataset_directory', os.path.abspath(dataset_directory)),
+                                    ('file_extension', file_extension),
+                                    ('audio_tree_digest', audio_tree_digest)])
+
+        connection.close()
+        os.replace(temporary_path, self.index_path)
+
+        number_files = sum(len(list_files) for list_files in dictionary_files.values())
+        number_matched = sum(len(dictionary_files[sound_id]) for sound_id in matched_ids if sound_id in dictionary_files)
+        logging.info(f"Metadata index '{self.index_path}': {len(list_recordings)} datasheet recordings, "
+                     f"{number_matched} of {number_files} audio files matched.")
+
+    def update(self, datasheet_path: str, dataset_directory: str, file_extension: str = DEFAULT_FILE_EXTENSION) -> None:
+        """
+        Builds the index unless it is current for this datasheet and dataset directory. Recordings added to
+        or removed from the class directories since the last build trigger a rebuild.
+        """
+        if not self.enabled:
+            return
+
+        if self.is_current(datasheet_path, dataset_directory, file_extension):
+            logging.info(f"Reusing metadata index '{self.index_path}'.")
+            return
+
+        self.build(datasheet_path, dataset_directory, file_extension)
+
+    def select_files(self, list_filters: list = None) -> tuple:
+        """
+        Returns the audio files, and their class labels, of the recordings matching the filter expressions.
+
+        Parameters
+        ----------
+        list_filters : list, optional
+            Filter expressions (see `parse_metadata_filters`). Every indexed file is returned if empty.
+
+        Returns
+        -------
+        tuple
+            The list of file paths and the list of integer labels, ordered by path.
+        """
+        condition, list_parameters = parse_metadata_filters(list_filters)
+
+        with self._connect() as connection:
+            list_rows = connection.execute("SELECT DISTINCT file_path, class_label FROM recordings "
+                                           "WHERE file_path IS NOT NULL AND class_label IS NOT NULL AND "
+                                           f"{condition} ORDER BY file_path", list_parameters).fetchall()
+        connection.close()
+
+        logging.info(f"Metadata index selected {len(list_rows)} files with filters {list_filters or []}.")
+        return [file_path for file_path, _ in list_rows], [int(class_label) for _, class_label in list_rows]
+
+    def summarize(self) -> list:
+        """
+        Returns the number of recordings, matched audio files and total length of each subset, species and gender.
+        """
+        with self._connect() as connection:
+            list_rows = connection.execute("SELECT subset, species, gender, COUNT(*), COUNT(file_path), "
+                                           "SUM(length_seconds) FROM recordings GROUP BY subset, species, gender "
+                                           "ORDER BY subset").fetchall()
+        connection.close()
+
+        return list_rows
+
+
+def get_metadata_index_args(parser):
+
+    parser.add_argument('--metadata_index_path', type=str,
+                        default=DEFAULT_METADATA_INDEX_PATH, help='SQLite index of the datasheet used to select the files (disabled if not set)')
+
+    parser.add_argument('--metadata_datasheet_path', type=str,
+                        default=DEFAULT_DATASHEET_PATH, help='Datasheet (.xlsx) describing the recordings of each subset')
+
+    parser.add_argument('--metadata_filter', nargs='+', metavar='NAME=VALUE', default=None,
+                        help='Select recordings by subset, species, gender, label, sound_id, collection_method '
+                             '(comma separated values) or duration=MIN:MAX in seconds')
+
+    return parser
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    argument_parser = argparse.ArgumentParser(description="Import the Mosquitoes datasheet into a metadata index.")
+    argument_parser.add_argument('--index_path', type=str, required=True, help='Path of the SQLite index')
+    argument_parser.add_argument('--datasheet_path', type=str, default=DEFAULT_DATASHEET_PATH,
+                                 help='Datasheet (.xlsx) describing the recordings')
+    argument_parser.add_argument('--dataset_directory', type=str, required=True,
+                                 help='Directory containing one subdirectory per class')
+    argument_parser.add_argument('--file_extension', type=str, default=DEFAULT_FILE_EXTENSION,
+                                 help='Glob pattern of the audio files')
+    argument_parser.add_argument('--filter', nargs='+', metavar='NAME=VALUE', help='Count the files matching filters')
+    input_arguments = argument_parser.parse_args()
+
+    metadata_index = MetadataIndex(input_arguments.index_path)
+    metadata_index.build(input_arguments.datasheet_path, input_arguments.dataset_directory,
+                         input_arguments.file_extension)
+
+    for subset, species, gender, number_recordings, number_files, total_length in metadata_index.summarize():
+        logging.info(f"{subset} {species} {gender}: {number_recordings} recordings, {number_files} files, "
+                     f"{total_length or 0:.0f} s")
+
+    if input_arguments.filter:
+        metadata_index.select_files(input_arguments.filter)
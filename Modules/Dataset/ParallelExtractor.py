@@ -0,0 +1,269 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import logging
+    import multiprocessing
+
+    from tqdm import tqdm
+    from concurrent.futures import ProcessPoolExecutor
+    from threadpoolctl import threadpool_limits
+
+    from Modules.Dataset.LoaderProfiler import profile_stage
+    from Modules.Dataset.LoaderProfiler import merge_stage_timings
+    from Modules.Dataset.LoaderProfiler import STAGE_FEATURE_CACHE
+    from Modules.Dataset.LoaderProfiler import collect_stage_timings
+
+    from Modules.Evaluation.WorkerLogging import configure_worker_logging
+    from Modules.Evaluation.WorkerLogging import get_logging_configuration
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_LOADER_WORKERS = 1  # Number of worker processes used to decode and extract features (1 means serial)
+DEFAULT_TASKS_PER_WORKER = 4  # Number of chunks handed to each worker, balancing load against scheduling overhead
+
+# Extraction function installed in each worker process by `_initialize_worker`
+_worker_extraction_function = None
+
+
+def _initialize_worker(extraction_function, logging_configuration: dict = None) -> None:
+    """
+    Installs the extraction function and the logging configuration of the parent in a worker process and
+    limits native thread pools to one thread, so that the workers do not oversubscribe the CPU cores.
+    """
+    global _worker_extraction_function
+    configure_worker_logging(logging_configuration)
+    _worker_extraction_function = extraction_function
+    threadpool_limits(limits=1)
+    collect_stage_timings()
+
+
+def _extract_file(file_name: str, extraction_function=None) -> tuple:
+    """
+    Runs the extraction function (by default the one installed in the worker) on one file, returning the
+    error message instead of raising so that a single corrupted file does not abort the whole pool.
+
+    In a worker process the stage timings recorded while extracting the file are returned as well, so that
+    the parent process accounts for them.
+    """
+    try:
+        result, error = (extraction_function or _worker_extraction_function)(file_name), None
+
+    except Exception as e:
+        result, error = None, str(e)
+
+    return result, error, collect_stage_timings() if extraction_function is None else None
+
+
+class ParallelExtractor:
+    """
+    Decodes audio files and extracts their feature blocks with a pool of worker processes.
+
+    Feature cache lookups and stores happen in the parent process, and only the misses are dispatched to
+    the workers. Results are returned in the order of the input files regardless of which worker finished
+    first, so the assembled dataset is identical to the one produced by the serial path.
+
+    Attributes
+    ----------
+    number_workers : int
+        Number of worker processes. With one worker (or a single pending file) the extraction runs
+        in the calling process.
+    """
+
+    def __init__(self, number_workers: int = DEFAULT_LOADER_WORKERS):
+        """
+        Initializes the ParallelExtractor.
+
+        Parameters
+        ----------
+        number_workers : int, optional
+            Number of worker processes. Values lower than one use every available CPU core.
+        """
+        if number_workers is None or number_workers < 1:
+            number_workers = os.cpu_count() or 1
+
+        self.number_workers = number_workers
+
+    def _map(self, extraction_function, list_files: list):
+        """
+        Yields the (features, error, stage timings) of each file in input order.
+        """
+        number_workers = min(self.number_workers, len(list_files))
+
+        if number_workers <= 1:
+            for file_name in list_files:
+                yield _extract_file(file_name, extraction_function)
+            return
+
+        chunk_size = max(1, len(list_files) // (number_workers * DEFAULT_TASKS_PER_WORKER))
+
+        # Spawned workers start without the TensorFlow runtime of the training process, which cannot be forked.
+        # The extraction function is pickled with its owner (a model or the waveform store, which the workers
+        # map again instead of copying) and installed once per worker.
+        with ProcessPoolExecutor(max_workers=number_workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_initialize_worker,
+                                 initargs=(extraction_function, get_logging_configuration())) as executor:
+
+            for result in executor.map(_extract_file, list_files, chunksize=chunk_size):
+                yield result
+
+    def imap(self, list_files: list, extraction_function, progress_offset: int = 0):
+        """
+        Yields the result of the extraction function on each file in input order, updating one progress
+        bar for all files.
+
+        Parameters
+        ----------
+        list_files : list
+            Paths to the audio files.
+        extraction_function : callable
+            Function that receives a file path and returns its result. It must be picklable, since it is
+            sent to the worker processes.
+        progress_offset : int, optional
+            Number of files already processed elsewhere (e.g. read from a cache), shown in the progress bar.
+
+        Yields
+        ------
+        tuple
+            The file path, its result (None if it failed) and the error message (None on success).
+        """
+        total_files = len(list_files) + progress_offset
+
+        with tqdm(total=total_files, initial=progress_offset) as progress_bar:
+
+            for file_name, (result, error, timings) in zip(list_files, self._map(extraction_function, list_files)):
+                progress_bar.update(1)
+
+                if timings is not None:
+                    merge_stage_timings(timings)
+
+                if error is not None:
+                    logging.error(f"Error processing file '{file_name}': {error}")
+
+                yield file_name, result, error
+
+    def iterate_features(self, list_files: list, extraction_function, feature_parameters: dict = None,
+                         feature_cache=None):
+        """
+        Yields the feature block of every file in input order, so that callers can consume each block
+        as soon as it is ready instead of holding every block in memory.
+
+        Parameters
+        ----------
+        list_files : list
+            Paths to the audio files.
+        extraction_function : callable
+            Function that receives a file path and returns its feature block. It must be picklable,
+            since it is sent to the worker processes.
+        feature_parameters : dict, optional
+            Parameters of the feature extraction, used to build the feature cache keys.
+        feature_cache : FeatureCache, optional
+            Cache consulted before extraction and filled with the extracted blocks.
+
+        Yields
+        ------
+        numpy.ndarray or None
+            Feature block of each file. Files that failed to load are logged and yielded as None.
+        """
+        list_keys = [None] * len(list_files)
+        cached_indexes = set()
+        list_pending = []
+
+        # Only the keys of the cached blocks are kept here, each block is loaded when its turn comes
+        for index, file_name in enumerate(list_files):
+
+            if feature_cache is not None and feature_cache.enabled:
+
+                with profile_stage(STAGE_FEATURE_CACHE):
+                    list_keys[index], is_cached = feature_cache.locate(file_name, feature_parameters)
+
+                if is_cached:
+                    cached_indexes.add(index)
+                    continue
+
+            list_pending.append(file_name)
+
+        logging.info(f"Extracting features of {len(list_pending)} of {len(list_files)} files "
+                     f"with {min(self.number_workers, max(len(list_pending), 1))} worker(s)...")
+
+        results = self.imap(list_pending, extraction_function, len(cached_indexes))
+
+        for index, file_name in enumerate(list_files):
+
+            if index in cached_indexes:
+
+                with profile_stage(STAGE_FEATURE_CACHE):
+                    features = feature_cache.load(list_keys[index])
+
+                if features is not None:
+                    yield features
+                    continue
+
+                # The entry was evicted or damaged since it was located, extract the file here
+                features, error, _ = _extract_file(file_name, extraction_function)
+
+                if error is not None:
+                    logging.error(f"Error processing file '{file_name}': {error}")
+
+            else:
+                _, features, error = next(results)
+
+            if error is None and list_keys[index] is not None:
+
+                with profile_stage(STAGE_FEATURE_CACHE):
+                    feature_cache.store(list_keys[index], features, feature_parameters, file_name)
+
+            yield features
+
+        # Close the progress bar and the worker pool
+        for _ in results:
+            pass
+
+    def extract(self, list_files: list, extraction_function, feature_parameters: dict = None,
+                feature_cache=None) -> list:
+        """
+        Extracts the feature block of every file.
+
+        Parameters
+        ----------
+        list_files : list
+            Paths to the audio files.
+        extraction_function : callable
+            Function that receives a file path and returns its feature block. It must be picklable,
+            since it is sent to the worker processes.
+        feature_parameters : dict, optional
+            Parameters of the feature extraction, used to build the feature cache keys.
+        feature_cache : FeatureCache, optional
+            Cache consulted before extraction and filled with the extracted blocks.
+
+        Returns
+        -------
+        list
+            Feature block of each file in input order. Files that failed to load are logged and
+            returned as None.
+        """
+        return list(self.iterate_features(list_files, extraction_function, feature_parameters, feature_cache))
+
+
+def get_parallel_extractor_args(parser):
+
+    parser.add_argument('--loader_workers', type=int, default=DEFAULT_LOADER_WORKERS,
+                        help='Number of worker processes used to decode audio and extract features (values lower than one use every CPU core)')
+
+    return parser
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import sys
+    import numpy
+
+    from numpy.lib.stride_tricks import sliding_window_view
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_PATCH_OVERLAP = 1  # Overlap ratio between patches (1 means non-overlapping patches)
+
+
+def get_number_patches(dimension: int, patch_length: int, patch_step: int) -> int:
+    """
+    Returns the number of patches along one axis, counting a last patch that is completed with zeros.
+    """
+    if dimension <= patch_length:
+        return 1
+
+    return -(-(dimension - patch_length) // patch_step) + 1
+
+
+def split_spectrograms_into_patches(spectrograms: numpy.ndarray, patch_size: tuple,
+                                   patch_overlap: int = DEFAULT_PATCH_OVERLAP) -> numpy.ndarray:
+    """
+    Splits a stack of spectrograms into patches in a single strided pass.
+
+    The spectrograms are padded with zeros at the end of both axes so that the patches cover them completely,
+    and the patches are ordered row by row (frequency first, then time), as in the former per-spectrogram loop.
+    With an overlap ratio r, consecutive patches start patch_size // r bins or frames apart.
+
+    Parameters
+    ----------
+    spectrograms : numpy.ndarray
+        Array of shape (number_spectrograms, number_filters, number_frames).
+    patch_size : tuple
+        Height (filters) and width (frames) of each patch.
+    patch_overlap : int, optional
+        Overlap ratio between patches (1 means non-overlapping patches).
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (number_spectrograms, number_patches, patch_height, patch_width).
+    """
+    patch_height, patch_width = patch_size
+    step_height = max(1, patch_height // patch_overlap)
+    step_width = max(1, patch_width // patch_overlap)
+
+    number_spectrograms, number_filters, number_frames = spectrograms.shape
+    number_patches_height = get_number_patches(number_filters, patch_height, step_height)
+    number_patches_width = get_number_patches(number_frames, patch_width, step_width)
+
+    # Pad the spectrograms with zeros so that the last patches are complete
+    pad_height = (number_patches_height - 1) * step_height + patch_height - number_filters
+    pad_width = (number_patches_width - 1) * step_width + patch_width - number_frames
+    padded_spectrograms = numpy.pad(spectrograms, ((0, 0), (0, pad_height), (0, pad_width)), mode='constant',
+                                    constant_values=0)
+
+    # View of shape (number_spectrograms, patches_height, patches_width, patch_height, patch_width)
+    patches = sliding_window_view(padded_spectrograms, (patch_height, patch_width), axis=(1, 2))
+    patches = patches[:, ::step_height, ::step_width]
+
+    return patches.reshape(number_spectrograms, number_patches_height * number_patches_width,
+                           patch_height, patch_width)
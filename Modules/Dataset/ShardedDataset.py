@@ -0,0 +1,522 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import json
+    import time
+    import numpy
+    import struct
+    import logging
+    import zipfile
+    import tensorflow
+
+    from Modules.Dataset.FeatureAssembler import get_memmap_path
+    from Modules.Dataset.FeatureAssembler import allocate_features
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_SHARD_DIRECTORY = None  # Features are extracted from the audio files unless a shard directory is given
+DEFAULT_SHARD_EXPORT_DIRECTORY = None  # Features are not exported unless a directory is given
+DEFAULT_SHARD_EXPORT_ONLY = False
+DEFAULT_SHARD_SIZE = 4096  # Number of windows per shard
+DEFAULT_SHARD_FORMAT = "npz"
+SHARD_FORMATS = ("npz", "tfrecord")
+DEFAULT_SHARD_CYCLE_LENGTH = 4  # Number of shards read in parallel
+DEFAULT_SHARD_SHUFFLE_BUFFER_SIZE = 1024
+DEFAULT_MANIFEST_FILE = "manifest.json"
+SHARD_FILE_EXTENSIONS = {"npz": ".npz", "tfrecord": ".tfrecord"}
+
+
+def normalize_parameters(feature_parameters: dict) -> dict:
+    """
+    Returns the feature parameters as they are read back from the manifest (tuples become lists).
+    """
+    return json.loads(json.dumps(feature_parameters, sort_keys=True))
+
+
+def count_classes(labels: numpy.ndarray) -> dict:
+    """
+    Returns the number of windows of each label, keyed by the label as a string.
+    """
+    unique_labels, label_counts = numpy.unique(labels, return_counts=True)
+    return {str(int(label)): int(count) for label, count in zip(unique_labels, label_counts)}
+
+
+def write_npz_shard(shard_path: str, features: numpy.ndarray, labels: numpy.ndarray) -> None:
+    """
+    Writes the features and labels of a shard as an uncompressed npz file.
+    """
+    with open(shard_path, 'wb') as shard_file:
+        numpy.savez(shard_file, features=features, labels=labels)
+
+
+def write_tfrecord_shard(shard_path: str, features: numpy.ndarray, labels: numpy.ndarray) -> None:
+    """
+    Writes the features and labels of a shard as a TFRecord file with one example per window.
+    """
+    with tensorflow.io.TFRecordWriter(shard_path) as shard_writer:
+
+        for window, label in zip(features, labels):
+            example = tensorflow.train.Example(features=tensorflow.train.Features(feature={
+                'features': tensorflow.train.Feature(bytes_list=tensorflow.train.BytesList(value=[window.tobytes()])),
+                'label': tensorflow.train.Feature(int64_list=tensorflow.train.Int64List(value=[int(label)]))}))
+            shard_writer.write(example.SerializeToString())
+
+
+def export_shards(features: numpy.ndarray, labels: numpy.ndarray, shard_directory: str, feature_parameters: dict,
+                  model_name: str, shard_size: int = DEFAULT_SHARD_SIZE,
+                  shard_format: str = DEFAULT_SHARD_FORMAT) -> dict:
+    """
+    Writes the features and labels of a model into fixed-size shards and a manifest.
+
+    The windows are written in the order of the loader, so the reader returns the same arrays. The manifest
+    is written last, so a directory is only read back once every shard is complete.
+
+    Parameters
+    ----------
+    features : numpy.ndarray or QuantizedFeatures
+        Feature array produced by the model loader, written as float32.
+    labels : numpy.ndarray
+        Label of each window.
+    shard_directory : str
+        Directory of the shards of the model.
+    feature_parameters : dict
+        Every parameter that affects the features, checked by the reader.
+    model_name : str
+        Name of the model.
+    shard_size : int, optional
+        Number of windows per shard.
+    shard_format : str, optional
+        Either 'npz' or 'tfrecord'.
+
+    Returns
+    -------
+    dict
+        The manifest of the shards.
+
+    Raises
+    ------
+    ValueError
+        If the shard format is unknown.
+    """
+    if shard_format not in SHARD_FORMATS:
+        raise ValueError(f"Unknown shard format '{shard_format}', expected one of {', '.join(SHARD_FORMATS)}.")
+
+    write_function = write_npz_shard if shard_format == "npz" else write_tfrecord_shard
+    labels = numpy.asarray(labels, dtype=numpy.int32)
+    number_shards = max(1, -(-len(features) // shard_size))
+
+    os.makedirs(shard_directory, exist_ok=True)
+    logging.info(f"Exporting {len(features)} windows of {model_name} into {number_shards} {shard_format} shards "
+                 f"in '{shard_directory}'...")
+    start_time = time.perf_counter()
+    list_shards = []
+
+    for shard_index in range(number_shards):
+        shard_features = features[shard_index * shard_size:(shard_index + 1) * shard_size]
+        shard_labels = labels[shard_index * shard_size:(shard_index + 1) * shard_size]
+        shard_name = f"shard-{shard_index:05d}-of-{number_shards:05d}{SHARD_FILE_EXTENSIONS[shard_format]}"
+
+        write_function(os.path.join(shard_directory, shard_name),
+                       numpy.ascontiguousarray(shard_features, dtype=numpy.float32),
+                       shard_labels)
+        list_shards.append({'file': shard_name, 'number_windows': len(shard_features),
+                            'class_counts': count_classes(shard_labels)})
+
+    manifest = {'model_name': model_name,
+                'format': shard_format,
+                'feature_parameters': normalize_parameters(feature_parameters),
+                'feature_shape': list(features.shape[1:]),
+                'dtype': 'float32',
+                'label_dtype': 'int32',
+                'number_windows': len(features),
+                'shard_size': shard_size,
+                'class_counts': count_classes(labels),
+                'shards': list_shards}
+
+    with open(os.path.join(shard_directory, DEFAULT_MANIFEST_FILE + ".tmp"), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+
+    os.replace(os.path.join(shard_directory, DEFAULT_MANIFEST_FILE + ".tmp"),
+               os.path.join(shard_directory, DEFAULT_MANIFEST_FILE))
+
+    logging.info(f"Exported {model_name} shards in {time.perf_counter() - start_time:.1f} s.")
+
+    return manifest
+
+
+class ShardReader:
+    """
+    Reads the shards of a model through a tf.data pipeline that interleaves several shards in parallel.
+
+    Attributes
+    ----------
+    shard_directory : str
+        Directory of the shards of the model.
+    manifest : dict
+        Manifest written by `export_shards`.
+    cycle_length : int
+        Number of shards read in parallel.
+    """
+
+    def __init__(self, shard_directory: str, cycle_length: int = DEFAULT_SHARD_CYCLE_LENGTH):
+        """
+        Initializes the ShardReader, reading the manifest of the shards.
+
+        Parameters
+        ----------
+        shard_directory : str
+            Directory of the shards of the model.
+        cycle_length : int, optional
+            Number of shards read in parallel.
+        """
+        self.shard_directory = shard_directory
+        self.cycle_length = max(1, cycle_length)
+
+        with open(os.path.join(shard_directory, DEFAULT_MANIFEST_FILE), 'r') as manifest_file:
+            self.manifest = json.load(manifest_file)
+
+    @property
+    def feature_shape(self) -> tuple:
+        return tuple(self.manifest['feature_shape'])
+
+    def check_parameters(self, feature_parameters: dict) -> None:
+        """
+        Checks that the shards were exported with the given feature parameters.
+
+        Raises
+        ------
+        ValueError
+            If the parameters differ from the ones recorded in the manifest.
+        """
+        exported_parameters = self.manifest['feature_parameters']
+        feature_parameters = normalize_parameters(feature_parameters)
+
+        if exported_parameters != feature_parameters:
+            differences = sorted(key for key in set(exported_parameters) | set(feature_parameters)
+                                 if exported_parameters.get(key) != feature_parameters.get(key))
+            raise ValueError(f"Shards in '{self.shard_directory}' were exported with different feature parameters "
+                             f"({', '.join(differences)}).")
+
+    def _read_npz_shard(self, shard_path: bytes) -> tuple:
+        """
+        Reads the features and labels of an npz shard.
+        """
+        with numpy.load(shard_path.decode()) as shard:
+            return shard['features'], shard['labels']
+
+    def _get_windows(self, shard_path) -> tensorflow.data.Dataset:
+        """
+        Graph function of the interleave stage, returning the (window, label) pairs of one shard.
+        """
+        if self.manifest['format'] == "tfrecord":
+            example_description = {'features': tensorflow.io.FixedLenFeature([], tensorflow.string),
+                                   'label': tensorflow.io.FixedLenFeature([], tensorflow.int64)}
+
+            def parse_example(serialized_example):
+                example = tensorflow.io.parse_single_example(serialized_example, example_description)
+                window = tensorflow.reshape(tensorflow.io.decode_raw(example['features'], tensorflow.float32),
+                                            self.feature_shape)
+                return window, tensorflow.cast(example['label'], tensorflow.int32)
+
+            return tensorflow.data.TFRecordDataset(shard_path).map(parse_example)
+
+        features, labels = tensorflow.numpy_function(self._read_npz_shard, [shard_path],
+                                                     [tensorflow.float32, tensorflow.int32], stateful=False)
+        features.set_shape((None,) + self.feature_shape)
+        labels.set_shape((None,))
+
+        return tensorflow.data.Dataset.from_tensor_slices((features, labels))
+
+    def get_dataset(self, batch_size: int, shuffle: bool = False,
+                    shuffle_buffer_size: int = DEFAULT_SHARD_SHUFFLE_BUFFER_SIZE,
+                    seed: int = None) -> tensorflow.data.Dataset:
+        """
+        Returns a batched and prefetched dataset of the windows of every shard.
+
+        Without shuffling, each shard contributes `shard_size` consecutive windows in turn, so the windows keep
+        the order of the export while `cycle_length` shards are read in parallel.
+
+        Parameters
+        ----------
+        batch_size : int
+            Number of windows per batch.
+        shuffle : bool, optional
+            Whether the shards and the windows are shuffled (again at each pass).
+        shuffle_buffer_size : int, optional
+            Number of windows held by the shuffle buffer.
+        seed : int, optional
+            Seed of the shuffles.
+
+        Returns
+        -------
+        tensorflow.data.Dataset
+            Dataset of (features, labels) batches, accepted by the model compile_and_train methods.
+        """
+        list_shard_paths = [os.path.join(self.shard_directory, shard['file']) for shard in self.manifest['shards']]
+        dataset = tensorflow.data.Dataset.from_tensor_slices(list_shard_paths)
+
+        if shuffle:
+            dataset = dataset.shuffle(len(list_shard_paths), seed=seed, reshuffle_each_iteration=True)
+
+        dataset = dataset.interleave(self._get_windows, cycle_length=self.cycle_length,
+                                     block_length=1 if shuffle else self.manifest['shard_size'],
+                                     num_parallel_calls=tensorflow.data.AUTOTUNE, deterministic=not shuffle)
+
+        if shuffle:
+            dataset = dataset.shuffle(shuffle_buffer_size, seed=seed, reshuffle_each_iteration=True)
+
+        return dataset.batch(batch_size).prefetch(tensorflow.data.AUTOTUNE)
+
+    def load_arrays(self, memmap_path: str = None) -> tuple:
+        """
+        Reads every shard into one preallocated float32 feature array, in the order of the export.
+
+        Parameters
+        ----------
+        memmap_path : str, optional
+            Path of a .npy file used as memory-mapped output. The array is kept in RAM if not given.
+
+        Returns
+        -------
+        tuple
+            The float32 feature array and the int32 label array.
+        """
+        start_time = time.perf_counter()
+        number_windows = self.manifest['number_windows']
+        array_features = allocate_features(number_windows, self.feature_shape, memmap_path)
+        array_labels = numpy.zeros(number_windows, dtype=numpy.int32)
+        offset = 0
+
+        for batch_features, batch_labels in self.get_dataset(self.manifest['shard_size']):
+            array_features[offset:offset + len(batch_labels)] = batch_features.numpy()
+            array_labels[offset:offset + len(batch_labels)] = batch_labels.numpy()
+            offset += len(batch_labels)
+
+        logging.info(f"Read {offset} windows from {len(self.manifest['shards'])} shards in "
+                     f"'{self.shard_directory}' in {time.perf_counter() - start_time:.1f} s.")
+
+        return array_features[:offset], array_labels[:offset]
+
+
+def map_npz_array(npz_path: str, array_name: str) -> numpy.ndarray:
+    """
+    Returns a read-only memory map of an array stored uncompressed in an npz file, as written by `numpy.savez`.
+
+    Raises
+    ------
+    ValueError
+        If the array is compressed.
+    """
+    with zipfile.ZipFile(npz_path) as npz_file:
+        member = npz_file.getinfo(array_name + ".npy")
+
+    if member.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"Array '{array_name}' of '{npz_path}' is compressed and cannot be memory-mapped.")
+
+    with open(npz_path, 'rb') as npz_file:
+        # The data of the member follows its local header, whose name and extra field lengths end at byte 30
+        npz_file.seek(member.header_offset + 26)
+        name_length, extra_length = struct.unpack('<HH', npz_file.read(4))
+        npz_file.seek(member.header_offset + 30 + name_length + extra_length)
+
+        version = numpy.lib.format.read_magic(npz_file)
+        read_header = numpy.lib.format.read_array_header_1_0 if version == (1, 0) \
+            else numpy.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(npz_file)
+        offset = npz_file.tell()
+
+    if int(numpy.prod(shape)) == 0:
+        return numpy.zeros(shape, dtype=dtype)
+
+    return numpy.memmap(npz_path, dtype=dtype, mode='r', offset=offset, shape=shape,
+                        order='F' if fortran_order else 'C')
+
+
+class ShardedFeatures:
+    """
+    The features of the npz shards of a model, memory-mapped in place and gathered per batch.
+
+    Indexing a ShardedFeatures with an array of window indexes reads those windows from the mapped shards,
+    so the class balancing and the folds handle index arrays (see `IndexedBatches`) and only the batches in
+    flight are held in memory, instead of a copy of every shard. Only the labels are read up front.
+
+    Attributes
+    ----------
+    shard_directory : str
+        Directory of the shards of the model.
+    shard_size : int
+        Number of windows per shard (except the last one).
+    shard_features : list
+        Memory map of the features of each shard.
+    labels : numpy.ndarray
+        The int32 label of each window, in the order of the export.
+    """
+
+    def __init__(self, shard_directory: str):
+        """
+        Initializes the ShardedFeatures, mapping the features and reading the labels of every shard.
+
+        Parameters
+        ----------
+        shard_directory : str
+            Directory of the npz shards of the model.
+        """
+        manifest = ShardReader(shard_directory).manifest
+        list_shard_paths = [os.path.join(shard_directory, shard['file']) for shard in manifest['shards']]
+
+        self.shard_directory = shard_directory
+        self.shard_size = manifest['shard_size']
+        self.feature_shape = tuple(manifest['feature_shape'])
+        self.shard_features = [map_npz_array(shard_path, 'features') for shard_path in list_shard_paths]
+        self.labels = numpy.concatenate([map_npz_array(shard_path, 'labels') for shard_path in list_shard_paths])
+        self.labels = numpy.asarray(self.labels, dtype=numpy.int32)
+
+        logging.info(f"Mapped {len(self)} windows from {len(list_shard_paths)} shards in '{shard_directory}'.")
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def shape(self) -> tuple:
+        return (len(self),) + self.feature_shape
+
+    @property
+    def dtype(self) -> numpy.dtype:
+        return numpy.dtype(numpy.float32)
+
+    def __getitem__(self, window_indexes) -> numpy.ndarray:
+        """
+        Returns the features of the given windows, read from the mapped shards.
+        """
+        window_indexes = numpy.atleast_1d(numpy.asarray(window_indexes))
+
+        if window_indexes.dtype == bool:
+            window_indexes = numpy.flatnonzero(window_indexes)
+
+        shard_ids, positions = numpy.divmod(window_indexes, self.shard_size)
+        batch_features = numpy.empty((len(window_indexes),) + self.feature_shape, dtype=numpy.float32)
+
+        for shard_id in numpy.unique(shard_ids):
+            in_shard = shard_ids == shard_id
+            batch_features[in_shard] = self.shard_features[shard_id][positions[in_shard]]
+
+        return batch_features
+
+
+def load_model_features(model, load_function, dataset_directory: str, arguments) -> tuple:
+    """
+    Returns the features and labels of a model, read from its shards or extracted by its loader.
+
+    With --shard_directory the features are read from '<shard_directory>/<model_name>' after checking that
+    they were exported with the current feature parameters: npz shards are memory-mapped and gathered per
+    batch (see `ShardedFeatures`), TFRecord shards are read into one array. Otherwise they are extracted by the loader and,
+    with --shard_export_directory, exported to '<shard_export_directory>/<model_name>'.
+
+    Parameters
+    ----------
+    model : MetricsCalculator
+        Model with `model_name`, `get_feature_parameters` and `feature_memmap_directory`.
+    load_function : callable
+        Loader of the model, receiving the dataset directory.
+    dataset_directory : str
+        Directory containing one subdirectory per class.
+    arguments : argparse.Namespace
+        Command line arguments with the shard options.
+
+    Returns
+    -------
+    tuple
+        The feature array (or ShardedFeatures) and the label array.
+    """
+    if arguments.shard_directory:
+        shard_reader = ShardReader(os.path.join(arguments.shard_directory, model.model_name),
+                                   arguments.shard_cycle_length)
+        shard_reader.check_parameters(model.get_feature_parameters())
+
+        # TFRecord shards have no random access, they are read into one array through the interleaved pipeline
+        if shard_reader.manifest['format'] == "tfrecord":
+            return shard_reader.load_arrays(get_memmap_path(model.feature_memmap_directory, model.model_name))
+
+        sharded_features = ShardedFeatures(shard_reader.shard_directory)
+        return sharded_features, sharded_features.labels
+
+    features, labels = load_function(dataset_directory)
+
+    if arguments.shard_export_directory:
+        export_shards(features, labels, os.path.join(arguments.shard_export_directory, model.model_name),
+                      model.get_feature_parameters(), model.model_name, arguments.shard_size, arguments.shard_format)
+
+    return features, labels
+
+
+def check_shard_arguments(arguments) -> None:
+    """
+    Rejects the shard options that would be silently ignored.
+
+    Raises
+    ------
+    ValueError
+        If the features would be extracted without being exported, or if the streaming mode or the window
+        index mode, which do not assemble the features, is combined with the shards.
+    """
+    if arguments.shard_export_only and not arguments.shard_export_directory:
+        raise ValueError("--shard_export_only requires --shard_export_directory.")
+
+    if arguments.streaming_mode and arguments.shard_export_directory:
+        raise ValueError("--streaming_mode does not assemble the features, they cannot be exported with "
+                         "--shard_export_directory or --shard_export_only.")
+
+    # The features read from shards are not extracted again, so there is nothing to export
+    if arguments.shard_directory and arguments.shard_export_directory:
+        raise ValueError("--shard_directory reads exported features, it cannot be combined with "
+                         "--shard_export_directory or --shard_export_only.")
+
+    # The streaming mode extracts the features of the recordings while the model trains
+    if arguments.streaming_mode and arguments.shard_directory:
+        raise ValueError("--streaming_mode reads the recordings, it cannot train from the shards of "
+                         "--shard_directory.")
+
+    # The models with a window index gather their windows from the waveform store instead of their loader
+    if arguments.window_index_mode and (arguments.shard_export_directory or arguments.shard_directory):
+        raise ValueError("--window_index_mode reads the windows from the waveform store, it cannot be combined "
+                         "with --shard_directory, --shard_export_directory or --shard_export_only.")
+
+
+def get_sharded_dataset_args(parser):
+
+    parser.add_argument('--shard_directory', type=str,
+                        default=DEFAULT_SHARD_DIRECTORY, help='Directory of exported feature shards read instead of extracting the features')
+
+    parser.add_argument('--shard_export_directory', type=str,
+                        default=DEFAULT_SHARD_EXPORT_DIRECTORY, help='Directory where the features of every model are exported as shards')
+
+    parser.add_argument('--shard_export_only', action='store_true',
+                        default=DEFAULT_SHARD_EXPORT_ONLY, help='Export the feature shards without training the models')
+
+    parser.add_argument('--shard_size', type=int,
+                        default=DEFAULT_SHARD_SIZE, help='Number of windows per exported shard')
+
+    parser.add_argument('--shard_format', type=str, choices=SHARD_FORMATS,
+                        default=DEFAULT_SHARD_FORMAT, help='File format of the exported shards (npz or tfrecord)')
+
+    parser.add_argument('--shard_cycle_length', type=int,
+                        default=DEFAULT_SHARD_CYCLE_LENGTH, help='Number of shards read in parallel')
+
+    return parser
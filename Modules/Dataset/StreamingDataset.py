@@ -0,0 +1,433 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import glob
+    import numpy
+    import logging
+    import tensorflow
+
+    from sklearn.model_selection import StratifiedKFold
+    from sklearn.model_selection import train_test_split
+
+    from Modules.Dataset.WindowFraming import get_window_step
+    from Modules.Dataset.FeatureAssembler import log_peak_memory
+    from Modules.Dataset.FeatureAssembler import count_file_windows
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_STREAMING_MODE = False  # Features are materialized in RAM (or memory-mapped) unless streaming is enabled
+DEFAULT_INTERLEAVE_CYCLE_LENGTH = 4  # Number of files whose windows are interleaved at a time
+DEFAULT_SHUFFLE_BUFFER_SIZE = 1024  # Number of windows held by the training shuffle buffer
+DEFAULT_PREFETCH_BUFFER_SIZE = tensorflow.data.AUTOTUNE  # Number of batches prepared ahead of the model
+DEFAULT_TEST_SIZE = 0.2
+DEFAULT_RANDOM_STATE = 42
+
+
+def list_labeled_files(dataset_directory: str, file_extension: str) -> tuple:
+    """
+    Lists the audio files of every class directory of a dataset and their labels.
+
+    The label of a file is the number before the first underscore of its class directory name, as in the
+    model loaders.
+
+    Parameters
+    ----------
+    dataset_directory : str
+        Directory containing one subdirectory per class.
+    file_extension : str
+        Glob pattern of the audio files.
+
+    Returns
+    -------
+    tuple
+        The list of file paths and the list of integer labels.
+    """
+    list_files, list_labels = [], []
+
+    for class_dir in sorted(os.listdir(dataset_directory)):
+        class_path = os.path.join(dataset_directory, class_dir)
+
+        if not os.path.isdir(class_path):
+            continue
+
+        class_files = sorted(glob.glob(os.path.join(class_path, file_extension)))
+        list_files.extend(class_files)
+        list_labels.extend([int(class_dir.split('_')[0])] * len(class_files))
+
+    return list_files, list_labels
+
+
+def select_labeled_files(dataset_directory: str, file_extension: str, metadata_index=None,
+                         metadata_filters: list = None) -> tuple:
+    """
+    Returns the audio files of a dataset and their labels, from the metadata index when one is enabled.
+
+    The index resolves the files matching the filter expressions without listing the class directories;
+    otherwise every file of the class directories is returned, as by `list_labeled_files`.
+
+    Parameters
+    ----------
+    dataset_directory : str
+        Directory containing one subdirectory per class.
+    file_extension : str
+        Glob pattern of the audio files.
+    metadata_index : MetadataIndex, optional
+        Index of the dataset recordings.
+    metadata_filters : list, optional
+        Filter expressions applied to the index.
+
+    Returns
+    -------
+    tuple
+        The list of file paths and the list of integer labels.
+    """
+    if metadata_index is not None and metadata_index.enabled:
+        return metadata_index.select_files(metadata_filters)
+
+    return list_labeled_files(dataset_directory, file_extension)
+
+
+class StreamingDataset:
+    """
+    Builds tf.data pipelines that extract the features of the files while the model trains.
+
+    Each pipeline lists files, not windows: a parallel map stage loads the windows of each file (from the
+    waveform store, in the layout of the model input), an interleave stage mixes the windows of several
+    files, and the windows are shuffled, batched and prefetched. Only the files in flight, the shuffle
+    buffer and the prefetched batches are held in memory, whatever the size of the corpus.
+
+    Attributes
+    ----------
+    load_function : callable
+        Receives the path of a file and returns its windows, shaped (number_windows,) + window_shape.
+    window_shape : tuple
+        Shape of one window in the layout of the model input.
+    cycle_length : int
+        Number of files whose windows are interleaved at a time.
+    shuffle_buffer_size : int
+        Number of windows held by the training shuffle buffer.
+    prefetch_buffer_size : int
+        Number of batches prepared ahead of the model.
+    seed : int
+        Seed of the file and window shuffles and of the class sampling.
+    """
+
+    def __init__(self, load_function, window_shape: tuple, cycle_length: int = DEFAULT_INTERLEAVE_CYCLE_LENGTH,
+                 shuffle_buffer_size: int = DEFAULT_SHUFFLE_BUFFER_SIZE,
+                 prefetch_buffer_size: int = DEFAULT_PREFETCH_BUFFER_SIZE, seed: int = DEFAULT_RANDOM_STATE):
+        """
+        Initializes the StreamingDataset.
+
+        Parameters
+        ----------
+        load_function : callable
+            Receives the path of a file and returns its windows in the layout of the model input.
+        window_shape : tuple
+            Shape of one window in the layout of the model input.
+        cycle_length : int, optional
+            Number of files whose windows are interleaved at a time.
+        shuffle_buffer_size : int, optional
+            Number of windows held by the training shuffle buffer.
+        prefetch_buffer_size : int, optional
+            Number of batches prepared ahead of the model.
+        seed : int, optional
+            Seed of the shuffles and of the class sampling.
+        """
+        self.load_function = load_function
+        self.window_shape = tuple(window_shape)
+        self.cycle_length = max(1, cycle_length)
+        self.shuffle_buffer_size = shuffle_buffer_size
+        self.prefetch_buffer_size = prefetch_buffer_size
+        self.seed = seed
+
+    def _load_windows(self, file_name: bytes) -> numpy.ndarray:
+        """
+        Loads the windows of a file, returning no windows if the file cannot be read.
+        """
+        file_name = file_name.decode()
+
+        try:
+            windows = self.load_function(file_name)
+
+        except Exception as error:
+            logging.error(f"Error processing file {file_name}: {error}")
+            return numpy.zeros((0,) + self.window_shape, dtype=numpy.float32)
+
+        return numpy.asarray(windows, dtype=numpy.float32).reshape((-1,) + self.window_shape)
+
+    def _map_file(self, file_name, label):
+        """
+        Graph function of the map stage, loading the windows of one file and repeating its label.
+        """
+        windows = tensorflow.numpy_function(self._load_windows, [file_name], tensorflow.float32, stateful=False)
+        windows.set_shape((None,) + self.window_shape)
+
+        return windows, tensorflow.fill(tensorflow.shape(windows)[:1], label)
+
+    def get_file_dataset(self, list_files: list, list_labels: list, shuffle: bool = False,
+                         repeat: bool = False) -> tensorflow.data.Dataset:
+        """
+        Returns a dataset of the windows and labels of a list of files, extracted in a parallel map stage.
+
+        Parameters
+        ----------
+        list_files : list
+            Paths to the audio files.
+        list_labels : list
+            Integer label of each file.
+        shuffle : bool, optional
+            Whether the order of the files is shuffled (again at each pass).
+        repeat : bool, optional
+            Whether the files are repeated indefinitely.
+
+        Returns
+        -------
+        tensorflow.data.Dataset
+            Dataset of (window, label) pairs. Without shuffling, the windows follow the order of the files.
+        """
+        dataset = tensorflow.data.Dataset.from_tensor_slices((numpy.asarray(list_files, dtype=str),
+                                                              numpy.asarray(list_labels, dtype=numpy.int32)))
+
+        if shuffle:
+            dataset = dataset.shuffle(len(list_files), seed=self.seed, reshuffle_each_iteration=True)
+
+        if repeat:
+            dataset = dataset.repeat()
+
+        dataset = dataset.map(self._map_file, num_parallel_calls=tensorflow.data.AUTOTUNE, deterministic=True)
+
+        # Mix the windows of several files, keeping the file order when the cycle holds a single file
+        return dataset.interleave(lambda windows, labels: tensorflow.data.Dataset.from_tensor_slices(
+            (windows, labels)), cycle_length=self.cycle_length if shuffle else 1, deterministic=True)
+
+    def build_training_dataset(self, list_files: list, list_labels: list, list_window_counts: list,
+                               batch_size: int) -> tensorflow.data.Dataset:
+        """
+        Returns a class-balanced, shuffled, batched and prefetched training dataset.
+
+        The classes are balanced as the in-memory resampling does: each class is drawn with the same
+        probability from its own repeated stream of files, and an epoch holds as many windows as the
+        largest class times the number of classes, counted from the file headers.
+
+        Parameters
+        ----------
+        list_files : list
+            Paths to the audio files.
+        list_labels : list
+            Integer label of each file.
+        list_window_counts : list
+            Number of windows of each file.
+        batch_size : int
+            Number of windows per batch.
+
+        Returns
+        -------
+        tensorflow.data.Dataset
+            Dataset of (features, labels) batches.
+        """
+        list_files, list_labels = numpy.asarray(list_files), numpy.asarray(list_labels)
+        list_window_counts = numpy.asarray(list_window_counts)
+        unique_classes = numpy.unique(list_labels)
+
+        class_datasets = [self.get_file_dataset(list_files[list_labels == class_label],
+                                                list_labels[list_labels == class_label], shuffle=True, repeat=True)
+                          for class_label in unique_classes]
+        max_windows = max(int(list_window_counts[list_labels == class_label].sum()) for class_label in unique_classes)
+
+        dataset = tensorflow.data.Dataset.sample_from_datasets(class_datasets, seed=self.seed)
+        dataset = dataset.take(max_windows * len(unique_classes))
+        dataset = dataset.shuffle(self.shuffle_buffer_size, seed=self.seed, reshuffle_each_iteration=True)
+
+        return dataset.batch(batch_size).prefetch(self.prefetch_buffer_size)
+
+    def build_evaluation_dataset(self, list_files: list, list_labels: list, batch_size: int) -> tensorflow.data.Dataset:
+        """
+        Returns a batched and prefetched dataset of the windows of the files, in file order.
+        """
+        dataset = self.get_file_dataset(list_files, list_labels)
+
+        return dataset.batch(batch_size).prefetch(self.prefetch_buffer_size)
+
+
+class StreamingFiles:
+    """
+    Files of a streamed cross-validation, used by `train_fold` in place of a feature array.
+
+    The folds index the files instead of the windows, and each fold trains on a class-balanced stream of
+    its training files and is evaluated on the windows of its validation files.
+
+    Attributes
+    ----------
+    streaming_dataset : StreamingDataset
+        Builder of the pipelines.
+    list_files : numpy.ndarray
+        Paths to the audio files.
+    list_labels : numpy.ndarray
+        Integer label of each file.
+    list_window_counts : numpy.ndarray
+        Number of windows of each file.
+    """
+
+    def __init__(self, streaming_dataset: StreamingDataset, list_files, list_labels, list_window_counts):
+        self.streaming_dataset = streaming_dataset
+        self.list_files = numpy.asarray(list_files)
+        self.list_labels = numpy.asarray(list_labels)
+        self.list_window_counts = numpy.asarray(list_window_counts)
+
+    def __len__(self) -> int:
+        return len(self.list_files)
+
+    def get_fold_datasets(self, indexes_train: numpy.ndarray, indexes_val: numpy.ndarray, batch_size: int) -> tuple:
+        """
+        Returns the training and validation datasets of the files of a fold.
+        """
+        training_dataset = self.streaming_dataset.build_training_dataset(self.list_files[indexes_train],
+                                                                         self.list_labels[indexes_train],
+                                                                         self.list_window_counts[indexes_train],
+                                                                         batch_size)
+        validation_dataset = self.streaming_dataset.build_evaluation_dataset(self.list_files[indexes_val],
+                                                                             self.list_labels[indexes_val], batch_size)
+
+        return training_dataset, validation_dataset
+
+
+def probe_window_shape(list_files: list, load_function) -> tuple:
+    """
+    Returns the shape of one window in the layout of the model input, loading files until one has windows.
+    """
+    for file_name in list_files:
+
+        try:
+            windows = load_function(file_name)
+
+        except Exception as error:
+            logging.error(f"Error processing file {file_name}: {error}")
+            continue
+
+        if len(windows) > 0:
+            return tuple(windows.shape[1:])
+
+    raise ValueError("No file of the dataset has a complete window.")
+
+
+def predict_dataset(neural_network_model, dataset: tensorflow.data.Dataset) -> tuple:
+    """
+    Predicts every batch of a dataset in a single pass, returning the probabilities and the true labels.
+    """
+    list_probabilities, list_labels = [], []
+
+    for batch_features, batch_labels in dataset:
+        list_probabilities.append(numpy.asarray(neural_network_model.predict_on_batch(batch_features)))
+        list_labels.append(batch_labels.numpy())
+
+    if not list_probabilities:
+        return numpy.zeros((0, neural_network_model.output_shape[-1])), numpy.zeros((0,))
+
+    return numpy.concatenate(list_probabilities), numpy.concatenate(list_labels).astype(float)
+
+
+def train_streaming(model, dataset_directory: str, file_extension: str, parameter_arguments: tuple, arguments,
+                    build_arguments_function=None) -> tuple:
+    """
+    Cross-validates a model on tf.data pipelines instead of a materialized feature array.
+
+    The splits are made over files: 20% of the files are held out as the in-memory test split, the
+    others are divided by a stratified k-fold, and each fold trains on a class-balanced stream of its
+    training files and is evaluated on the windows of its validation files. Splitting by file also keeps
+    the windows of a recording on one side of each fold. The folds are trained by the fold executor of the
+    model, so they are seeded and journaled as the folds of the in-memory features; the streams cannot be
+    shared with worker processes, so they are always trained serially.
+
+    Parameters
+    ----------
+    model : MetricsCalculator
+        Model with a `load_file_windows` method, which returns the windows of a file in the layout of its
+        input, a `compile_and_train` method that accepts datasets, a `fold_executor`, and the framing
+        parameters (`sample_rate`, `window_size`, `overlap`, `last_window_policy` and `waveform_store`).
+    dataset_directory : str
+        Directory containing one subdirectory per class.
+    file_extension : str
+        Glob pattern of the audio files.
+    parameter_arguments : tuple
+        Arguments of the `set_parameters` method of the model.
+    arguments : argparse.Namespace
+        Command line arguments with the streaming buffer sizes.
+    build_arguments_function : callable, optional
+        Receives the window shape and returns the arguments of `build_model` (none if not given).
+
+    Returns
+    -------
+    tuple
+        The mean metrics, the training history, the mean confusion matrix and the predicted
+        probabilities along with the ground truth labels, as returned by the model `train` methods.
+    """
+    logging.info("Starting to stream data...")
+    log_peak_memory("before streaming the data")
+
+    list_files, list_labels = select_labeled_files(dataset_directory, file_extension, model.metadata_index,
+                                                   model.metadata_filters)
+    list_files, list_labels = numpy.asarray(list_files), numpy.asarray(list_labels)
+    logging.info(f"Found {len(list_files)} files in {len(numpy.unique(list_labels))} classes.")
+
+    window_shape = probe_window_shape(list_files, model.load_file_windows)
+    streaming_dataset = StreamingDataset(model.load_file_windows, window_shape, arguments.streaming_cycle_length,
+                                         arguments.streaming_shuffle_buffer, arguments.streaming_prefetch_buffer)
+
+    # Split the files into train/val and test sets
+    files_train_val, _, labels_train_val, _ = train_test_split(list_files, list_labels, test_size=DEFAULT_TEST_SIZE,
+                                                               stratify=list_labels, random_state=DEFAULT_RANDOM_STATE)
+
+    # Count the windows of each file from its length to size the balanced training epochs
+    step = get_window_step(model.window_size, model.overlap)
+    window_counts_train_val = numpy.array([count_file_windows(file_name, model.sample_rate, model.window_size, step,
+                                                              model.last_window_policy, model.waveform_store)
+                                           for file_name in files_train_val])
+    streaming_files = StreamingFiles(streaming_dataset, files_train_val, labels_train_val, window_counts_train_val)
+
+    # Stratified k-fold cross-validation on the training/validation files
+    instance_k_fold = StratifiedKFold(n_splits=model.number_splits, shuffle=True, random_state=DEFAULT_RANDOM_STATE)
+    list_folds = [(train_indexes, labels_train_val[train_indexes], val_indexes, labels_train_val[val_indexes])
+                  for train_indexes, val_indexes in instance_k_fold.split(files_train_val, labels_train_val)]
+
+    logging.info(f"Starting the training of model {model.model_name}.")
+    build_arguments = build_arguments_function(window_shape) if build_arguments_function is not None else ()
+    list_fold_results = model.fold_executor.run(model, streaming_files, list_folds, parameter_arguments,
+                                                build_arguments)
+
+    log_peak_memory("after streaming the data")
+
+    return model.aggregate_fold_results(list_fold_results)
+
+
+def get_streaming_dataset_args(parser):
+
+    parser.add_argument('--streaming_mode', action='store_true',
+                        default=DEFAULT_STREAMING_MODE, help='Stream the features through tf.data pipelines instead of loading them in memory')
+
+    parser.add_argument('--streaming_cycle_length', type=int,
+                        default=DEFAULT_INTERLEAVE_CYCLE_LENGTH, help='Number of files whose windows are interleaved at a time')
+
+    parser.add_argument('--streaming_shuffle_buffer', type=int,
+                        default=DEFAULT_SHUFFLE_BUFFER_SIZE, help='Number of windows held by the training shuffle buffer')
+
+    parser.add_argument('--streaming_prefetch_buffer', type=int,
+                        default=DEFAULT_PREFETCH_BUFFER_SIZE, help='Number of batches prefetched (-1 means autotuned)')
+
+    return parser
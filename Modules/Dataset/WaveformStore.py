@@ -0,0 +1,406 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import glob
+    import json
+    import numpy
+    import shutil
+    import logging
+    import tempfile
+    import functools
+
+    from collections import Counter
+    from Modules.Dataset.AudioDecoder import AudioDecoder
+    from Modules.Dataset.AudioDecoder import DECODE_NATIVE
+    from Modules.Dataset.AudioDecoder import DECODE_RESAMPLED
+    from Modules.Dataset.AudioDecoder import DECODE_CACHED
+    from Modules.Dataset.ParallelExtractor import ParallelExtractor
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_STORE_DIRECTORY = None  # A temporary directory is used (and removed after the run) if not set
+DEFAULT_FILE_EXTENSION = "*.wav"
+DEFAULT_WAVEFORM_FILE = "waveforms.f32"
+DEFAULT_INDEX_FILE = "waveforms_index.json"
+
+
+def list_audio_files(dataset_directory: str, file_extension: str = DEFAULT_FILE_EXTENSION) -> list:
+    """
+    Lists the audio files of every class directory of a dataset.
+
+    Parameters
+    ----------
+    dataset_directory : str
+        Directory containing one subdirectory per class.
+    file_extension : str, optional
+        Glob pattern of the audio files.
+
+    Returns
+    -------
+    list
+        Paths to the audio files.
+    """
+    list_files = []
+
+    for class_dir in sorted(os.listdir(dataset_directory)):
+        class_path = os.path.join(dataset_directory, class_dir)
+
+        if os.path.isdir(class_path):
+            list_files.extend(glob.glob(os.path.join(class_path, file_extension)))
+
+    return list_files
+
+
+class WaveformStore:
+    """
+    A decode-once store of resampled audio signals shared by every model of a run.
+
+    All signals are concatenated in a single float32 file that is memory-mapped read-only, and a JSON
+    index maps the absolute path of each audio file to its offset and length in samples. The store is
+    built once per run, so the corpus is decoded and resampled a single time, and the operating system
+    shares the mapped pages between the models (and the loader worker processes).
+
+    Files that are not in the store, or requests at a different sample rate, fall back to decoding the
+    file with the audio decoder, so the loaders can use the store unconditionally.
+
+    Attributes
+    ----------
+    store_directory : str
+        Directory holding the waveform file and its index.
+    sample_rate : int
+        Sample rate of the stored signals.
+    file_index : dict
+        Maps each absolute file path to [offset, length, file size, modification time]. Files that could not
+        be decoded have no offset and a length of zero.
+    waveforms : numpy.memmap
+        Read-only view of the concatenated signals.
+    audio_decoder : AudioDecoder
+        Decoder of the audio files, which selects the resampling backend.
+    """
+
+    def __init__(self, store_directory: str = DEFAULT_STORE_DIRECTORY, audio_decoder: AudioDecoder = None):
+        """
+        Initializes the WaveformStore, opening an existing store if the directory contains one.
+
+        Parameters
+        ----------
+        store_directory : str, optional
+            Directory holding the waveform file and its index. If None, the store is empty.
+        audio_decoder : AudioDecoder, optional
+            Decoder of the audio files (librosa defaults if not given).
+        """
+        self.store_directory = store_directory
+        self.audio_decoder = audio_decoder or AudioDecoder()
+        self.resampling_backend = None
+        self.sample_rate = None
+        self.file_index = {}
+        self.waveforms = None
+        self.is_temporary = False
+
+        if store_directory and os.path.exists(os.path.join(store_directory, DEFAULT_INDEX_FILE)):
+            self.open()
+
+    def __getstate__(self) -> dict:
+        # The loader workers map the waveform file again instead of receiving a copy of every signal
+        state = dict(self.__dict__, waveforms=None)
+        state['waveforms_shape'] = None if self.waveforms is None else self.waveforms.shape
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        waveforms_shape = state.pop('waveforms_shape', None)
+        self.__dict__.update(state)
+
+        if waveforms_shape is not None:
+            self.waveforms = numpy.memmap(os.path.join(self.store_directory, DEFAULT_WAVEFORM_FILE),
+                                          dtype=numpy.float32, mode='r', shape=waveforms_shape)
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate is not None
+
+    def open(self) -> None:
+        """
+        Memory-maps the waveform file and reads the index of the store.
+        """
+        with open(os.path.join(self.store_directory, DEFAULT_INDEX_FILE), 'r') as index_file:
+            index = json.load(index_file)
+
+        self.sample_rate = index['sample_rate']
+        self.resampling_backend = index.get('resampling_backend', self.audio_decoder.resampling_backend)
+        self.file_index = index['files']
+        self.waveforms = None
+
+        if index['number_samples'] > 0:
+            self.waveforms = numpy.memmap(os.path.join(self.store_directory, DEFAULT_WAVEFORM_FILE),
+                                          dtype=numpy.float32, mode='r', shape=(index['number_samples'],))
+
+        logging.info(f"Opened waveform store '{self.store_directory}' with {len(self.file_index)} files "
+                     f"({index['number_samples']} samples at {self.sample_rate} Hz).")
+
+    def is_valid(self, list_files: list, sample_rate: int) -> bool:
+        """
+        Checks whether the store holds every file, unchanged, at the given sample rate and with the same resampling.
+        """
+        if not self.enabled or self.sample_rate != sample_rate or len(list_files) != len(self.file_index):
+            return False
+
+        if self.resampling_backend != self.audio_decoder.resampling_backend:
+            return False
+
+        for file_name in list_files:
+            entry = self.file_index.get(os.path.abspath(file_name))
+            file_status = os.stat(file_name)
+
+            if entry is None or entry[2] != file_status.st_size or entry[3] != file_status.st_mtime_ns:
+                return False
+
+        return True
+
+    def build(self, list_files: list, sample_rate: int, parallel_extractor: ParallelExtractor = None) -> None:
+        """
+        Decodes every file once and writes the signals to the store, unless the existing store is still valid.
+
+        Parameters
+        ----------
+        list_files : list
+            Paths to the audio files.
+        sample_rate : int
+            Sample rate used to resample the signals.
+        parallel_extractor : ParallelExtractor, optional
+            Pool used to decode the files. Decoding is serial if not given.
+        """
+        if self.store_directory is None:
+            self.store_directory = tempfile.mkdtemp(prefix='waveform_store_')
+            self.is_temporary = True
+
+        if self.is_valid(list_files, sample_rate):
+            logging.info(f"Reusing waveform store '{self.store_directory}'.")
+            return
+
+        logging.info(f"Building waveform store '{self.store_directory}' with {len(list_files)} files...")
+        os.makedirs(self.store_directory, exist_ok=True)
+
+        parallel_extractor = parallel_extractor or ParallelExtractor()
+        decode_function = functools.partial(self.audio_decoder.decode, sample_rate=sample_rate)
+        decode_outcomes = Counter()
+        waveform_path = os.path.join(self.store_directory, DEFAULT_WAVEFORM_FILE)
+        file_index, number_samples = {}, 0
+
+        # Release the current mapping before the waveform file is replaced
+        self.waveforms = None
+
+        with open(waveform_path + ".tmp", 'wb') as waveform_file:
+
+            for file_name, result, error in parallel_extractor.imap(list_files, decode_function):
+                file_status = os.stat(file_name)
+
+                # A file that cannot be decoded is recorded as such, so the store stays valid until it changes
+                if error is not None:
+                    file_index[os.path.abspath(file_name)] = [None, 0, file_status.st_size, file_status.st_mtime_ns]
+                    continue
+
+                signal, outcome = result
+                decode_outcomes[outcome] += 1
+                signal = numpy.ascontiguousarray(signal, dtype=numpy.float32)
+                waveform_file.write(signal.tobytes())
+
+                file_index[os.path.abspath(file_name)] = [number_samples, len(signal),
+                                                          file_status.st_size, file_status.st_mtime_ns]
+                number_samples += len(signal)
+
+        os.replace(waveform_path + ".tmp", waveform_path)
+        self.log_decode_outcomes(decode_outcomes)
+
+        index = {'sample_rate': sample_rate, 'resampling_backend': self.audio_decoder.resampling_backend,
+                 'number_samples': number_samples, 'files': file_index}
+
+        with open(os.path.join(self.store_directory, DEFAULT_INDEX_FILE), 'w') as index_file:
+            json.dump(index, index_file)
+
+        self.open()
+
+    def update(self, list_files: list, sample_rate: int, parallel_extractor: ParallelExtractor = None) -> dict:
+        """
+        Decodes only the files that are new or changed since the store was built and appends their signals.
+
+        The signals of deleted or changed files are dropped from the index but stay in the waveform file
+        until they outweigh the live signals, when the store is rebuilt to compact it. A store that is empty
+        or at another sample rate is built from scratch.
+
+        Parameters
+        ----------
+        list_files : list
+            Paths to the audio files.
+        sample_rate : int
+            Sample rate used to resample the signals.
+        parallel_extractor : ParallelExtractor, optional
+            Pool used to decode the files. Decoding is serial if not given.
+
+        Returns
+        -------
+        dict
+            Number of 'decoded', 'dropped' and 'unchanged' files.
+        """
+        if (not self.enabled or self.sample_rate != sample_rate or self.waveforms is None
+                or self.resampling_backend != self.audio_decoder.resampling_backend):
+            self.build(list_files, sample_rate, parallel_extractor)
+            return {'decoded': len(self.file_index), 'dropped': 0, 'unchanged': 0}
+
+        current_paths = {os.path.abspath(file_name): file_name for file_name in list_files}
+        list_changed = []
+
+        for absolute_path, file_name in current_paths.items():
+            entry = self.file_index.get(absolute_path)
+            file_status = os.stat(file_name)
+
+            if entry is None or entry[2] != file_status.st_size or entry[3] != file_status.st_mtime_ns:
+                list_changed.append(file_name)
+
+        list_dropped = [absolute_path for absolute_path in self.file_index if absolute_path not in current_paths]
+        list_dropped += [os.path.abspath(file_name) for file_name in list_changed
+                         if os.path.abspath(file_name) in self.file_index]
+        number_unchanged = len(current_paths) - len(list_changed)
+
+        for absolute_path in list_dropped:
+            del self.file_index[absolute_path]
+
+        number_samples = len(self.waveforms)
+        live_samples = sum(entry[1] for entry in self.file_index.values())
+
+        # Compact the store when most of the waveform file belongs to dropped signals
+        if number_samples - live_samples > live_samples:
+            logging.info(f"Waveform store holds {number_samples - live_samples} dead samples, rebuilding it.")
+            self.file_index = {}
+            self.build(list_files, sample_rate, parallel_extractor)
+            return {'decoded': len(self.file_index), 'dropped': len(list_dropped), 'unchanged': 0}
+
+        logging.info(f"Appending {len(list_changed)} files to waveform store '{self.store_directory}' "
+                     f"({len(list_dropped)} dropped, {number_unchanged} unchanged)...")
+
+        parallel_extractor = parallel_extractor or ParallelExtractor()
+        decode_function = functools.partial(self.audio_decoder.decode, sample_rate=sample_rate)
+        decode_outcomes = Counter()
+
+        # Release the current mapping before the waveform file grows
+        self.waveforms = None
+
+        with open(os.path.join(self.store_directory, DEFAULT_WAVEFORM_FILE), 'ab') as waveform_file:
+
+            for file_name, result, error in parallel_extractor.imap(list_changed, decode_function):
+                file_status = os.stat(file_name)
+
+                if error is not None:
+                    self.file_index[os.path.abspath(file_name)] = [None, 0, file_status.st_size,
+                                                                   file_status.st_mtime_ns]
+                    continue
+
+                signal, outcome = result
+                decode_outcomes[outcome] += 1
+                signal = numpy.ascontiguousarray(signal, dtype=numpy.float32)
+                waveform_file.write(signal.tobytes())
+
+                self.file_index[os.path.abspath(file_name)] = [number_samples, len(signal),
+                                                               file_status.st_size, file_status.st_mtime_ns]
+                number_samples += len(signal)
+
+        self.log_decode_outcomes(decode_outcomes)
+
+        index = {'sample_rate': sample_rate, 'resampling_backend': self.audio_decoder.resampling_backend,
+                 'number_samples': number_samples, 'files': self.file_index}
+
+        with open(os.path.join(self.store_directory, DEFAULT_INDEX_FILE) + ".tmp", 'w') as index_file:
+            json.dump(index, index_file)
+
+        os.replace(os.path.join(self.store_directory, DEFAULT_INDEX_FILE) + ".tmp",
+                   os.path.join(self.store_directory, DEFAULT_INDEX_FILE))
+
+        self.open()
+
+        return {'decoded': len(list_changed), 'dropped': len(list_dropped), 'unchanged': number_unchanged}
+
+    def log_decode_outcomes(self, decode_outcomes: Counter) -> None:
+        """
+        Logs how many decoded files needed resampling and how many were read from the decode cache.
+        """
+        number_native = decode_outcomes[DECODE_NATIVE]
+        logging.info(f"Decoded {sum(decode_outcomes.values())} files: {decode_outcomes[DECODE_RESAMPLED]} resampled "
+                     f"with '{self.audio_decoder.resampling_backend}', {decode_outcomes[DECODE_CACHED]} read from "
+                     f"the decode cache and {number_native} already at the sample rate.")
+
+    def get_length(self, file_name: str, sample_rate: int):
+        """
+        Returns the number of samples of a stored signal, or None if the file is not in the store at this sample rate.
+        """
+        entry = self.file_index.get(os.path.abspath(file_name)) if sample_rate == self.sample_rate else None
+        return None if entry is None else entry[1]
+
+    def get_offset(self, file_name: str, sample_rate: int):
+        """
+        Returns the offset of a stored signal in the waveform file, or None if the file is not in the store at this sample rate.
+        """
+        entry = self.file_index.get(os.path.abspath(file_name)) if sample_rate == self.sample_rate else None
+        return None if entry is None else entry[0]
+
+    def load(self, file_name: str, sample_rate: int) -> numpy.ndarray:
+        """
+        Returns the signal of a file at the given sample rate.
+
+        Parameters
+        ----------
+        file_name : str
+            Path to the audio file.
+        sample_rate : int
+            Requested sample rate.
+
+        Returns
+        -------
+        numpy.ndarray
+            The stored signal (a read-only view of the mapped file), or the decoded signal if the file
+            is not in the store at this sample rate or could not be decoded when the store was built.
+        """
+        entry = self.file_index.get(os.path.abspath(file_name)) if sample_rate == self.sample_rate else None
+
+        # Files that could not be decoded are decoded again, so the loaders report their error
+        if entry is None or entry[0] is None:
+            return self.audio_decoder.load(file_name, sample_rate)
+
+        offset, length = entry[0], entry[1]
+
+        if length == 0:
+            return numpy.zeros(0, dtype=numpy.float32)
+
+        return numpy.asarray(self.waveforms[offset:offset + length])
+
+    def remove(self) -> None:
+        """
+        Removes the store from disk if it was created in a temporary directory.
+        """
+        self.waveforms = None
+
+        if self.is_temporary and self.store_directory:
+            shutil.rmtree(self.store_directory, ignore_errors=True)
+
+
+def get_waveform_store_args(parser):
+
+    parser.add_argument('--waveform_store_directory', type=str,
+                        default=DEFAULT_STORE_DIRECTORY, help='Directory of the decoded waveform store shared by the models (temporary if not set)')
+
+    return parser
@@ -0,0 +1,141 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import sys
+    import numpy
+
+    from numpy.lib.stride_tricks import sliding_window_view
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_LAST_WINDOW_POLICY = "drop"  # Policy applied to the trailing samples that do not fill a complete window
+LAST_WINDOW_POLICIES = ("drop", "pad", "reflect")
+
+
+def get_window_step(window_size: int, overlap: int) -> int:
+    """
+    Returns the distance in samples between the starts of consecutive windows.
+
+    Parameters
+    ----------
+    window_size : int
+        Number of samples of each window.
+    overlap : int
+        Overlap factor between consecutive windows (1 means no overlap, 2 means half a window, ...).
+
+    Returns
+    -------
+    int
+        Number of samples between the starts of consecutive windows.
+    """
+    return max(1, window_size // overlap)
+
+
+def get_number_windows(signal_length: int, window_size: int, step: int,
+                       last_window_policy: str = DEFAULT_LAST_WINDOW_POLICY) -> int:
+    """
+    Returns the number of windows `frame_signal` produces for a signal of the given length.
+
+    Parameters
+    ----------
+    signal_length : int
+        Number of samples of the signal.
+    window_size : int
+        Number of samples of each window.
+    step : int
+        Distance in samples between the starts of consecutive windows.
+    last_window_policy : str, optional
+        One of 'drop', 'pad' or 'reflect'.
+
+    Returns
+    -------
+    int
+        Number of windows.
+    """
+    number_windows = (signal_length - window_size) // step + 1 if signal_length >= window_size else 0
+    covered_samples = (number_windows - 1) * step + window_size if number_windows else 0
+
+    if last_window_policy != "drop" and covered_samples < signal_length:
+        number_windows += 1
+
+    return number_windows
+
+
+def frame_signal(signal: numpy.ndarray, window_size: int, step: int,
+                 last_window_policy: str = DEFAULT_LAST_WINDOW_POLICY) -> numpy.ndarray:
+    """
+    Frames a signal into a matrix of overlapping windows.
+
+    Windows start at 0, step, 2 * step, ... exactly as the former per-model `windows()` generators, and only
+    complete windows are kept. With the 'drop' policy the result is a zero-copy, read-only strided view of
+    the signal. The 'pad' and 'reflect' policies append one more window starting at the next step, which
+    holds the trailing samples not covered by any complete window, completed with zeros or with the
+    reflection of those samples. That window is only added when such trailing samples exist.
+
+    Parameters
+    ----------
+    signal : numpy.ndarray
+        One-dimensional audio signal.
+    window_size : int
+        Number of samples of each window.
+    step : int
+        Distance in samples between the starts of consecutive windows.
+    last_window_policy : str, optional
+        One of 'drop', 'pad' or 'reflect'.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (number_windows, window_size).
+
+    Raises
+    ------
+    ValueError
+        If the last window policy is unknown.
+    """
+    if last_window_policy not in LAST_WINDOW_POLICIES:
+        raise ValueError(f"Unknown last window policy '{last_window_policy}', "
+                         f"expected one of {', '.join(LAST_WINDOW_POLICIES)}.")
+
+    signal = numpy.asarray(signal)
+
+    if len(signal) >= window_size:
+        signal_windows = sliding_window_view(signal, window_size)[::step]
+    else:
+        signal_windows = numpy.empty((0, window_size), dtype=signal.dtype)
+
+    number_windows = len(signal_windows)
+    covered_samples = (number_windows - 1) * step + window_size if number_windows else 0
+
+    if last_window_policy == "drop" or covered_samples >= len(signal):
+        return signal_windows
+
+    # Complete the window holding the trailing samples that no complete window covers
+    last_window = signal[number_windows * step:]
+    padding_mode = "constant" if last_window_policy == "pad" else "reflect"
+    last_window = numpy.pad(last_window, (0, window_size - len(last_window)), mode=padding_mode)
+
+    return numpy.concatenate([signal_windows, last_window[numpy.newaxis, :]], axis=0)
+
+
+def get_window_framing_args(parser):
+
+    parser.add_argument('--last_window_policy', type=str, choices=LAST_WINDOW_POLICIES,
+                        default=DEFAULT_LAST_WINDOW_POLICY, help='Policy for the last partial window of each file (drop, pad or reflect)')
+
+    return parser
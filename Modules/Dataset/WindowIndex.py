@@ -0,0 +1,350 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import sys
+    import numpy
+    import logging
+    import tensorflow
+
+    from Modules.Dataset.WindowFraming import get_window_step
+    from Modules.Dataset.WindowFraming import get_number_windows
+    from Modules.Dataset.FeatureAssembler import log_peak_memory
+    from Modules.Dataset.StreamingDataset import select_labeled_files
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_WINDOW_INDEX_MODE = False  # Windows are copied into a feature array unless the window index is enabled
+DEFAULT_SHUFFLE_SEED = 0
+DEFAULT_DETECTION_CHUNK_SIZE = 4096  # Number of windows materialized at a time by the activity detector
+
+
+class WindowIndex:
+    """
+    An index of the windows of every file over the memory-mapped signals of the waveform store.
+
+    Each window is a (file_id, start) pair instead of a copy of its samples, so overlapping windows share
+    the samples of the store. Indexing a WindowIndex with an array of window indexes reads those windows
+    from the mapped signals and applies the window function of the model, materializing only one batch.
+
+    Attributes
+    ----------
+    waveform_store : WaveformStore
+        Store holding the signals of the indexed files.
+    sample_rate : int
+        Sample rate of the signals.
+    window_size : int
+        Number of samples of each window.
+    step : int
+        Distance in samples between the starts of consecutive windows.
+    last_window_policy : str
+        One of 'drop', 'pad' or 'reflect', as in `frame_signal`.
+    window_function : callable
+        Receives raw windows, shaped (number_windows, window_size), and returns the model features.
+    activity_detector : ActivityDetector
+        Detector of the active windows; the silent windows are left out of the index.
+    file_offsets : numpy.ndarray
+        Offset of the signal of each file in the store.
+    file_lengths : numpy.ndarray
+        Number of samples of each file.
+    window_files : numpy.ndarray
+        File id of each window.
+    window_starts : numpy.ndarray
+        Start of each window in the signal of its file.
+    """
+
+    def __init__(self, waveform_store, sample_rate: int, window_size: int, step: int, last_window_policy: str,
+                 window_function=None, activity_detector=None):
+        """
+        Initializes an empty WindowIndex.
+
+        Parameters
+        ----------
+        waveform_store : WaveformStore
+            Store holding the signals of the indexed files.
+        sample_rate : int
+            Sample rate of the signals.
+        window_size : int
+            Number of samples of each window.
+        step : int
+            Distance in samples between the starts of consecutive windows.
+        last_window_policy : str
+            One of 'drop', 'pad' or 'reflect'.
+        window_function : callable, optional
+            Receives raw windows and returns the model features (the raw windows by default).
+        activity_detector : ActivityDetector, optional
+            Detector of the active windows. Every window is indexed if not given.
+        """
+        self.waveform_store = waveform_store
+        self.sample_rate = sample_rate
+        self.window_size = window_size
+        self.step = step
+        self.last_window_policy = last_window_policy
+        self.window_function = window_function or (lambda signal_windows: signal_windows)
+        self.activity_detector = activity_detector
+        self.file_offsets = numpy.zeros(0, dtype=numpy.int64)
+        self.file_lengths = numpy.zeros(0, dtype=numpy.int64)
+        self.window_files = numpy.zeros(0, dtype=numpy.int32)
+        self.window_starts = numpy.zeros(0, dtype=numpy.int64)
+        self.window_shape = None
+
+    def build(self, list_files: list, list_labels: list) -> numpy.ndarray:
+        """
+        Indexes the windows of every file, decoding into the waveform store the files it does not hold yet.
+
+        Parameters
+        ----------
+        list_files : list
+            Paths to the audio files.
+        list_labels : list
+            Integer label of each file.
+
+        Returns
+        -------
+        numpy.ndarray
+            The int32 label of each window.
+        """
+        if any(self.waveform_store.get_length(file_name, self.sample_rate) is None for file_name in list_files):
+            logging.info("Waveform store does not hold every file, building it.")
+            self.waveform_store.build(list_files, self.sample_rate)
+
+        # Files that could not be decoded have no windows
+        self.file_offsets = numpy.array([self.waveform_store.get_offset(file_name, self.sample_rate) or 0
+                                         for file_name in list_files], dtype=numpy.int64)
+        self.file_lengths = numpy.array([self.waveform_store.get_length(file_name, self.sample_rate) or 0
+                                         for file_name in list_files], dtype=numpy.int64)
+
+        window_counts = numpy.array([get_number_windows(file_length, self.window_size, self.step,
+                                                        self.last_window_policy)
+                                     for file_length in self.file_lengths], dtype=numpy.int64)
+        self.window_files = numpy.repeat(numpy.arange(len(list_files), dtype=numpy.int32), window_counts)
+
+        # Position of each window within its file, times the step
+        first_windows = numpy.cumsum(window_counts) - window_counts
+        self.window_starts = (numpy.arange(len(self.window_files)) - first_windows[self.window_files]) * self.step
+        window_labels = numpy.repeat(numpy.asarray(list_labels, dtype=numpy.int32), window_counts)
+
+        # Leave the silent windows out of the index
+        if self.activity_detector is not None and self.activity_detector.enabled:
+            active_windows = self.detect_active_windows()
+            self.activity_detector.log_skipped_windows(len(active_windows), int(numpy.sum(active_windows)),
+                                                       "indexing")
+            self.window_files = self.window_files[active_windows]
+            self.window_starts = self.window_starts[active_windows]
+            window_labels = window_labels[active_windows]
+
+        self.window_shape = self.window_function(numpy.zeros((1, self.window_size), dtype=numpy.float32)).shape[1:]
+        logging.info(f"Indexed {len(self.window_files)} windows of {len(list_files)} files "
+                     f"({self.window_files.nbytes + self.window_starts.nbytes} bytes of index instead of "
+                     f"{len(self.window_files) * int(numpy.prod(self.window_shape)) * 4} bytes of features).")
+
+        return window_labels
+
+    def detect_active_windows(self, chunk_size: int = DEFAULT_DETECTION_CHUNK_SIZE) -> numpy.ndarray:
+        """
+        Returns the boolean mask of the indexed windows found active by the activity detector, materializing
+        `chunk_size` windows at a time.
+        """
+        active_windows = numpy.zeros(len(self.window_files), dtype=bool)
+
+        for chunk_start in range(0, len(self.window_files), chunk_size):
+            chunk_indexes = numpy.arange(chunk_start, min(chunk_start + chunk_size, len(self.window_files)))
+            active_windows[chunk_indexes] = self.activity_detector.detect(self.materialize(chunk_indexes))
+
+        return active_windows
+
+    def __len__(self) -> int:
+        return len(self.window_files)
+
+    @property
+    def shape(self) -> tuple:
+        return (len(self),) + tuple(self.window_shape)
+
+    def materialize(self, window_indexes: numpy.ndarray) -> numpy.ndarray:
+        """
+        Reads the raw samples of the given windows from the mapped signals.
+
+        Complete windows are gathered in a single indexing of the store; the trailing window of a file, kept
+        by the 'pad' and 'reflect' policies, is completed as `frame_signal` does.
+
+        Parameters
+        ----------
+        window_indexes : numpy.ndarray
+            Indexes of the windows.
+
+        Returns
+        -------
+        numpy.ndarray
+            Float32 array of shape (number_windows, window_size).
+        """
+        window_indexes = numpy.asarray(window_indexes)
+
+        if window_indexes.dtype == bool:
+            window_indexes = numpy.flatnonzero(window_indexes)
+
+        file_ids = self.window_files[window_indexes]
+        window_starts = self.window_starts[window_indexes]
+        is_complete = window_starts + self.window_size <= self.file_lengths[file_ids]
+
+        signal_windows = numpy.zeros((len(window_indexes), self.window_size), dtype=numpy.float32)
+        sample_positions = (self.file_offsets[file_ids] + window_starts)[is_complete, numpy.newaxis]
+        signal_windows[is_complete] = self.waveform_store.waveforms[sample_positions + numpy.arange(self.window_size)]
+
+        padding_mode = "constant" if self.last_window_policy == "pad" else "reflect"
+
+        for position in numpy.flatnonzero(~is_complete):
+            file_id, window_start = file_ids[position], window_starts[position]
+            signal_start = self.file_offsets[file_id] + window_start
+            last_window = numpy.asarray(self.waveform_store.waveforms[
+                                        signal_start:self.file_offsets[file_id] + self.file_lengths[file_id]])
+            signal_windows[position] = numpy.pad(last_window, (0, self.window_size - len(last_window)),
+                                                 mode=padding_mode)
+
+        return signal_windows
+
+    def __getitem__(self, window_indexes) -> numpy.ndarray:
+        """
+        Returns the model features of the given windows, materialized from the mapped signals.
+        """
+        window_indexes = numpy.atleast_1d(numpy.asarray(window_indexes))
+        return numpy.asarray(self.window_function(self.materialize(window_indexes)), dtype=numpy.float32)
+
+
+class IndexedBatches(tensorflow.keras.utils.PyDataset):
+    """
+    Keras dataset of the batches of a feature array, or of a WindowIndex, selected by an array of indexes.
+
+    The features of a batch are only gathered when Keras requests it, so class balancing and k-fold splits
+    handle index arrays and never copy the features.
+
+    Attributes
+    ----------
+    features : numpy.ndarray or WindowIndex
+        Features of every sample, indexed with arrays of indexes.
+    indexes : numpy.ndarray
+        Indexes of the samples of the dataset.
+    labels : numpy.ndarray
+        Label of each of those samples.
+    batch_size : int
+        Number of samples per batch.
+    shuffle : bool
+        Whether the samples are shuffled at the end of each epoch.
+    input_targets : bool
+        Whether the targets of each batch are its inputs instead of its labels.
+    """
+
+    def __init__(self, features, indexes: numpy.ndarray, labels: numpy.ndarray, batch_size: int,
+                 shuffle: bool = False, input_targets: bool = False, seed: int = DEFAULT_SHUFFLE_SEED):
+        """
+        Initializes the IndexedBatches.
+
+        Parameters
+        ----------
+        features : numpy.ndarray or WindowIndex
+            Features of every sample.
+        indexes : numpy.ndarray
+            Indexes of the samples of the dataset.
+        labels : numpy.ndarray
+            Label of each of those samples.
+        batch_size : int
+            Number of samples per batch.
+        shuffle : bool, optional
+            Whether the samples are shuffled before the first epoch and at the end of each epoch.
+        input_targets : bool, optional
+            Whether the targets of each batch are its inputs.
+        seed : int, optional
+            Seed of the shuffles.
+        """
+        super().__init__()
+        self.features = features
+        self.indexes = numpy.asarray(indexes)
+        self.labels = numpy.asarray(labels)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.input_targets = input_targets
+        self.seed = seed
+        self.random_generator = numpy.random.default_rng(seed)
+        self.order = numpy.arange(len(self.indexes))
+
+        if shuffle:
+            self.random_generator.shuffle(self.order)
+
+    def __len__(self) -> int:
+        return -(-len(self.indexes) // self.batch_size)
+
+    def __getitem__(self, batch_index: int) -> tuple:
+        batch_order = self.order[batch_index * self.batch_size:(batch_index + 1) * self.batch_size]
+        batch_features = self.features[self.indexes[batch_order]]
+
+        if self.input_targets:
+            return batch_features, batch_features
+
+        return batch_features, self.labels[batch_order]
+
+    def on_epoch_end(self) -> None:
+
+        if self.shuffle:
+            self.random_generator.shuffle(self.order)
+
+    def with_input_targets(self):
+        """
+        Returns the same batches with the inputs as targets, as used by self-supervised pretraining.
+        """
+        return IndexedBatches(self.features, self.indexes, self.labels, self.batch_size, self.shuffle,
+                              input_targets=True, seed=self.seed)
+
+
+def load_window_index(model, dataset_directory: str, window_function) -> tuple:
+    """
+    Indexes the windows of a dataset over the waveform store of a model, instead of loading its features.
+
+    Parameters
+    ----------
+    model : MetricsCalculator
+        Model with `waveform_store`, `sample_rate`, `window_size`, `overlap`, `last_window_policy`,
+        `file_extension` and `activity_detector`.
+    dataset_directory : str
+        Directory containing one subdirectory per class.
+    window_function : callable
+        Receives raw windows, shaped (number_windows, window_size), and returns the model features.
+
+    Returns
+    -------
+    tuple
+        The WindowIndex and the int32 label of each window.
+    """
+    logging.info("Starting to index the windows...")
+    log_peak_memory("before indexing the windows")
+
+    list_files, list_labels = select_labeled_files(dataset_directory, model.file_extension, model.metadata_index,
+                                                   model.metadata_filters)
+    window_index = WindowIndex(model.waveform_store, model.sample_rate, model.window_size,
+                               get_window_step(model.window_size, model.overlap), model.last_window_policy,
+                               window_function, model.activity_detector)
+    labels = window_index.build(list_files, list_labels)
+
+    log_peak_memory("after indexing the windows")
+
+    return window_index, labels
+
+
+def get_window_index_args(parser):
+
+    parser.add_argument('--window_index_mode', action='store_true',
+                        default=DEFAULT_WINDOW_INDEX_MODE, help='Index the windows of the waveform store instead of copying them into feature arrays (LSTM, MLP and Wav2Vec2)')
+
+    return parser
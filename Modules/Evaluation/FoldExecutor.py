@@ -0,0 +1,342 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import numpy
+    import shutil
+    import logging
+    import tempfile
+    import tensorflow
+    import multiprocessing
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    from Modules.Dataset.WindowIndex import IndexedBatches
+    from Modules.Dataset.BalancedSampler import balance_indexes
+    from Modules.Dataset.ShardedDataset import ShardedFeatures
+    from Modules.Dataset.StreamingDataset import StreamingFiles
+    from Modules.Dataset.StreamingDataset import predict_dataset
+    from Modules.Evaluation.FoldJournal import FoldJournal
+    from Modules.Evaluation.WorkerLogging import configure_worker_logging
+    from Modules.Evaluation.WorkerLogging import get_logging_configuration
+    from Modules.Dataset.FeatureQuantization import QuantizedFeatures
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_FOLD_WORKERS = 1  # Folds are trained one after another in the training process (1 means serial)
+DEFAULT_FOLD_SEED = 42  # Fold i is trained with the seed DEFAULT_FOLD_SEED + i, in the serial and parallel paths
+DEFAULT_SHARE_DIRECTORY = None  # Features held in RAM are shared through a temporary directory of the system
+
+# Model and features installed in each worker process by `_initialize_worker`
+_worker_model = None
+_worker_features = None
+
+
+def share_features(features, share_directory: str):
+    """
+    Returns a picklable reference to a feature array, which the worker processes open as a read-only memory map.
+
+    Memory-mapped .npy feature arrays are referenced by their path; arrays held in RAM are written once to
+    the share directory. Quantized features share their stored values and keep their scale and offset, and
+    memory-mapped shards are referenced by their directory.
+
+    Parameters
+    ----------
+    features : numpy.ndarray, QuantizedFeatures or ShardedFeatures
+        Features of the model.
+    share_directory : str
+        Directory where the arrays held in RAM are written.
+
+    Returns
+    -------
+    tuple
+        The reference of the features, or None if they cannot be shared (e.g. a WindowIndex).
+    """
+    if isinstance(features, QuantizedFeatures):
+        data_reference = share_features(features.data, share_directory)
+        return None if data_reference is None else ('quantized', data_reference, features.scale, features.offset)
+
+    # Shards are already on disk, the workers map them again
+    if isinstance(features, ShardedFeatures):
+        return 'shards', features.shard_directory
+
+    if not isinstance(features, numpy.ndarray):
+        return None
+
+    # The assembled feature arrays are leading slices of their memory-mapped .npy files
+    mapped_features = features
+
+    while isinstance(mapped_features.base, numpy.ndarray):
+        mapped_features = mapped_features.base
+
+    file_name = getattr(mapped_features, 'filename', None)
+
+    if (isinstance(mapped_features, numpy.memmap) and file_name and file_name.endswith(".npy")
+            and features.flags.c_contiguous and mapped_features.shape[1:] == features.shape[1:]
+            and numpy.byte_bounds(features)[0] == numpy.byte_bounds(mapped_features)[0]):
+        mapped_features.flush()
+        return 'npy', file_name, len(features)
+
+    file_name = os.path.join(share_directory, "features.{}.npy".format(len(os.listdir(share_directory))))
+    numpy.save(file_name, features)
+
+    return 'npy', file_name, len(features)
+
+
+def open_shared_features(reference: tuple):
+    """
+    Opens the features shared by `share_features` as a read-only memory map.
+    """
+    if reference[0] == 'quantized':
+        return QuantizedFeatures(open_shared_features(reference[1]), reference[2], reference[3])
+
+    if reference[0] == 'shards':
+        return ShardedFeatures(reference[1])
+
+    return numpy.load(reference[1], mmap_mode='r')[:reference[2]]
+
+
+def train_fold(model, features, fold_index: int, fold: tuple, build_arguments: tuple = (),
+               seed: int = DEFAULT_FOLD_SEED, fold_journal: FoldJournal = None) -> dict:
+    """
+    Trains and evaluates a model on one cross-validation fold.
+
+    The random state is seeded from the fold index before the model is built, so the weights, dropout masks
+    and batch order of a fold do not depend on the folds trained before it or on the process it runs in.
+    With an enabled journal, a fold completed by an earlier run is returned from the journal, an unfinished
+    one restarts from its last epoch backup, and the results of the fold are journaled once it completes.
+
+    Parameters
+    ----------
+    model : MetricsCalculator
+        Model with `build_model`, `compile_and_train`, `neural_network_model` and `size_batch`.
+    features : numpy.ndarray, QuantizedFeatures, WindowIndex or StreamingFiles
+        Features of the model, gathered per batch, or the files streamed by the fold.
+    fold_index : int
+        Index of the fold.
+    fold : tuple
+        Training indexes, training labels, validation indexes and validation labels of the fold (the indexes
+        and labels of files for StreamingFiles).
+    build_arguments : tuple, optional
+        Arguments of `build_model`.
+    seed : int, optional
+        Seed of the first fold.
+    fold_journal : FoldJournal, optional
+        Journal of the folds (see `FoldJournal`).
+
+    Returns
+    -------
+    dict
+        The validation probabilities and labels, the metrics, the confusion matrix and the training history.
+    """
+    indexes_train, labels_train, indexes_val, labels_val = fold
+    list_callbacks = None
+
+    if fold_journal is not None and fold_journal.enabled:
+        fold_result = fold_journal.open_fold(model.model_name, fold_index,
+                                             fold_journal.get_fold_key(model, fold_index, fold, seed))
+
+        if fold_result is not None:
+            return fold_result
+
+        list_callbacks = fold_journal.get_callbacks(model.model_name, fold_index)
+
+    tensorflow.keras.utils.set_random_seed(seed + fold_index)
+
+    if isinstance(features, StreamingFiles):
+        # The streams of the files balance the classes as they sample them
+        training_batches, validation_batches = features.get_fold_datasets(indexes_train, indexes_val,
+                                                                          model.size_batch)
+
+    else:
+        # Balance the training set for this fold
+        indexes_train, labels_train = balance_indexes(indexes_train, labels_train, features)
+
+        # Batches of the features gathered from the sample indexes
+        training_batches = IndexedBatches(features, indexes_train, labels_train, model.size_batch, shuffle=True)
+        validation_batches = IndexedBatches(features, indexes_val, labels_val, model.size_batch)
+
+    model.build_model(*build_arguments)
+    model.neural_network_model.summary()
+
+    history_model = model.compile_and_train(training_batches, None, epochs=model.number_epochs,
+                                            batch_size=model.size_batch, validation_data=validation_batches,
+                                            callbacks=list_callbacks)
+
+    if isinstance(features, StreamingFiles):
+        # The folds hold the labels of the files, the metrics are computed on the labels of their windows
+        model_predictions, labels_val = predict_dataset(model.neural_network_model, validation_batches)
+
+    else:
+        model_predictions = model.neural_network_model.predict(validation_batches)
+
+    predicted_labels = numpy.argmax(model_predictions, axis=1)
+
+    # Calculate the metrics for this fold
+    metrics, confusion_matrix = model.calculate_metrics(predicted_labels, labels_val, predicted_labels)
+
+    fold_result = {'probabilities': model_predictions, 'labels': labels_val, 'metrics': metrics,
+                   'confusion_matrix': confusion_matrix, 'history': history_model.history}
+
+    if list_callbacks is not None:
+        # A resumed fit only returns the epochs trained after the restored backup
+        fold_result['history'] = {**history_model.history, **list_callbacks[0].get_history()}
+        fold_journal.save_fold(model.model_name, fold_index, fold_result)
+
+    return fold_result
+
+
+def _initialize_worker(model_class, parameter_arguments: tuple, features_reference: tuple,
+                       intra_op_threads: int, inter_op_threads: int, logging_configuration: dict = None) -> None:
+    """
+    Installs the logging configuration of the training process and configures the TensorFlow thread pools of
+    a worker process, then builds its model from the training parameters and opens the shared features.
+    """
+    global _worker_model, _worker_features
+
+    configure_worker_logging(logging_configuration)
+
+    tensorflow.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    tensorflow.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+
+    _worker_model = model_class()
+    _worker_model.set_parameters(*parameter_arguments)
+    _worker_features = open_shared_features(features_reference)
+
+
+def _train_worker_fold(fold_task: tuple) -> dict:
+    fold_index, fold, build_arguments, seed, fold_journal = fold_task
+    return train_fold(_worker_model, _worker_features, fold_index, fold, build_arguments, seed, fold_journal)
+
+
+class FoldExecutor:
+    """
+    Trains the folds of a cross-validation, one after another or concurrently in worker processes.
+
+    Each worker process builds the model from the same training parameters as the training process and
+    reads the features through a read-only memory map, so they are not copied per worker. The CPU cores
+    are split between the workers through the TensorFlow intra-op thread pools, and the fold results are
+    gathered in fold order. Every fold is seeded from its index (see `train_fold`), so a fold gets the same
+    weights, batches and results whether the folds run serially or concurrently.
+
+    Attributes
+    ----------
+    number_workers : int
+        Number of worker processes. With one worker the folds are trained in the training process.
+    share_directory : str
+        Directory where features held in RAM are written to be shared with the workers.
+    seed : int
+        Seed of the first fold.
+    fold_journal : FoldJournal
+        Journal of the folds, used to resume interrupted runs.
+    """
+
+    def __init__(self, number_workers: int = DEFAULT_FOLD_WORKERS, share_directory: str = DEFAULT_SHARE_DIRECTORY,
+                 seed: int = DEFAULT_FOLD_SEED, fold_journal: FoldJournal = None):
+        """
+        Initializes the FoldExecutor.
+
+        Parameters
+        ----------
+        number_workers : int, optional
+            Number of worker processes. Values lower than one run every fold concurrently.
+        share_directory : str, optional
+            Directory where features held in RAM are written to be shared with the workers.
+        seed : int, optional
+            Seed of the first fold.
+        fold_journal : FoldJournal, optional
+            Journal of the folds. The folds are not journaled if None.
+        """
+        self.number_workers = number_workers
+        self.share_directory = share_directory
+        self.seed = seed
+        self.fold_journal = fold_journal or FoldJournal()
+
+    def get_number_workers(self, number_folds: int) -> int:
+        if self.number_workers is None or self.number_workers < 1:
+            return number_folds
+
+        return min(self.number_workers, number_folds)
+
+    def run(self, model, features, list_folds: list, parameter_arguments: tuple, build_arguments: tuple = ()) -> list:
+        """
+        Trains the model on every fold and returns the fold results in fold order.
+
+        Parameters
+        ----------
+        model : MetricsCalculator
+            Model trained by the serial path; the workers build their own instance of its class.
+        features : numpy.ndarray, QuantizedFeatures or WindowIndex
+            Features of the model.
+        list_folds : list
+            Training indexes, training labels, validation indexes and validation labels of each fold.
+        parameter_arguments : tuple
+            Arguments of the `set_parameters` method of the model, used by the workers.
+        build_arguments : tuple, optional
+            Arguments of `build_model`.
+
+        Returns
+        -------
+        list
+            Result of each fold (see `train_fold`).
+        """
+        number_workers = self.get_number_workers(len(list_folds))
+        share_directory = tempfile.mkdtemp(prefix="folds_", dir=self.share_directory) if number_workers > 1 else None
+
+        try:
+            features_reference = share_features(features, share_directory) if number_workers > 1 else None
+
+            if number_workers > 1 and features_reference is None:
+                logging.warning(f"Features of type {type(features).__name__} cannot be shared with worker processes, "
+                                f"training the folds serially.")
+
+            if features_reference is None:
+                return [train_fold(model, features, fold_index, fold, build_arguments, self.seed, self.fold_journal)
+                        for fold_index, fold in enumerate(list_folds)]
+
+            # Split the threads of this process (all the cores unless the model scheduler limited them)
+            number_threads = tensorflow.config.threading.get_intra_op_parallelism_threads() or os.cpu_count() or 1
+            intra_op_threads = max(1, number_threads // number_workers)
+            logging.info(f"Training {len(list_folds)} folds with {number_workers} worker processes "
+                         f"of {intra_op_threads} threads each.")
+
+            list_tasks = [(fold_index, fold, build_arguments, self.seed, self.fold_journal)
+                          for fold_index, fold in enumerate(list_folds)]
+
+            # Spawned workers start without the TensorFlow runtime of the training process, which cannot be forked
+            with ProcessPoolExecutor(max_workers=number_workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_initialize_worker,
+                                     initargs=(type(model), parameter_arguments, features_reference,
+                                               intra_op_threads, 1, get_logging_configuration())) as executor:
+                return list(executor.map(_train_worker_fold, list_tasks))
+
+        finally:
+            if share_directory is not None:
+                shutil.rmtree(share_directory, ignore_errors=True)
+
+
+def get_fold_executor_args(parser):
+
+    parser.add_argument('--fold_workers', type=int, default=DEFAULT_FOLD_WORKERS,
+                        help='Number of worker processes training the cross-validation folds concurrently (values lower than one train every fold at once)')
+
+    parser.add_argument('--fold_share_directory', type=str, default=DEFAULT_SHARE_DIRECTORY,
+                        help='Directory where in-memory features are written to be memory-mapped by the fold workers (system temporary directory if not set)')
+
+    return parser
@@ -0,0 +1,229 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import sys
+    import json
+    import numpy
+    import pickle
+    import shutil
+    import hashlib
+    import logging
+    import tempfile
+    import tensorflow
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_CHECKPOINT_FOLDS = False  # Folds are neither checkpointed nor journaled unless enabled (or resuming)
+DEFAULT_RESUME = False
+DEFAULT_JOURNAL_DIRECTORY = "Checkpoints"  # Subdirectory of the output directory holding the journal
+
+FOLD_KEY_FILE = "fold_key.txt"
+FOLD_RESULT_FILE = "fold_result.pkl"
+EPOCH_HISTORY_FILE = "epoch_history.json"
+BACKUP_DIRECTORY = "backup"
+
+
+def write_atomically(file_path: str, data: bytes) -> None:
+    """
+    Writes a file through a temporary file in the same directory, so that a crash never leaves it half written.
+    """
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix=".tmp")
+
+    try:
+        with os.fdopen(file_descriptor, 'wb') as temporary_file:
+            temporary_file.write(data)
+
+        os.replace(temporary_path, file_path)
+
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+class EpochHistory(tensorflow.keras.callbacks.Callback):
+    """
+    Records the logs of every finished epoch of a fold, so that the history of a fold resumed from its last
+    checkpoint still holds the epochs trained before the interruption.
+    """
+
+    def __init__(self, history_path: str):
+        super().__init__()
+        self.history_path = history_path
+        self.epoch_logs = {}
+
+        if os.path.exists(history_path):
+            with open(history_path) as history_file:
+                self.epoch_logs = {int(epoch): logs for epoch, logs in json.load(history_file).items()}
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.epoch_logs[epoch] = {name: float(value) for name, value in (logs or {}).items()}
+        write_atomically(self.history_path, json.dumps(self.epoch_logs).encode('utf-8'))
+
+    def get_history(self) -> dict:
+        """
+        Returns the recorded epochs in the format of `History.history`.
+        """
+        history = {}
+
+        for epoch in sorted(self.epoch_logs):
+
+            for name, value in self.epoch_logs[epoch].items():
+                history.setdefault(name, []).append(value)
+
+        return history
+
+
+class FoldJournal:
+    """
+    Journal of the cross-validation folds of each model under the output directory.
+
+    Every fold gets a directory `<journal_directory>/<model_name>/fold_<index>` holding a per-epoch backup of
+    the model and optimizer (`tensorflow.keras.callbacks.BackupAndRestore`), the logs of its finished epochs
+    and, once it completes, its results (validation probabilities and labels, metrics, confusion matrix and
+    history). A fold is identified by a key derived from the feature parameters of the model, its training
+    parameters and its sample indexes, so a journal entry is only reused by the same fold of the same setup.
+
+    When resuming, the completed folds are read from the journal instead of being trained again and the
+    unfinished ones restart from their last epoch backup. Otherwise the entries of a fold are cleared before
+    it is trained.
+
+    Attributes
+    ----------
+    journal_directory : str
+        Directory of the journal (disabled if None).
+    resume : bool
+        Whether completed folds and epoch backups of an earlier run are reused.
+    """
+
+    def __init__(self, journal_directory: str = None, resume: bool = DEFAULT_RESUME):
+        """
+        Initializes the FoldJournal.
+
+        Parameters
+        ----------
+        journal_directory : str, optional
+            Directory of the journal. The folds are not journaled if None.
+        resume : bool, optional
+            Whether completed folds and epoch backups of an earlier run are reused.
+        """
+        self.journal_directory = journal_directory
+        self.resume = resume
+
+    @classmethod
+    def from_arguments(cls, arguments):
+        """
+        Returns the journal of the run under its output directory, enabled by checkpointing or resuming.
+        """
+        if not (arguments.checkpoint_folds or arguments.resume):
+            return cls()
+
+        return cls(os.path.join(arguments.output_directory, DEFAULT_JOURNAL_DIRECTORY), arguments.resume)
+
+    @property
+    def enabled(self) -> bool:
+        return self.journal_directory is not None
+
+    def get_fold_directory(self, model_name: str, fold_index: int) -> str:
+        return os.path.join(self.journal_directory, model_name, f"fold_{fold_index}")
+
+    @staticmethod
+    def get_fold_key(model, fold_index: int, fold: tuple, seed: int) -> str:
+        """
+        Returns the key identifying a fold: the feature and training parameters (including the training
+        schedule) of the model and the samples of the fold.
+        """
+        key_hash = hashlib.sha1(json.dumps({'model_name': model.model_name,
+                                            'feature_parameters': model.get_feature_parameters(),
+                                            'number_epochs': model.number_epochs,
+                                            'batch_size': model.size_batch,
+                                            'training_schedule': vars(model.training_schedule),
+                                            'precision': model.precision,
+                                            'fold_index': fold_index,
+                                            'seed': seed}, sort_keys=True, default=str).encode('utf-8'))
+
+        for fold_array in fold:
+            key_hash.update(numpy.ascontiguousarray(fold_array).tobytes())
+
+        return key_hash.hexdigest()
+
+    def open_fold(self, model_name: str, fold_index: int, fold_key: str):
+        """
+        Prepares the directory of a fold and returns its stored results if the fold was completed for the
+        same key and the run is resuming, else None.
+        """
+        fold_directory = self.get_fold_directory(model_name, fold_index)
+        key_path = os.path.join(fold_directory, FOLD_KEY_FILE)
+        stored_key = None
+
+        if os.path.exists(key_path):
+            with open(key_path) as key_file:
+                stored_key = key_file.read().strip()
+
+        # Entries of another setup, or of an earlier run when not resuming, must not be restored
+        if not self.resume or stored_key != fold_key:
+
+            if stored_key is not None:
+                logging.info(f"Clearing the journal of {model_name} fold {fold_index}.")
+
+            shutil.rmtree(fold_directory, ignore_errors=True)
+
+        os.makedirs(fold_directory, exist_ok=True)
+        write_atomically(key_path, fold_key.encode('utf-8'))
+
+        result_path = os.path.join(fold_directory, FOLD_RESULT_FILE)
+
+        if not os.path.exists(result_path):
+            return None
+
+        with open(result_path, 'rb') as result_file:
+            logging.info(f"Resuming: {model_name} fold {fold_index} was already completed.")
+            return pickle.load(result_file)
+
+    def get_callbacks(self, model_name: str, fold_index: int) -> list:
+        """
+        Returns the callbacks recording the epochs of a fold and backing up its model after every epoch.
+        """
+        fold_directory = self.get_fold_directory(model_name, fold_index)
+        backup_directory = os.path.join(fold_directory, BACKUP_DIRECTORY)
+
+        if os.path.isdir(backup_directory):
+            logging.info(f"Resuming: {model_name} fold {fold_index} restarts from its last epoch backup.")
+
+        return [EpochHistory(os.path.join(fold_directory, EPOCH_HISTORY_FILE)),
+                tensorflow.keras.callbacks.BackupAndRestore(backup_directory, save_freq='epoch',
+                                                            delete_checkpoint=True)]
+
+    def save_fold(self, model_name: str, fold_index: int, fold_result: dict) -> None:
+        """
+        Stores the results of a completed fold.
+        """
+        write_atomically(os.path.join(self.get_fold_directory(model_name, fold_index), FOLD_RESULT_FILE),
+                         pickle.dumps(fold_result, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def get_fold_journal_args(parser):
+
+    parser.add_argument('--checkpoint_folds', action='store_true', default=DEFAULT_CHECKPOINT_FOLDS,
+                        help='Back up the models after every epoch and journal the results of every fold under the output directory')
+
+    parser.add_argument('--resume', action='store_true', default=DEFAULT_RESUME,
+                        help='Skip the folds completed by an earlier run and restart the unfinished ones from their last epoch backup (implies --checkpoint_folds)')
+
+    return parser
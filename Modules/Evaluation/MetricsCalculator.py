@@ -10,6 +10,7 @@ __credits__ = ['unknown']
 
 try:
     import sys
+    import numpy
 
     from typing import List
     from typing import Dict
@@ -149,3 +150,50 @@ class MetricsCalculator:
         confusion_matrix_result = self.calculate_confusion_matrix(label_true, label_predicted)
 
         return metrics, confusion_matrix_result
+
+    def aggregate_fold_results(self, list_fold_results: List[dict]) -> tuple:
+        """
+        Aggregate the results of the cross-validation folds, as returned by the `train` methods of the models.
+
+        Parameters:
+        list_fold_results (List[dict]): Result of each fold, with its probabilities, labels, metrics,
+            confusion matrix and history (see `train_fold`).
+
+        Returns:
+        tuple: The mean metrics, the training history of the last fold, the mean confusion matrix and the
+            predicted probabilities along with the ground truth labels.
+        """
+
+        metrics_list = [fold_result['metrics'] for fold_result in list_fold_results]
+
+        # Calculate mean metrics across all folds
+        mean_metrics = {
+            'model_name': self.model_name,
+            'Acc.': {'value': numpy.mean([metric['Accuracy'] for metric in metrics_list]),
+                     'std': numpy.std([metric['Accuracy'] for metric in metrics_list])},
+            'Prec.': {'value': numpy.mean([metric['Precision'] for metric in metrics_list]),
+                      'std': numpy.std([metric['Precision'] for metric in metrics_list])},
+            'Rec.': {'value': numpy.mean([metric['Recall'] for metric in metrics_list]),
+                     'std': numpy.std([metric['Recall'] for metric in metrics_list])},
+            'F1.': {'value': numpy.mean([metric['F1-Score'] for metric in metrics_list]),
+                    'std': numpy.std([metric['F1-Score'] for metric in metrics_list])},
+        }
+
+        probabilities_predicted = {
+            'model_name': self.model_name,
+            'predicted': numpy.concatenate([fold_result['probabilities'] for fold_result in list_fold_results]),
+            'ground_truth': numpy.concatenate([fold_result['labels'] for fold_result in list_fold_results])
+        }
+
+        confusion_matrix_array = numpy.array([fold_result['confusion_matrix'] for fold_result in list_fold_results])
+        mean_confusion_matrix = numpy.mean(confusion_matrix_array, axis=0)
+        mean_confusion_matrix = numpy.round(mean_confusion_matrix).astype(numpy.int32).tolist()
+
+        mean_confusion_matrices = {
+            "confusion_matrix": mean_confusion_matrix,
+            "class_names": ['Class {}'.format(i) for i in range(self.number_classes)],
+            "title": self.model_name
+        }
+
+        return (mean_metrics, {"Name": self.model_name, "History": list_fold_results[-1]['history']},
+                mean_confusion_matrices, probabilities_predicted)
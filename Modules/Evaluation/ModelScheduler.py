@@ -0,0 +1,305 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import os
+    import gc
+    import sys
+    import logging
+    import tensorflow
+    import multiprocessing
+
+    from concurrent.futures import wait
+    from concurrent.futures import FIRST_COMPLETED
+    from concurrent.futures import ProcessPoolExecutor
+
+    from Modules.Evaluation.WorkerLogging import configure_worker_logging
+    from Modules.Evaluation.WorkerLogging import get_logging_configuration
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_MODEL_WORKERS = 1  # Models are trained one after another in the main process (1 means serial)
+DEFAULT_SCHEDULER_THREADS = None  # CPU threads shared by the concurrent trainings (all the cores if not set)
+DEFAULT_SCHEDULER_MEMORY = None  # Memory in GiB shared by the concurrent trainings (the physical memory if not set)
+DEFAULT_MODEL_COST = 4.0  # Relative cost of a model without an estimate
+
+# Relative training cost of each model class, used to order the jobs and to split the CPU threads
+DEFAULT_MODEL_COSTS = {'AudioAST': 8.0, 'Conformer': 6.0, 'AudioWav2Vec2': 6.0, 'ResidualModel': 3.0,
+                       'AudioLSTM': 2.0, 'AudioDense': 1.0}
+
+# Estimated peak memory in GiB of the training of each model class, with the default parameters
+DEFAULT_MODEL_MEMORY = {'AudioAST': 6.0, 'Conformer': 4.0, 'AudioWav2Vec2': 4.0, 'ResidualModel': 3.0,
+                        'AudioLSTM': 2.0, 'AudioDense': 1.0}
+
+
+def get_physical_memory() -> float:
+    """
+    Returns the physical memory of the machine in GiB, or 0 if it cannot be read.
+    """
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1 << 30)
+
+    except (ValueError, OSError, AttributeError):
+        return 0.0
+
+
+def parse_model_budgets(list_budgets: list) -> dict:
+    """
+    Parses the 'ModelClass=value' items of a budget argument into a dictionary of floats.
+
+    Raises
+    ------
+    ValueError
+        If an item is not of the form 'ModelClass=value'.
+    """
+    model_budgets = {}
+
+    for budget in list_budgets or []:
+        model_name, separator, value = budget.partition('=')
+
+        if not separator or not model_name:
+            raise ValueError(f"Invalid model budget '{budget}', expected 'ModelClass=value'.")
+
+        model_budgets[model_name.strip()] = float(value)
+
+    return model_budgets
+
+
+def _configure_threads(number_threads: int, logging_configuration: dict = None) -> None:
+    """
+    Limits the TensorFlow thread pools of a training process to its thread budget and installs the logging
+    configuration of the main process.
+    """
+    configure_worker_logging(logging_configuration)
+    tensorflow.config.threading.set_intra_op_parallelism_threads(number_threads)
+    tensorflow.config.threading.set_inter_op_parallelism_threads(min(2, number_threads))
+
+
+class ModelJob:
+    """
+    Training of one model class with its resource budget.
+
+    Attributes
+    ----------
+    index : int
+        Position of the model in the list of models.
+    model_class : type
+        Class of the model.
+    cost : float
+        Relative training cost, the most expensive jobs are started first.
+    threads : int
+        CPU threads of the training process.
+    memory : float
+        Estimated peak memory of the training in GiB.
+    """
+
+    def __init__(self, index: int, model_class, cost: float, threads: int, memory: float):
+        self.index = index
+        self.model_class = model_class
+        self.cost = cost
+        self.threads = threads
+        self.memory = memory
+
+    @property
+    def name(self) -> str:
+        return self.model_class.__name__
+
+
+class ModelScheduler:
+    """
+    Trains several models concurrently, each in its own worker process, within a budget of CPU threads and memory.
+
+    Every model gets a thread budget and a memory estimate (given per model class or taken from the default
+    estimates). The jobs are ordered by decreasing cost and a job is started as soon as its threads and memory
+    fit in what the running jobs leave free, so the small models fill the cores left by the large ones. A job
+    larger than the whole budget is started alone. The results are yielded as each model finishes, and a model
+    whose training raises or whose process dies is logged and skipped without stopping the others.
+
+    With one worker the models are trained one after another in the current process, as before.
+
+    Attributes
+    ----------
+    number_workers : int
+        Maximum number of models trained concurrently.
+    total_threads : int
+        CPU threads shared by the concurrent trainings.
+    total_memory : float
+        Memory in GiB shared by the concurrent trainings (not checked if 0).
+    model_threads : dict
+        Thread budget of each model class name.
+    model_memory : dict
+        Memory budget in GiB of each model class name.
+    failed_models : list
+        Names of the models whose training failed in the last run.
+    """
+
+    def __init__(self, number_workers: int = DEFAULT_MODEL_WORKERS, total_threads: int = DEFAULT_SCHEDULER_THREADS,
+                 total_memory: float = DEFAULT_SCHEDULER_MEMORY, model_threads: dict = None,
+                 model_memory: dict = None):
+        """
+        Initializes the ModelScheduler.
+
+        Parameters
+        ----------
+        number_workers : int, optional
+            Maximum number of models trained concurrently. Values lower than one train every model at once.
+        total_threads : int, optional
+            CPU threads shared by the concurrent trainings, all the cores if None.
+        total_memory : float, optional
+            Memory in GiB shared by the concurrent trainings, the physical memory if None.
+        model_threads : dict, optional
+            Thread budget of each model class name. The models without a budget share the threads by cost.
+        model_memory : dict, optional
+            Memory budget in GiB of each model class name. Defaults to `DEFAULT_MODEL_MEMORY`.
+        """
+        self.number_workers = number_workers
+        self.total_threads = total_threads or os.cpu_count() or 1
+        self.total_memory = get_physical_memory() if total_memory is None else total_memory
+        self.model_threads = model_threads or {}
+        self.model_memory = model_memory or {}
+        self.failed_models = []
+
+    def create_jobs(self, models: list) -> list:
+        """
+        Returns the jobs of the models with their budgets, ordered by decreasing cost.
+        """
+        list_costs = [DEFAULT_MODEL_COSTS.get(model_class.__name__, DEFAULT_MODEL_COST) for model_class in models]
+        list_jobs = []
+
+        for index, (model_class, cost) in enumerate(zip(models, list_costs)):
+            model_name = model_class.__name__
+            threads = self.model_threads.get(model_name, self.total_threads * cost / sum(list_costs))
+            memory = self.model_memory.get(model_name, DEFAULT_MODEL_MEMORY.get(model_name, 0.0))
+            list_jobs.append(ModelJob(index, model_class, cost, max(1, int(threads)), memory))
+
+        return sorted(list_jobs, key=lambda job: (-job.cost, job.index))
+
+    def run(self, models: list, train_function, train_arguments: dict):
+        """
+        Trains the models and yields their results as each one finishes.
+
+        Parameters
+        ----------
+        models : list
+            Classes of the models.
+        train_function : callable
+            Function called as `train_function(model_class=..., **train_arguments)` that trains a model and
+            returns its results. It is called in the worker processes, so it must be picklable.
+        train_arguments : dict
+            Keyword arguments of the training function.
+
+        Yields
+        ------
+        tuple
+            Index of the model in `models`, class of the model and results of the training function.
+        """
+        self.failed_models = []
+        number_workers = len(models) if self.number_workers is None or self.number_workers < 1 \
+            else min(self.number_workers, len(models))
+
+        if number_workers <= 1:
+
+            for index, model_class in enumerate(models):
+
+                try:
+                    yield index, model_class, train_function(model_class=model_class, **train_arguments)
+
+                except Exception as e:
+                    logging.error(f"Training of model {model_class.__name__} failed, continuing with the other "
+                                  f"models: {e}")
+                    self.failed_models.append(model_class.__name__)
+
+            return
+
+        yield from self.run_concurrently(self.create_jobs(models), number_workers, train_function, train_arguments)
+
+    def run_concurrently(self, list_jobs: list, number_workers: int, train_function, train_arguments: dict):
+        """
+        Packs the jobs into the thread and memory budget and trains each one in its own spawned process.
+        """
+        pending_jobs = list(list_jobs)
+        running_jobs = {}
+        free_threads, free_memory = self.total_threads, self.total_memory
+        logging_configuration = get_logging_configuration()
+
+        while pending_jobs or running_jobs:
+
+            # Start the most expensive pending jobs that fit in the free resources
+            for job in list(pending_jobs):
+
+                if len(running_jobs) >= number_workers:
+                    break
+
+                fits_budget = job.threads <= free_threads and (not self.total_memory or job.memory <= free_memory)
+
+                if not fits_budget and running_jobs:
+                    continue
+
+                # Spawned processes start without the TensorFlow runtime of this process, which cannot be forked
+                executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'),
+                                               initializer=_configure_threads,
+                                               initargs=(job.threads, logging_configuration))
+                future = executor.submit(train_function, model_class=job.model_class, **train_arguments)
+                running_jobs[future] = (job, executor)
+
+                pending_jobs.remove(job)
+                free_threads -= job.threads
+                free_memory -= job.memory
+                logging.info(f"Started training of model {job.name} with {job.threads} threads and an estimated "
+                             f"{job.memory:.1f} GiB ({len(running_jobs)} running, {len(pending_jobs)} pending).")
+
+            finished_futures, _ = wait(running_jobs, return_when=FIRST_COMPLETED)
+
+            for future in finished_futures:
+                job, executor = running_jobs.pop(future)
+                free_threads += job.threads
+                free_memory += job.memory
+                executor.shutdown()
+
+                try:
+                    results = future.result()
+
+                except Exception as e:
+                    # A crashed worker raises BrokenProcessPool here, which only affects its own job
+                    logging.error(f"Training of model {job.name} failed, continuing with the other models: {e}")
+                    self.failed_models.append(job.name)
+                    continue
+
+                finally:
+                    gc.collect()
+
+                yield job.index, job.model_class, results
+
+
+def get_model_scheduler_args(parser):
+
+    parser.add_argument('--model_workers', type=int, default=DEFAULT_MODEL_WORKERS,
+                        help='Maximum number of models trained concurrently in worker processes (values lower than one train every model at once)')
+
+    parser.add_argument('--scheduler_threads', type=int, default=DEFAULT_SCHEDULER_THREADS,
+                        help='CPU threads shared by the concurrent model trainings (all the cores if not set)')
+
+    parser.add_argument('--scheduler_memory', type=float, default=DEFAULT_SCHEDULER_MEMORY,
+                        help='Memory in GiB shared by the concurrent model trainings (physical memory if not set, 0 disables the check)')
+
+    parser.add_argument('--model_thread_budget', type=str, nargs='*', default=[],
+                        help='CPU threads of a model training, as ModelClass=threads items (e.g. AudioAST=8)')
+
+    parser.add_argument('--model_memory_budget', type=str, nargs='*', default=[],
+                        help='Estimated peak memory of a model training, as ModelClass=GiB items (e.g. AudioAST=6)')
+
+    return parser
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import sys
+    import logging
+    import tensorflow
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+PRECISIONS = ["float32", "mixed_bfloat16"]
+DEFAULT_PRECISION = "float32"
+
+# Dtype of the output layers, so that the probabilities and the losses are computed in float32 whatever the policy
+OUTPUT_DTYPE = "float32"
+
+# CPU flags of the native bfloat16 instructions (AVX512-BF16 and AMX)
+BFLOAT16_CPU_FLAGS = ("avx512_bf16", "amx_bf16")
+
+# Whether the missing CPU support has already been reported by this process
+_bfloat16_warning_logged = False
+
+
+def has_bfloat16_support() -> bool:
+    """
+    Returns whether the CPU has native bfloat16 instructions, read from the flags of /proc/cpuinfo (Linux only).
+    """
+    try:
+        with open("/proc/cpuinfo") as cpu_information:
+            cpu_flags = set(cpu_information.read().split())
+
+    except OSError:
+        return False
+
+    return any(flag in cpu_flags for flag in BFLOAT16_CPU_FLAGS)
+
+
+def apply_precision_policy(precision: str = DEFAULT_PRECISION) -> None:
+    """
+    Sets the Keras global dtype policy used by the layers built afterwards.
+
+    With 'mixed_bfloat16' the layers compute in bfloat16 and keep their variables in float32. The models build
+    their output layers with `OUTPUT_DTYPE`, so their probabilities and losses stay in float32, and the layers
+    whose numerics need float32 (e.g. the in-graph mel spectrogram) keep it regardless of the policy.
+
+    Parameters
+    ----------
+    precision : str, optional
+        'float32' or 'mixed_bfloat16'.
+
+    Raises
+    ------
+    ValueError
+        If the precision is unknown.
+    """
+    global _bfloat16_warning_logged
+
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}', expected one of {PRECISIONS}.")
+
+    if precision == "mixed_bfloat16" and not _bfloat16_warning_logged and not has_bfloat16_support():
+        logging.warning("The CPU has no native bfloat16 instructions (AVX512-BF16/AMX), mixed_bfloat16 "
+                        "training will be emulated and may be slower than float32.")
+        _bfloat16_warning_logged = True
+
+    tensorflow.keras.mixed_precision.set_global_policy(precision)
+
+
+def get_precision_args(parser):
+
+    parser.add_argument('--precision', type=str, default=DEFAULT_PRECISION, choices=PRECISIONS,
+                        help='Keras dtype policy of the models: float32, or mixed_bfloat16 to compute in bfloat16 with float32 variables and outputs')
+
+    return parser
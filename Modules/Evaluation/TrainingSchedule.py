@@ -0,0 +1,266 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import sys
+    import math
+    import time
+    import logging
+    import tensorflow
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_EARLY_STOPPING_PATIENCE = None  # Epochs without improvement before stopping (disabled if not set)
+DEFAULT_EARLY_STOPPING_MONITOR = "val_loss"  # Falls back to the training loss when there is no validation data
+DEFAULT_LEARNING_RATE_SCHEDULE = "none"
+DEFAULT_PLATEAU_PATIENCE = 2  # Epochs without improvement before the learning rate is reduced
+DEFAULT_PLATEAU_FACTOR = 0.5  # Factor applied to the learning rate on a plateau
+DEFAULT_MINIMUM_LEARNING_RATE = 1e-6  # Lower bound of the plateau reductions and end of the cosine schedule
+DEFAULT_FOLD_TIME_BUDGET = None  # Wall-clock seconds of the training of a fold (not limited if not set)
+
+LEARNING_RATE_SCHEDULES = ["none", "plateau", "cosine"]
+
+
+class CosineLearningRate(tensorflow.keras.callbacks.Callback):
+    """
+    Decays the learning rate of the optimizer from its initial value to a minimum along a half cosine over
+    the epochs of the training.
+    """
+
+    def __init__(self, number_epochs: int, minimum_learning_rate: float = DEFAULT_MINIMUM_LEARNING_RATE):
+        super().__init__()
+        self.number_epochs = number_epochs
+        self.minimum_learning_rate = minimum_learning_rate
+        self.initial_learning_rate = None
+
+    def on_train_begin(self, logs=None):
+        # Read before the epoch backups of the fold journal restore a decayed optimizer
+        self.initial_learning_rate = float(tensorflow.keras.ops.convert_to_numpy(self.model.optimizer.learning_rate))
+
+    def on_epoch_begin(self, epoch, logs=None):
+        progress = epoch / max(1, self.number_epochs - 1)
+        learning_rate = self.minimum_learning_rate + 0.5 * (self.initial_learning_rate - self.minimum_learning_rate) \
+            * (1.0 + math.cos(math.pi * min(1.0, progress)))
+        self.model.optimizer.learning_rate = learning_rate
+
+
+class EpochTimer(tensorflow.keras.callbacks.Callback):
+    """
+    Measures the wall time of every epoch and, with a time budget, stops the training before an epoch that
+    would not finish within the budget.
+    """
+
+    def __init__(self, time_budget: float = DEFAULT_FOLD_TIME_BUDGET):
+        super().__init__()
+        self.time_budget = time_budget
+        self.train_start_time = None
+        self.epoch_start_time = None
+        self.list_epoch_times = []
+        self.last_epoch = None
+        self.budget_exhausted = False
+
+    def on_train_begin(self, logs=None):
+        self.train_start_time = time.perf_counter()
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epoch_start_time = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.list_epoch_times.append(time.perf_counter() - self.epoch_start_time)
+        self.last_epoch = epoch
+
+        if self.time_budget is None:
+            return
+
+        elapsed_time = time.perf_counter() - self.train_start_time
+        mean_epoch_time = sum(self.list_epoch_times) / len(self.list_epoch_times)
+
+        if elapsed_time + mean_epoch_time > self.time_budget:
+            logging.info(f"Time budget of {self.time_budget:.0f} s reached after epoch {epoch + 1}, "
+                         f"stopping the training.")
+            self.budget_exhausted = True
+            self.model.stop_training = True
+
+    def get_mean_epoch_time(self) -> float:
+        return sum(self.list_epoch_times) / len(self.list_epoch_times) if self.list_epoch_times else 0.0
+
+
+class TrainingSchedule:
+    """
+    Callback stack of the `fit` of the models: early stopping with the restore of the best weights, a
+    learning-rate schedule (reduction on plateau or cosine decay) and a wall-clock budget per fold.
+
+    The history returned by `fit` records the epoch where the training stopped (`stopped_epoch`, the number of
+    epochs trained), whether it stopped before the last epoch (`stopped_early`) and the estimated time saved
+    by stopping (`time_saved`, in seconds).
+    With the default parameters every callback is disabled and the models train for all their epochs.
+
+    Attributes
+    ----------
+    early_stopping_patience : int
+        Epochs without improvement of the monitored metric before stopping (disabled if None).
+    early_stopping_monitor : str
+        Metric monitored by the early stopping and the plateau reductions.
+    learning_rate_schedule : str
+        'none', 'plateau' (ReduceLROnPlateau) or 'cosine' (cosine decay over the epochs).
+    plateau_patience : int
+        Epochs without improvement before the learning rate is reduced.
+    plateau_factor : float
+        Factor applied to the learning rate on a plateau.
+    minimum_learning_rate : float
+        Lower bound of the learning rate.
+    time_budget : float
+        Wall-clock seconds of the training of a fold (not limited if None).
+    """
+
+    def __init__(self, early_stopping_patience: int = DEFAULT_EARLY_STOPPING_PATIENCE,
+                 early_stopping_monitor: str = DEFAULT_EARLY_STOPPING_MONITOR,
+                 learning_rate_schedule: str = DEFAULT_LEARNING_RATE_SCHEDULE,
+                 plateau_patience: int = DEFAULT_PLATEAU_PATIENCE, plateau_factor: float = DEFAULT_PLATEAU_FACTOR,
+                 minimum_learning_rate: float = DEFAULT_MINIMUM_LEARNING_RATE,
+                 time_budget: float = DEFAULT_FOLD_TIME_BUDGET):
+        """
+        Initializes the TrainingSchedule.
+
+        Raises
+        ------
+        ValueError
+            If the learning-rate schedule is unknown.
+        """
+        if learning_rate_schedule not in LEARNING_RATE_SCHEDULES:
+            raise ValueError(f"Unknown learning rate schedule '{learning_rate_schedule}', "
+                             f"expected one of {LEARNING_RATE_SCHEDULES}.")
+
+        self.early_stopping_patience = early_stopping_patience
+        self.early_stopping_monitor = early_stopping_monitor
+        self.learning_rate_schedule = learning_rate_schedule
+        self.plateau_patience = plateau_patience
+        self.plateau_factor = plateau_factor
+        self.minimum_learning_rate = minimum_learning_rate
+        self.time_budget = time_budget
+
+    @classmethod
+    def from_arguments(cls, arguments, prefix: str):
+        """
+        Returns the schedule given by the arguments of a model (see `add_training_schedule_args`).
+        """
+        return cls(getattr(arguments, f"{prefix}_early_stopping_patience"),
+                   getattr(arguments, f"{prefix}_early_stopping_monitor"),
+                   getattr(arguments, f"{prefix}_learning_rate_schedule"),
+                   getattr(arguments, f"{prefix}_plateau_patience"),
+                   getattr(arguments, f"{prefix}_plateau_factor"),
+                   getattr(arguments, f"{prefix}_minimum_learning_rate"),
+                   getattr(arguments, f"{prefix}_fold_time_budget"))
+
+    def get_callbacks(self, number_epochs: int, has_validation: bool) -> list:
+        """
+        Returns the callbacks of the schedule for a training of `number_epochs` epochs.
+        """
+        monitor = self.early_stopping_monitor
+
+        if not has_validation and monitor.startswith("val_"):
+            monitor = monitor[len("val_"):]
+
+        list_callbacks = []
+
+        if self.learning_rate_schedule == "cosine":
+            list_callbacks.append(CosineLearningRate(number_epochs, self.minimum_learning_rate))
+
+        elif self.learning_rate_schedule == "plateau":
+            list_callbacks.append(tensorflow.keras.callbacks.ReduceLROnPlateau(monitor=monitor,
+                                                                               factor=self.plateau_factor,
+                                                                               patience=self.plateau_patience,
+                                                                               min_lr=self.minimum_learning_rate))
+
+        if self.early_stopping_patience is not None:
+            list_callbacks.append(tensorflow.keras.callbacks.EarlyStopping(monitor=monitor,
+                                                                           patience=self.early_stopping_patience,
+                                                                           restore_best_weights=True))
+
+        return list_callbacks
+
+    def fit(self, neural_network_model, train_data, train_labels, epochs: int, batch_size: int,
+            validation_data=None, callbacks: list = None) -> tensorflow.keras.callbacks.History:
+        """
+        Trains a compiled model with the callbacks of the schedule and records where the training stopped.
+
+        Parameters
+        ----------
+        neural_network_model : tensorflow.keras.Model
+            Compiled model.
+        train_data : tf.Tensor, tf.data.Dataset or IndexedBatches
+            Training data, or batches of (data, labels) pairs.
+        train_labels : tf.Tensor
+            Training labels (None for batches).
+        epochs : int
+            Maximum number of epochs.
+        batch_size : int
+            Batch size (None for batches).
+        validation_data : optional
+            Validation data of the fit.
+        callbacks : list, optional
+            Additional callbacks, run after those of the schedule (e.g. the epoch backups of the fold journal).
+
+        Returns
+        -------
+        tf.keras.callbacks.History
+            History of the training, with the `stopped_epoch`, `stopped_early` and `time_saved` entries.
+        """
+        epoch_timer = EpochTimer(self.time_budget)
+        list_callbacks = self.get_callbacks(epochs, validation_data is not None) + [epoch_timer] + list(callbacks or [])
+
+        training_history = neural_network_model.fit(train_data, train_labels, epochs=epochs, batch_size=batch_size,
+                                                    validation_data=validation_data, callbacks=list_callbacks)
+
+        stopped_epoch = epochs if epoch_timer.last_epoch is None else epoch_timer.last_epoch + 1
+        training_history.history['stopped_epoch'] = stopped_epoch
+        training_history.history['stopped_early'] = stopped_epoch < epochs
+        training_history.history['time_saved'] = epoch_timer.get_mean_epoch_time() * (epochs - stopped_epoch)
+
+        if training_history.history['stopped_early']:
+            logging.info(f"Training stopped at epoch {stopped_epoch} of {epochs}, saving about "
+                         f"{training_history.history['time_saved']:.1f} s.")
+
+        return training_history
+
+
+def add_training_schedule_args(parser, prefix: str):
+    """
+    Adds the training schedule arguments of a model, prefixed with its argument prefix (e.g. 'ast').
+    """
+    parser.add_argument(f'--{prefix}_early_stopping_patience', type=int, default=DEFAULT_EARLY_STOPPING_PATIENCE,
+                        help='Epochs without improvement before the training stops, restoring the best weights (disabled if not set)')
+
+    parser.add_argument(f'--{prefix}_early_stopping_monitor', type=str, default=DEFAULT_EARLY_STOPPING_MONITOR,
+                        help='Metric monitored by the early stopping and the plateau reductions')
+
+    parser.add_argument(f'--{prefix}_learning_rate_schedule', type=str, default=DEFAULT_LEARNING_RATE_SCHEDULE,
+                        choices=LEARNING_RATE_SCHEDULES, help='Learning rate schedule of the training')
+
+    parser.add_argument(f'--{prefix}_plateau_patience', type=int, default=DEFAULT_PLATEAU_PATIENCE,
+                        help='Epochs without improvement before the learning rate is reduced (plateau schedule)')
+
+    parser.add_argument(f'--{prefix}_plateau_factor', type=float, default=DEFAULT_PLATEAU_FACTOR,
+                        help='Factor applied to the learning rate on a plateau')
+
+    parser.add_argument(f'--{prefix}_minimum_learning_rate', type=float, default=DEFAULT_MINIMUM_LEARNING_RATE,
+                        help='Lower bound of the learning rate of the plateau and cosine schedules')
+
+    parser.add_argument(f'--{prefix}_fold_time_budget', type=float, default=DEFAULT_FOLD_TIME_BUDGET,
+                        help='Wall-clock seconds of the training of a fold, the training stops before an epoch that would exceed it (not limited if not set)')
+
+    return parser
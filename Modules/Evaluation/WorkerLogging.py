@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+
+try:
+    import sys
+    import logging
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+
+def get_logging_configuration() -> dict:
+    """
+    Returns the logging configuration of this process, to be installed in the worker processes it spawns.
+
+    Spawned processes start with an unconfigured root logger, which drops every message below WARNING and
+    writes nothing to the log file of the run.
+
+    Returns
+    -------
+    dict
+        The 'level' of the root logger, the 'formatter' of its first handler, the 'log_files' written by its
+        file handlers and whether it writes to the 'console'.
+    """
+    root_logger = logging.getLogger()
+    list_formatters = [handler.formatter for handler in root_logger.handlers if handler.formatter is not None]
+
+    return {'level': root_logger.level,
+            'formatter': list_formatters[0] if list_formatters else None,
+            'log_files': [handler.baseFilename for handler in root_logger.handlers
+                          if isinstance(handler, logging.FileHandler)],
+            'console': any(type(handler) is logging.StreamHandler for handler in root_logger.handlers)}
+
+
+def configure_worker_logging(logging_configuration: dict = None) -> None:
+    """
+    Installs the logging configuration of the parent process (see `get_logging_configuration`) in a worker.
+
+    The worker appends to the log files of the parent instead of rotating them, so the messages of the
+    concurrent processes are interleaved in the log of the run.
+    """
+    if logging_configuration is None:
+        return
+
+    root_logger = logging.getLogger()
+
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+
+    list_handlers = [logging.FileHandler(log_file, mode='a', delay=True)
+                     for log_file in logging_configuration['log_files']]
+
+    if logging_configuration['console']:
+        list_handlers.append(logging.StreamHandler())
+
+    for handler in list_handlers:
+        handler.setLevel(logging_configuration['level'])
+
+        if logging_configuration['formatter'] is not None:
+            handler.setFormatter(logging_configuration['formatter'])
+
+        root_logger.addHandler(handler)
+
+    root_logger.setLevel(logging_configuration['level'])
@@ -87,6 +87,6 @@ class CLSTokenLayer(Layer):
             with shape (batch_size, 1, projection_dimension).
         """
         batch_size = tensorflow.shape(inputs)[0]
-        # Tile the [CLS] token to match the batch size
-        cls_tokens = tensorflow.tile(self.cls_token, [batch_size, 1, 1])
+        # Tile the [CLS] token, read in the compute dtype of the layer, to match the batch size
+        cls_tokens = tensorflow.tile(tensorflow.cast(self.cls_token, self.compute_dtype), [batch_size, 1, 1])
         return cls_tokens
@@ -73,13 +73,17 @@ class ConformerBlock(Layer):
             **kwargs: Additional arguments passed to the base `Layer` class.
         """
         super(ConformerBlock, self).__init__(**kwargs)
-        self.first_layer_normalization = LayerNormalization()
-        self.first_feedforward_module = FeedForwardModule(embedding_dimension, dropout_decay)
+
+        # The modules follow the dtype policy of the block; the normalizations compute in float32 under a
+        # mixed precision policy
+        self.first_layer_normalization = LayerNormalization(dtype=self.dtype_policy)
+        self.first_feedforward_module = FeedForwardModule(embedding_dimension, dropout_decay, dtype=self.dtype_policy)
         self.multi_head_self_attention = MultiHeadSelfAttentionModule(embedding_dimension, number_heads, max_length,
-                                                                      dropout_decay)
-        self.convolutional = ConvolutionalModule(embedding_dimension, size_kernel, dropout_decay)
-        self.second_layer_normalization = LayerNormalization()
-        self.second_feedforward_module = FeedForwardModule(embedding_dimension, dropout_decay)
+                                                                      dropout_decay, dtype=self.dtype_policy)
+        self.convolutional = ConvolutionalModule(embedding_dimension, size_kernel, dropout_decay,
+                                                 dtype=self.dtype_policy)
+        self.second_layer_normalization = LayerNormalization(dtype=self.dtype_policy)
+        self.second_feedforward_module = FeedForwardModule(embedding_dimension, dropout_decay, dtype=self.dtype_policy)
 
     def call(self, neural_network_flow: tensorflow.Tensor, mask: tensorflow.Tensor = None) -> tensorflow.Tensor:
         """
@@ -0,0 +1,160 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+try:
+    import sys
+    import numpy
+    import tensorflow
+    from tensorflow.keras.layers import Layer
+
+    from Modules.Dataset.MelSpectrogram import DEFAULT_AMIN
+    from Modules.Dataset.MelSpectrogram import DEFAULT_TOP_DB
+    from Modules.Dataset.MelSpectrogram import get_mel_basis
+    from Modules.Dataset.MelSpectrogram import get_fft_window
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+# Default values of the spectrogram parameters
+DEFAULT_SAMPLE_RATE = 8000
+DEFAULT_SIZE_FFT = 2048
+DEFAULT_HOP_LENGTH = 256
+DEFAULT_NUMBER_FILTERS = 128
+DEFAULT_DECIBEL_SCALE_FACTOR = 80
+
+
+class MelSpectrogramLayer(Layer):
+    """
+    Computes the scaled decibel mel spectrogram of a batch of raw waveform windows inside the graph.
+
+    The layer reproduces the NumPy pipeline of the loaders (librosa.feature.melspectrogram followed by
+    librosa.power_to_db(ref=numpy.max) and `dB / decibel_scale_factor + 1`): the windows are zero padded
+    by n_fft // 2 on both sides (center=True), framed, multiplied by the periodic Hann window, transformed
+    with a real FFT and projected on the librosa mel filterbank, which is computed once and kept as a
+    constant of the layer. A model whose first layer is a MelSpectrogramLayer takes raw windows as input,
+    so the spectrograms are computed batched on the device and exported models are self-contained.
+
+    Attributes
+    ----------
+    sample_rate : int
+        Sample rate of the windows.
+    size_fft : int
+        Size of the FFT.
+    hop_length : int
+        Number of samples between consecutive frames.
+    number_filters : int
+        Number of mel filters.
+    decibel_scale_factor : float
+        Divisor of the decibels before the offset of 1 (None keeps the decibels unscaled).
+    amin : float
+        Minimum power, used to avoid the logarithm of zero.
+    top_db : float
+        Dynamic range kept below the maximum of each spectrogram.
+    """
+
+    def __init__(self, sample_rate: int = DEFAULT_SAMPLE_RATE, size_fft: int = DEFAULT_SIZE_FFT,
+                 hop_length: int = DEFAULT_HOP_LENGTH, number_filters: int = DEFAULT_NUMBER_FILTERS,
+                 decibel_scale_factor: float = DEFAULT_DECIBEL_SCALE_FACTOR, amin: float = DEFAULT_AMIN,
+                 top_db: float = DEFAULT_TOP_DB, **kwargs):
+        """
+        Initializes the MelSpectrogramLayer.
+
+        Parameters
+        ----------
+        sample_rate : int, optional
+            Sample rate of the windows.
+        size_fft : int, optional
+            Size of the FFT.
+        hop_length : int, optional
+            Number of samples between consecutive frames.
+        number_filters : int, optional
+            Number of mel filters.
+        decibel_scale_factor : float, optional
+            Divisor of the decibels before the offset of 1 (None keeps the decibels unscaled).
+        amin : float, optional
+            Minimum power, used to avoid the logarithm of zero.
+        top_db : float, optional
+            Dynamic range kept below the maximum of each spectrogram.
+        **kwargs
+            Additional keyword arguments for the Layer superclass.
+        """
+        # The FFT and the decibel conversion lose too much precision in bfloat16, so the layer stays in
+        # float32 under a mixed precision policy and the next layers cast its output
+        kwargs.setdefault('dtype', 'float32')
+        super(MelSpectrogramLayer, self).__init__(**kwargs)
+        self.sample_rate = sample_rate
+        self.size_fft = size_fft
+        self.hop_length = hop_length
+        self.number_filters = number_filters
+        self.decibel_scale_factor = decibel_scale_factor
+        self.amin = amin
+        self.top_db = top_db
+
+        # The filterbank and the FFT window are the same arrays librosa uses, cached per configuration
+        self.mel_basis = tensorflow.constant(numpy.transpose(get_mel_basis(sample_rate, size_fft, number_filters)),
+                                             dtype=tensorflow.float32)
+        self.fft_window = tensorflow.constant(get_fft_window(size_fft), dtype=tensorflow.float32)
+
+    def call(self, inputs: tensorflow.Tensor) -> tensorflow.Tensor:
+        """
+        Computes the spectrograms of a batch of windows.
+
+        Parameters
+        ----------
+        inputs : tf.Tensor
+            Windows of shape (batch_size, window_size), or (batch_size, window_size, 1).
+
+        Returns
+        -------
+        tf.Tensor
+            Spectrograms of shape (batch_size, number_filters, 1 + window_size // hop_length).
+        """
+        signal_windows = tensorflow.cast(inputs, tensorflow.float32)
+
+        if len(signal_windows.shape) == 3:
+            signal_windows = tensorflow.squeeze(signal_windows, axis=-1)
+
+        padded_windows = tensorflow.pad(signal_windows, [[0, 0], [self.size_fft // 2, self.size_fft // 2]])
+        frames = tensorflow.signal.frame(padded_windows, self.size_fft, self.hop_length)
+        power_frames = tensorflow.square(tensorflow.abs(tensorflow.signal.rfft(frames * self.fft_window)))
+
+        # (batch_size, number_frames, number_filters) projected, then in the librosa layout
+        spectrograms = tensorflow.transpose(tensorflow.matmul(power_frames, self.mel_basis), perm=[0, 2, 1])
+
+        # power_to_db with ref=numpy.max, relative to the maximum of each spectrogram
+        logarithm_scale = tensorflow.constant(10.0 / numpy.log(10.0), dtype=tensorflow.float32)
+        decibel_spectrograms = logarithm_scale * tensorflow.math.log(tensorflow.maximum(self.amin, spectrograms))
+        reference = tensorflow.reduce_max(spectrograms, axis=[1, 2], keepdims=True)
+        decibel_spectrograms -= logarithm_scale * tensorflow.math.log(tensorflow.maximum(self.amin, reference))
+
+        if self.top_db is not None:
+            decibel_maximum = tensorflow.reduce_max(decibel_spectrograms, axis=[1, 2], keepdims=True)
+            decibel_spectrograms = tensorflow.maximum(decibel_spectrograms, decibel_maximum - self.top_db)
+
+        if self.decibel_scale_factor:
+            decibel_spectrograms = decibel_spectrograms / self.decibel_scale_factor + 1
+
+        return decibel_spectrograms
+
+    def compute_output_shape(self, input_shape):
+        number_frames = None if input_shape[1] is None else 1 + input_shape[1] // self.hop_length
+        return input_shape[0], self.number_filters, number_frames
+
+    def get_config(self):
+        config = super(MelSpectrogramLayer, self).get_config()
+        config.update({'sample_rate': self.sample_rate, 'size_fft': self.size_fft, 'hop_length': self.hop_length,
+                       'number_filters': self.number_filters, 'decibel_scale_factor': self.decibel_scale_factor,
+                       'amin': self.amin, 'top_db': self.top_db})
+        return config
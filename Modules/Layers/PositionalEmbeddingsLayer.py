@@ -66,7 +66,8 @@ class PositionalEmbeddingsLayer(Layer):
         self.projection_dimension = projection_dimension
 
         # Create an embedding layer for positional embeddings
-        self.embedding_layer = Embedding(input_dim=number_patches + 1, output_dim=projection_dimension)
+        self.embedding_layer = Embedding(input_dim=number_patches + 1, output_dim=projection_dimension,
+                                         dtype=self.dtype_policy)
 
     def call(self, inputs: tensorflow.Tensor) -> tensorflow.Tensor:
         """
@@ -96,6 +97,7 @@ class PositionalEmbeddingsLayer(Layer):
         batch_size = tensorflow.shape(inputs)[0]
 
         # Tile the positional embeddings for each sample in the batch
-        positional_embeddings = tensorflow.tile(positional_embeddings, [batch_size, 1, 1])
+        positional_embeddings = tensorflow.tile(tensorflow.cast(positional_embeddings, self.compute_dtype),
+                                                [batch_size, 1, 1])
 
         return positional_embeddings
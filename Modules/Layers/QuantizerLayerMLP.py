@@ -60,9 +60,10 @@ class KNNLayer(Layer):
             tf.Tensor: A tensor of shape (batch_size, number_clusters) containing the indices
             of the nearest clusters for each input.
         """
-        # Expand dimensions of inputs and reference points for broadcasting during subtraction
-        inputs_expanded = tensorflow.expand_dims(inputs, axis=1)
-        ref_expanded = tensorflow.expand_dims(self.reference_points, axis=0)
+        # Expand dimensions of inputs and reference points for broadcasting during subtraction, in float32 so
+        # that bfloat16 rounding does not reorder the nearest clusters
+        inputs_expanded = tensorflow.expand_dims(tensorflow.cast(inputs, tensorflow.float32), axis=1)
+        ref_expanded = tensorflow.expand_dims(tensorflow.cast(self.reference_points, tensorflow.float32), axis=0)
 
         # Calculate L2 distances between inputs and reference points
         distances = tensorflow.norm(inputs_expanded - ref_expanded, axis=-1)
@@ -154,7 +155,7 @@ class QuantizationLayer(Layer):
         # Compute the quantized output by averaging the reference points
         quantized = tensorflow.reduce_mean(reference_points, axis=1)
 
-        return quantized
+        return tensorflow.cast(quantized, self.compute_dtype)
 
     def build(self, input_shape):
         """
@@ -165,7 +166,7 @@ class QuantizationLayer(Layer):
             input_shape (tuple): The shape of the input data.
         """
         # Initialize the KNNLayer with the specified number of clusters
-        self.knn_layer = KNNLayer(number_clusters=self.k)
+        self.knn_layer = KNNLayer(number_clusters=self.k, dtype=self.dtype_policy)
 
         # Create and initialize the reference points (centroids)
         self.reference_points = self.knn_layer.add_weight(
@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'unknown'
+__email__ = 'unknown@unknown.com.br'
+__version__ = '{1}.{0}.{0}'
+__initial_data__ = '2026/10/16'
+__last_update__ = '2026/10/16'
+__credits__ = ['unknown']
+
+try:
+    import sys
+    import tensorflow
+    from tensorflow.keras.layers import Layer
+
+    from Modules.Dataset.PatchExtraction import get_number_patches
+    from Modules.Dataset.PatchExtraction import DEFAULT_PATCH_OVERLAP
+
+except ImportError as error:
+    print(error)
+    print("1. Install requirements:")
+    print("  pip3 install --upgrade pip")
+    print("  pip3 install -r requirements.txt ")
+    print()
+    sys.exit(-1)
+
+DEFAULT_SIZE_PATCH = (16, 16)
+
+
+class SpectrogramPatchesLayer(Layer):
+    """
+    Splits a batch of spectrograms into patches inside the graph, as `split_spectrograms_into_patches` does.
+
+    The spectrograms are padded with zeros at the end of both axes so that the patches cover them, and the
+    patches are ordered row by row (frequency first, then time).
+
+    Attributes
+    ----------
+    patch_size : tuple
+        Height (filters) and width (frames) of each patch.
+    patch_overlap : int
+        Overlap ratio between patches (1 means non-overlapping patches).
+    """
+
+    def __init__(self, patch_size: tuple = DEFAULT_SIZE_PATCH, patch_overlap: int = DEFAULT_PATCH_OVERLAP, **kwargs):
+        """
+        Initializes the SpectrogramPatchesLayer.
+
+        Parameters
+        ----------
+        patch_size : tuple, optional
+            Height and width of each patch.
+        patch_overlap : int, optional
+            Overlap ratio between patches.
+        **kwargs
+            Additional keyword arguments for the Layer superclass.
+        """
+        super(SpectrogramPatchesLayer, self).__init__(**kwargs)
+        self.patch_size = tuple(patch_size)
+        self.patch_overlap = patch_overlap
+        self.step_height = max(1, self.patch_size[0] // patch_overlap)
+        self.step_width = max(1, self.patch_size[1] // patch_overlap)
+
+    def get_number_patches(self, number_filters: int, number_frames: int) -> tuple:
+        return (get_number_patches(number_filters, self.patch_size[0], self.step_height),
+                get_number_patches(number_frames, self.patch_size[1], self.step_width))
+
+    def call(self, inputs: tensorflow.Tensor) -> tensorflow.Tensor:
+        """
+        Splits the spectrograms into patches.
+
+        Parameters
+        ----------
+        inputs : tf.Tensor
+            Spectrograms of shape (batch_size, number_filters, number_frames), with static filters and frames.
+
+        Returns
+        -------
+        tf.Tensor
+            Patches of shape (batch_size, number_patches, patch_height, patch_width).
+        """
+        number_filters, number_frames = inputs.shape[1], inputs.shape[2]
+        number_patches_height, number_patches_width = self.get_number_patches(number_filters, number_frames)
+
+        pad_height = (number_patches_height - 1) * self.step_height + self.patch_size[0] - number_filters
+        pad_width = (number_patches_width - 1) * self.step_width + self.patch_size[1] - number_frames
+        padded_spectrograms = tensorflow.pad(inputs, [[0, 0], [0, pad_height], [0, pad_width]])
+
+        # (batch_size, patches_height, patches_width, patch_height * patch_width), each patch row-major
+        patches = tensorflow.image.extract_patches(padded_spectrograms[..., tensorflow.newaxis],
+                                                   sizes=[1, self.patch_size[0], self.patch_size[1], 1],
+                                                   strides=[1, self.step_height, self.step_width, 1],
+                                                   rates=[1, 1, 1, 1], padding='VALID')
+
+        return tensorflow.reshape(patches, [-1, number_patches_height * number_patches_width,
+                                            self.patch_size[0], self.patch_size[1]])
+
+    def compute_output_shape(self, input_shape):
+        number_patches_height, number_patches_width = self.get_number_patches(input_shape[1], input_shape[2])
+        return input_shape[0], number_patches_height * number_patches_width, self.patch_size[0], self.patch_size[1]
+
+    def get_config(self):
+        config = super(SpectrogramPatchesLayer, self).get_config()
+        config.update({'patch_size': self.patch_size, 'patch_overlap': self.patch_overlap})
+        return config
@@ -44,6 +44,44 @@ try:
     from Models.Conformer import Conformer, get_conformer_models_args
     from Models.Wav2Vec2 import AudioWav2Vec2, get_wav_to_vec_args
     from Models.ResidualModel import ResidualModel, get_residual_model_args
+    from Modules.Dataset.FeatureCache import FeatureCache
+    from Modules.Dataset.FeatureCache import get_feature_cache_args
+    from Modules.Dataset.ParallelExtractor import ParallelExtractor
+    from Modules.Dataset.ParallelExtractor import get_parallel_extractor_args
+    from Modules.Dataset.WaveformStore import WaveformStore
+    from Modules.Dataset.WaveformStore import DEFAULT_FILE_EXTENSION
+    from Modules.Dataset.WaveformStore import get_waveform_store_args
+    from Modules.Dataset.AudioDecoder import AudioDecoder
+    from Modules.Dataset.AudioDecoder import get_audio_decoder_args
+    from Modules.Dataset.WindowFraming import get_window_framing_args
+    from Modules.Dataset.MelSpectrogram import get_mel_spectrogram_args
+    from Modules.Dataset.FeatureAssembler import get_feature_assembler_args
+    from Modules.Dataset.StreamingDataset import get_streaming_dataset_args
+    from Modules.Dataset.ShardedDataset import check_shard_arguments
+    from Modules.Dataset.ShardedDataset import get_sharded_dataset_args
+    from Modules.Dataset.WindowIndex import get_window_index_args
+    from Modules.Dataset.DatasetManifest import DatasetManifest
+    from Modules.Dataset.DatasetManifest import get_manifest_path
+    from Modules.Dataset.DatasetManifest import get_ingestion_directories
+    from Modules.Dataset.DatasetManifest import get_dataset_manifest_args
+    from Modules.Dataset.FeatureQuantization import get_cache_dtype
+    from Modules.Dataset.FeatureQuantization import get_feature_quantization_args
+    from Modules.Dataset.FeatureExtractor import FeatureExtractor
+    from Modules.Dataset.FeatureExtractor import get_feature_extractor_args
+    from Modules.Dataset.MetadataIndex import MetadataIndex
+    from Modules.Dataset.MetadataIndex import get_metadata_index_args
+    from Modules.Dataset.StreamingDataset import select_labeled_files
+    from Modules.Dataset.ActivityDetector import get_activity_detector_args
+    from Modules.Dataset.LoaderProfiler import LoaderProfiler
+    from Modules.Dataset.LoaderProfiler import save_loader_reports
+    from Modules.Dataset.LoaderProfiler import get_loader_profiler_args
+    from Modules.Dataset.FeatureAssembler import get_peak_memory
+    from Modules.Evaluation.FoldExecutor import get_fold_executor_args
+    from Modules.Evaluation.FoldJournal import get_fold_journal_args
+    from Modules.Evaluation.ModelScheduler import ModelScheduler
+    from Modules.Evaluation.ModelScheduler import parse_model_budgets
+    from Modules.Evaluation.ModelScheduler import get_model_scheduler_args
+    from Modules.Evaluation.PrecisionPolicy import get_precision_args
 
 except ImportError as error:
     print(error)
@@ -429,6 +467,12 @@ class EvaluationModels:
                     plt.plot(history['val_loss'], label='Validation Loss')
                     logging.debug(f"Validation loss data available for model '{model_name}'.")
 
+                # Mark the epoch where early stopping or the time budget ended the training
+                if history.get('stopped_early', False):
+                    plt.axvline(x=history['stopped_epoch'] - 1, color='gray', linestyle='--',
+                                label=f"Stopped at epoch {history['stopped_epoch']} "
+                                      f"({history['time_saved']:.0f} s saved)")
+
                 plt.title(f'Loss for model {model_name}')
                 plt.xlabel('Epochs')
                 plt.ylabel('Loss')
@@ -504,38 +548,170 @@ class EvaluationModels:
         return metrics, history, matrices, roc_list
 
 
+    @staticmethod
+    def ingest_incrementally(dataset_directory, list_files, sample_rate, waveform_store, arguments):
+        """
+        Updates the dataset manifest and decodes only the recordings added or modified since the last run.
+
+        The signals of the changed recordings are appended to the waveform store, and the feature cache
+        drops the entries of deleted or replaced recordings, so the models only extract the features of
+        the new content. The models record their window counts in the manifest.
+        """
+        manifest_path = get_manifest_path(dataset_directory, arguments.dataset_manifest_path)
+        dataset_manifest = DatasetManifest(manifest_path, dataset_directory)
+        changes = dataset_manifest.update(DEFAULT_FILE_EXTENSION)
+
+        waveform_changes = waveform_store.update(list_files, sample_rate, ParallelExtractor(arguments.loader_workers))
+        logging.info(f"Waveform store: {waveform_changes['decoded']} files decoded, {waveform_changes['dropped']} "
+                     f"dropped and {waveform_changes['unchanged']} reused.")
+
+        # Reuse the manifest hashes and drop the cached features of the stale recordings
+        feature_cache = FeatureCache(arguments.feature_cache_directory, arguments.feature_cache_size_budget)
+        feature_cache.file_hash_index.update(dataset_manifest.get_file_hash_index())
+        feature_cache.remove_file_hashes(changes['stale_hashes'])
+        feature_cache.flush()
+
+        dataset_manifest.record_lengths(waveform_store, sample_rate)
+        dataset_manifest.save()
+        arguments.dataset_manifest_path = manifest_path
+
+    @staticmethod
+    def extract_shared_features(models, dataset_directory, list_files, number_epochs, batch_size, number_splits, loss,
+                                sample_rate, overlap, number_classes, waveform_store, arguments):
+        """
+        Extracts the features of every model in a single pass over the corpus and stores them in the feature cache.
+
+        Each model declares its features through its feature parameters; the files are read once and the
+        windows and STFT power frames are shared by the models that use the same ones, so the loaders of
+        the models then read their features from the cache.
+        """
+        list_feature_parameters = []
+
+        for model_class in models:
+            instance = model_class()
+            instance.set_parameters(dataset_directory, number_epochs, batch_size, number_splits, loss, sample_rate,
+                                    overlap, number_classes, arguments)
+            list_feature_parameters.append(instance.get_feature_parameters())
+
+        feature_extractor = FeatureExtractor(list_feature_parameters, waveform_store)
+        feature_cache = FeatureCache(arguments.feature_cache_directory, arguments.feature_cache_size_budget,
+                                     get_cache_dtype(arguments.feature_dtype))
+        number_stored = feature_extractor.precompute(list_files, ParallelExtractor(arguments.loader_workers),
+                                                     feature_cache)
+        logging.info(f"Shared feature pass stored {number_stored} feature blocks.")
+
+    def prepare_corpus(self, models, dataset_directory, list_files, number_epochs, batch_size, number_splits, loss,
+                       sample_rate, overlap, number_classes, waveform_store, arguments):
+        """
+        Decodes the recordings into the waveform store (only the changed ones with the incremental ingestion)
+        and, with the shared feature pass, extracts the features of every model into the feature cache.
+        """
+        loader_profiler = LoaderProfiler("WaveformStore")
+        loader_profiler.start()
+
+        if arguments.incremental_ingestion:
+            self.ingest_incrementally(dataset_directory, list_files, sample_rate, waveform_store, arguments)
+        else:
+            waveform_store.build(list_files, sample_rate, ParallelExtractor(arguments.loader_workers))
+
+        loader_profiler.finish(len(list_files), 0, get_peak_memory())
+        arguments.waveform_store_directory = waveform_store.store_directory
+
+        # Read the corpus once more to extract the features of every model into the feature cache
+        if arguments.shared_feature_pass:
+            loader_profiler = LoaderProfiler("SharedFeaturePass")
+            loader_profiler.start()
+            self.extract_shared_features(models, dataset_directory, list_files, number_epochs, batch_size,
+                                         number_splits, loss, sample_rate, overlap, number_classes, waveform_store,
+                                         arguments)
+            loader_profiler.finish(len(list_files), 0, get_peak_memory())
+
     def run(self, models, dataset_directory, number_epochs, batch_size, number_splits, loss, sample_rate, overlap,
             number_classes, output_directory, plot_width, plot_height, plot_bar_width, plot_cap_size, arguments):
 
         logging.info("Starting the training and evaluation process.")
+        check_shard_arguments(arguments)
 
-        for i, model_class in enumerate(models):
-            logging.debug(f"Training model {i + 1}/{len(models)}: {model_class.__name__}")
+        # The models read their features from the shards, the recordings are neither listed nor decoded
+        train_from_shards = bool(arguments.shard_directory)
+        list_files = []
 
-            try:
-                metrics, history, matrices, roc_list = self.train_and_collect_metrics(model_class=model_class,
-                                                                                      dataset_directory=dataset_directory,
-                                                                                      number_epochs=number_epochs,
-                                                                                      batch_size=batch_size,
-                                                                                      number_splits=number_splits,
-                                                                                      loss=loss,
-                                                                                      sample_rate=sample_rate,
-                                                                                      overlap=overlap,
-                                                                                      number_classes=number_classes,
-                                                                                      arguments=arguments)
-
-                self.mean_metrics.append(metrics)
-                self.mean_history.append(history)
-                self.mean_matrices.append(matrices)
-
-                logging.info(f"Model {model_class.__name__} training completed. Metrics collected.")
-
-                self.plot_roc_curve(roc_list, "Results/")
-                logging.info(f"ROC curve plotted for {model_class.__name__}.")
+        if not train_from_shards:
+            # Index the datasheet so that the recordings excluded by the metadata filters are never decoded
+            metadata_index = MetadataIndex(arguments.metadata_index_path)
+            metadata_index.update(arguments.metadata_datasheet_path, dataset_directory)
+            list_files, _ = select_labeled_files(dataset_directory, DEFAULT_FILE_EXTENSION, metadata_index,
+                                                 arguments.metadata_filter)
 
-            except Exception as e:
-                logging.error(f"Error during training of model {model_class.__name__}: {str(e)}")
-                raise
+        # The incremental ingestion only pays off if the store and the cache persist between runs
+        if arguments.incremental_ingestion and not train_from_shards:
+            arguments.waveform_store_directory, arguments.feature_cache_directory = get_ingestion_directories(
+                dataset_directory, arguments.waveform_store_directory, arguments.feature_cache_directory)
+
+        # Decode the corpus once; every model reads its signals from the shared waveform store
+        waveform_store = WaveformStore(arguments.waveform_store_directory,
+                                       AudioDecoder(arguments.resampling_backend, arguments.decode_cache_directory))
+
+        try:
+            if not train_from_shards:
+                self.prepare_corpus(models, dataset_directory, list_files, number_epochs, batch_size, number_splits,
+                                    loss, sample_rate, overlap, number_classes, waveform_store, arguments)
+
+            # Only extract the features of each model and write them to shards
+            if arguments.shard_export_only:
+
+                for model_class in models:
+                    model_class().train(dataset_directory, number_epochs, batch_size, number_splits, loss, sample_rate,
+                                        overlap, number_classes, arguments)
+                    logging.info(f"Model {model_class.__name__} features exported.")
+
+            else:
+                model_scheduler = ModelScheduler(arguments.model_workers, arguments.scheduler_threads,
+                                                 arguments.scheduler_memory,
+                                                 parse_model_budgets(arguments.model_thread_budget),
+                                                 parse_model_budgets(arguments.model_memory_budget))
+                list_model_results = [None] * len(models)
+
+                # Report each model as soon as it finishes; a failed model is logged and skipped by the scheduler
+                for i, model_class, model_results in model_scheduler.run(models, self.train_and_collect_metrics,
+                                                                         dict(dataset_directory=dataset_directory,
+                                                                              number_epochs=number_epochs,
+                                                                              batch_size=batch_size,
+                                                                              number_splits=number_splits,
+                                                                              loss=loss,
+                                                                              sample_rate=sample_rate,
+                                                                              overlap=overlap,
+                                                                              number_classes=number_classes,
+                                                                              arguments=arguments)):
+                    list_model_results[i] = model_results
+                    logging.info(f"Model {model_class.__name__} training completed. Metrics collected.")
+
+                    self.plot_roc_curve(model_results[3], "Results/")
+                    logging.info(f"ROC curve plotted for {model_class.__name__}.")
+
+                # Keep the order of the models in the comparative plots, whatever order they finished in
+                for model_results in list_model_results:
+
+                    if model_results is not None:
+                        metrics, history, matrices, _ = model_results
+                        self.mean_metrics.append(metrics)
+                        self.mean_history.append(history)
+                        self.mean_matrices.append(matrices)
+
+                if model_scheduler.failed_models:
+                    logging.warning(f"Training failed for the models: {', '.join(model_scheduler.failed_models)}.")
+
+        finally:
+            # Remove a temporary store and keep the loader reports even when a step fails
+            waveform_store.remove()
+            save_loader_reports(arguments.loader_report_directory)
+
+        if arguments.shard_export_only:
+            return
+
+        if not self.mean_metrics:
+            logging.error("No model was trained successfully, nothing to plot.")
+            return
 
         try:
             logging.info("Plotting comparative metrics.")
@@ -665,6 +841,26 @@ def get_arguments():
     parser =  get_MLP_model_args(parser)
     parser = get_residual_model_args(parser)
     parser = get_wav_to_vec_args(parser)
+    parser = get_feature_cache_args(parser)
+    parser = get_parallel_extractor_args(parser)
+    parser = get_waveform_store_args(parser)
+    parser = get_audio_decoder_args(parser)
+    parser = get_window_framing_args(parser)
+    parser = get_mel_spectrogram_args(parser)
+    parser = get_feature_assembler_args(parser)
+    parser = get_streaming_dataset_args(parser)
+    parser = get_sharded_dataset_args(parser)
+    parser = get_window_index_args(parser)
+    parser = get_dataset_manifest_args(parser)
+    parser = get_feature_quantization_args(parser)
+    parser = get_feature_extractor_args(parser)
+    parser = get_metadata_index_args(parser)
+    parser = get_activity_detector_args(parser)
+    parser = get_loader_profiler_args(parser)
+    parser = get_fold_executor_args(parser)
+    parser = get_fold_journal_args(parser)
+    parser = get_model_scheduler_args(parser)
+    parser = get_precision_args(parser)
 
     arguments = parser.parse_args()
 